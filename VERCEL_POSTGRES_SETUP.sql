@@ -7,6 +7,8 @@ CREATE TABLE IF NOT EXISTS projects (
     name VARCHAR(255) NOT NULL,
     api_key VARCHAR(255) UNIQUE NOT NULL,
     api_key_hash VARCHAR(64) UNIQUE NOT NULL,
+    ignore_patterns TEXT,
+    analysis_config JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -41,6 +43,10 @@ CREATE TABLE IF NOT EXISTS analyses (
     strengths TEXT[],
     weaknesses TEXT[],
     raw_data JSONB,
+    submission_hash VARCHAR(64),
+    idempotency_key VARCHAR(255),
+    tier VARCHAR(10) DEFAULT 'full',
+    deep_completed_at TIMESTAMP,
     analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -65,18 +71,67 @@ CREATE TABLE IF NOT EXISTS bugs (
     description TEXT NOT NULL,
     impact TEXT,
     fix_suggestion TEXT,
+    detected_by VARCHAR(20)[],
+    occurrences INTEGER DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Cached per-file results for incremental (manifest) uploads
+CREATE TABLE IF NOT EXISTS file_results (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    file_path VARCHAR(500) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    analyzer_version VARCHAR(20) NOT NULL,
+    findings JSONB,
+    metrics JSONB,
+    skipped_reason VARCHAR(30),
+    downgraded_reason VARCHAR(30),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_file_results_key UNIQUE (project_id, file_path, content_hash, analyzer_version)
+);
+
+-- Durable queue of deferred work (deep tier, full report after a gate verdict, remaining files)
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    analysis_id UUID NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    tier VARCHAR(10) NOT NULL,
+    superseded VARCHAR(30) NOT NULL,
+    archive BYTEA NOT NULL,
+    manifest JSONB,
+    developer_email VARCHAR(255),
+    developer_name VARCHAR(255),
+    status VARCHAR(10) DEFAULT 'pending',
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    claimed_at TIMESTAMP
+);
+
+-- Columns added after the first release (no-ops on tables created above)
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS ignore_patterns TEXT;
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS analysis_config JSONB;
+ALTER TABLE bugs ADD COLUMN IF NOT EXISTS detected_by VARCHAR(20)[];
+ALTER TABLE bugs ADD COLUMN IF NOT EXISTS occurrences INTEGER DEFAULT 1;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS submission_hash VARCHAR(64);
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(255);
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS tier VARCHAR(10) DEFAULT 'full';
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS deep_completed_at TIMESTAMP;
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_analyses_project ON analyses(project_id);
 CREATE INDEX IF NOT EXISTS idx_analyses_developer ON analyses(developer_id);
 CREATE INDEX IF NOT EXISTS idx_analyses_date ON analyses(analyzed_at DESC);
 CREATE INDEX IF NOT EXISTS idx_analyses_grade ON analyses(grade);
+CREATE INDEX IF NOT EXISTS idx_analyses_submission ON analyses(project_id, submission_hash);
+CREATE INDEX IF NOT EXISTS idx_analyses_idempotency ON analyses(project_id, idempotency_key);
 CREATE INDEX IF NOT EXISTS idx_bugs_analysis ON bugs(analysis_id);
 CREATE INDEX IF NOT EXISTS idx_bugs_severity ON bugs(severity);
 CREATE INDEX IF NOT EXISTS idx_reports_analysis ON reports(analysis_id);
 CREATE INDEX IF NOT EXISTS idx_developers_email ON developers(email);
+CREATE INDEX IF NOT EXISTS idx_file_results_hash ON file_results(project_id, analyzer_version, content_hash);
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON analysis_jobs(status, created_at);
 
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
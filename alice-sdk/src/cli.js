@@ -44,6 +44,9 @@ program
   .command('analyze [path]')
   .description('Analyze code in the specified directory (default: current directory)')
   .option('-s, --silent', 'Suppress detailed output')
+  .option('-g, --gate', 'Fail fast: stop at the first critical issue (full report is emailed later)')
+  .option('-f, --fast', 'Fast-tier verdict now; deep analysis completes on the server and is emailed')
+  .option('--sample <fraction>', 'Estimated scan of a stratified sample of files (e.g. 0.1), not stored')
   .action(async (path = '.', options) => {
     try {
       // Check if configured
@@ -54,7 +57,7 @@ program
       }
 
       // Run analysis
-      const results = await analyzeCode(path)
+      const results = await analyzeCode(path, { gate: options.gate, sample: options.sample, fast: options.fast })
 
       // Display results
       if (!options.silent) {
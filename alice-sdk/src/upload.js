@@ -5,6 +5,7 @@
 
 const fs = require('fs')
 const path = require('path')
+const crypto = require('crypto')
 const archiver = require('archiver')
 const axios = require('axios')
 const FormData = require('form-data')
@@ -12,10 +13,106 @@ const chalk = require('chalk')
 const ora = require('ora')
 const { getApiKey, getServerUrl, getDeveloperInfo } = require('./config')
 
+// Analysis settings read by the server from the archive root
+const CONFIG_FILES = ['.alice.yml', '.alice.yaml']
+
+// Directories never uploaded (the server also prunes these, .gitignore'd paths and project ignore patterns)
+const EXCLUDE_DIRS = [
+  'node_modules',
+  '.git',
+  'dist',
+  'build',
+  '.next',
+  'venv',
+  '__pycache__',
+  '.vercel',
+  'coverage',
+]
+
+/**
+ * List files of code directory as POSIX paths relative to it
+ */
+function listFiles(sourcePath, relativeDir = '') {
+  const files = []
+
+  for (const entry of fs.readdirSync(path.join(sourcePath, relativeDir), { withFileTypes: true })) {
+    const relativePath = relativeDir ? `${relativeDir}/${entry.name}` : entry.name
+
+    if (entry.isDirectory()) {
+      if (!EXCLUDE_DIRS.includes(entry.name)) {
+        files.push(...listFiles(sourcePath, relativePath))
+      }
+    } else if (entry.isFile()) {
+      files.push(relativePath)
+    }
+  }
+
+  return files
+}
+
+/**
+ * Build manifest of code directory (relative path -> sha256 of file bytes)
+ */
+async function buildManifest(sourcePath) {
+  const manifest = {}
+
+  for (const relativePath of listFiles(sourcePath)) {
+    manifest[relativePath] = await new Promise((resolve, reject) => {
+      const hash = crypto.createHash('sha256')
+      fs.createReadStream(path.join(sourcePath, relativePath))
+        .on('data', (chunk) => hash.update(chunk))
+        .on('end', () => resolve(hash.digest('hex')))
+        .on('error', reject)
+    })
+  }
+
+  return manifest
+}
+
+/**
+ * Read the project's .alice.yml, if any
+ */
+function readConfig(sourcePath) {
+  for (const name of CONFIG_FILES) {
+    const configPath = path.join(sourcePath, name)
+    if (fs.existsSync(configPath)) {
+      return fs.readFileSync(configPath, 'utf8')
+    }
+  }
+  return null
+}
+
+/**
+ * Ask the server which files have no cached result
+ * The .alice.yml is sent along: results are cached per analysis settings
+ * Returns null when the server does not support incremental uploads
+ */
+async function fetchMissingHashes(manifest, config = null) {
+  const apiKey = getApiKey()
+  const serverUrl = getServerUrl()
+
+  const body = { files: manifest }
+  if (config !== null) {
+    body.config = config
+  }
+
+  try {
+    const response = await axios.post(`${serverUrl}/api/analyze/manifest`, body, {
+      headers: { 'X-API-Key': apiKey },
+      maxContentLength: Infinity,
+      maxBodyLength: Infinity,
+    })
+    return new Set(response.data.missing)
+  } catch (error) {
+    return null
+  }
+}
+
 /**
  * Create archive of code directory
+ * With a file list, only those files are added
  */
-async function createArchive(sourcePath, outputPath) {
+async function createArchive(sourcePath, outputPath, files = null) {
   return new Promise((resolve, reject) => {
     const output = fs.createWriteStream(outputPath)
     const archive = archiver('zip', {
@@ -27,33 +124,52 @@ async function createArchive(sourcePath, outputPath) {
 
     archive.pipe(output)
 
-    // Add files, excluding certain directories
-    const excludeDirs = [
-      'node_modules',
-      '.git',
-      'dist',
-      'build',
-      '.next',
-      'venv',
-      '__pycache__',
-      '.vercel',
-      'coverage',
-    ]
-
-    archive.glob('**/*', {
-      cwd: sourcePath,
-      ignore: excludeDirs.map(dir => `**/${dir}/**`),
-      dot: true,
-    })
+    if (files) {
+      for (const relativePath of files) {
+        archive.file(path.join(sourcePath, relativePath), { name: relativePath })
+      }
+    } else {
+      // Add files, excluding certain directories
+      archive.glob('**/*', {
+        cwd: sourcePath,
+        ignore: EXCLUDE_DIRS.map(dir => `**/${dir}/**`),
+        dot: true,
+      })
+    }
 
     archive.finalize()
   })
 }
 
+/**
+ * Get key identifying retries of one CI run
+ * ALICE_IDEMPOTENCY_KEY wins; otherwise the commit being built, when a CI system provides it,
+ * qualified by everything else that makes a run distinct (analyzed directory, mode, developer)
+ * so different analyses of one commit never share a key
+ */
+function getIdempotencyKey(sourceDir, mode, email) {
+  if (process.env.ALICE_IDEMPOTENCY_KEY) {
+    return process.env.ALICE_IDEMPOTENCY_KEY
+  }
+
+  const commit = process.env.GITHUB_SHA || process.env.BITBUCKET_COMMIT || process.env.CI_COMMIT_SHA
+  const repository = process.env.GITHUB_REPOSITORY || process.env.BITBUCKET_REPO_FULL_NAME || process.env.CI_PROJECT_PATH || ''
+  if (!commit) {
+    return null
+  }
+
+  const scope = path.relative(process.cwd(), sourceDir).split(path.sep).join('/') || '.'
+  const run = crypto.createHash('sha256')
+    .update([scope, mode, (email || '').trim().toLowerCase()].join('\0'))
+    .digest('hex')
+    .slice(0, 16)
+  return `${repository}@${commit}/${run}`
+}
+
 /**
  * Upload archive to ALICE server
  */
-async function uploadToServer(archivePath) {
+async function uploadToServer(archivePath, manifest = null, options = {}, sourceDir = '.') {
   const apiKey = getApiKey()
   const serverUrl = getServerUrl()
   const { name, email } = getDeveloperInfo()
@@ -66,12 +182,34 @@ async function uploadToServer(archivePath) {
   formData.append('archive', fs.createReadStream(archivePath))
   formData.append('developer_email', email)
   formData.append('developer_name', name)
+  if (manifest) {
+    formData.append('manifest', JSON.stringify(manifest))
+  }
+  let mode = 'full'
+  if (options.gate) {
+    mode = 'gate'
+    formData.append('mode', mode)
+  } else if (options.fast) {
+    mode = 'tiered'
+    formData.append('mode', mode)
+  } else if (options.sample) {
+    mode = 'sample'
+    formData.append('mode', mode)
+    formData.append('sample_fraction', String(options.sample))
+  }
+
+  const headers = {
+    'X-API-Key': apiKey,
+    ...formData.getHeaders(),
+  }
+  // Sampled scans are never stored, so there is nothing to replay
+  const idempotencyKey = mode === 'sample' ? null : getIdempotencyKey(sourceDir, mode, email)
+  if (idempotencyKey) {
+    headers['Idempotency-Key'] = idempotencyKey
+  }
 
   const response = await axios.post(`${serverUrl}/api/analyze`, formData, {
-    headers: {
-      'X-API-Key': apiKey,
-      ...formData.getHeaders(),
-    },
+    headers,
     maxContentLength: Infinity,
     maxBodyLength: Infinity,
   })
@@ -82,7 +220,7 @@ async function uploadToServer(archivePath) {
 /**
  * Analyze code directory
  */
-async function analyzeCode(sourcePath = '.') {
+async function analyzeCode(sourcePath = '.', options = {}) {
   const spinner = ora('Preparing code for analysis...').start()
 
   try {
@@ -90,11 +228,25 @@ async function analyzeCode(sourcePath = '.') {
     const tempDir = fs.mkdtempSync('/tmp/alice-')
     const archivePath = path.join(tempDir, 'code.zip')
 
+    const sourceDir = path.resolve(sourcePath)
+
+    // Upload only files the server has no cached result for
+    spinner.text = 'Hashing files...'
+    const manifest = await buildManifest(sourceDir)
+    const missing = await fetchMissingHashes(manifest, readConfig(sourceDir))
+
     spinner.text = 'Creating archive...'
-    await createArchive(path.resolve(sourcePath), archivePath)
+    if (missing) {
+      // .gitignore files and .alice.yml always travel along: the server prunes and configures the walk with them
+      const alwaysSent = file => path.posix.basename(file) === '.gitignore' || CONFIG_FILES.includes(file)
+      const changedFiles = Object.keys(manifest).filter(file => missing.has(manifest[file]) || alwaysSent(file))
+      await createArchive(sourceDir, archivePath, changedFiles)
+    } else {
+      await createArchive(sourceDir, archivePath)
+    }
 
     spinner.text = 'Uploading to ALICE server...'
-    const result = await uploadToServer(archivePath)
+    const result = await uploadToServer(archivePath, missing ? manifest : null, options, sourceDir)
 
     // Cleanup
     fs.unlinkSync(archivePath)
@@ -123,7 +275,15 @@ function displayResults(results) {
                      results.quality_score >= 60 ? chalk.yellow :
                      chalk.red
 
-  console.log(`${chalk.bold('Quality Score:')} ${scoreColor(results.quality_score + '%')}`)
+  if (results.estimated) {
+    const interval = results.sampling.quality_score
+    console.log(`${chalk.bold('Quality Score (estimated):')} ${scoreColor(results.quality_score + '%')} ${chalk.dim(`(95% CI ${interval.low}-${interval.high}%)`)}`)
+    console.log(chalk.dim(`Estimated from ${results.sampling.files_sampled} of ${results.sampling.files_total} files; issue counts are extrapolated`))
+  } else if (results.quality_score === null) {
+    console.log(`${chalk.bold('Quality Score:')} ${chalk.dim('pending (full report in progress)')}`)
+  } else {
+    console.log(`${chalk.bold('Quality Score:')} ${scoreColor(results.quality_score + '%')}`)
+  }
 
   // Deployment Status
   const statusColor = results.deployment_status === 'APPROVED' ? chalk.green :
@@ -137,6 +297,14 @@ function displayResults(results) {
     console.log(chalk.red('Critical issues must be resolved before production deployment.\n'))
   }
 
+  if (results.partial) {
+    console.log(chalk.yellow(`Partial analysis: time limit reached after ${results.partial.files_analyzed} of ${results.partial.files_total} files (score is provisional)`))
+  }
+
+  if (results.gate && results.gate.stopped_early) {
+    console.log(chalk.dim(`Gate verdict after ${results.gate.files_scanned} of ${results.gate.files_total} files (riskiest first)`))
+  }
+
   // Summary
   console.log(chalk.bold('\nSummary:'))
   console.log(`  Files Analyzed: ${results.total_files}`)
@@ -179,8 +347,20 @@ function displayResults(results) {
   }
 
   console.log(chalk.bold.cyan('═══════════════════════════════════════════════════════════\n'))
-  console.log(chalk.dim('Analysis ID: ' + results.analysis_id))
-  console.log(chalk.dim('Technical report sent to your email.\n'))
+  if (results.estimated) {
+    console.log(chalk.dim('Sampled scan: not stored and no report emailed.\n'))
+  } else if (results.remaining === 'queued') {
+    console.log(chalk.dim('Analysis ID: ' + results.analysis_id))
+    console.log(chalk.dim('Remaining files are being analyzed; the completed report is emailed when done.\n'))
+  } else if (results.deep_tier === 'pending') {
+    console.log(chalk.dim('Analysis ID: ' + results.analysis_id))
+    console.log(chalk.dim('Fast-tier verdict; the deep analysis updates this report and is emailed when complete.\n'))
+  } else if (results.full_report === 'pending') {
+    console.log(chalk.dim('Full technical report will be emailed when the background analysis completes.\n'))
+  } else {
+    console.log(chalk.dim('Analysis ID: ' + results.analysis_id))
+    console.log(chalk.dim('Technical report sent to your email.\n'))
+  }
 }
 
 module.exports = {
@@ -4,13 +4,40 @@ Analyzes backend code (Node.js, Python, APIs) for security and quality issues
 """
 
 import re
-from typing import List, Dict, Any
+import ast
+from typing import List, Dict, Any, Optional, Set
+
+from analyzers.js_frontend import JSVisitor, node_line, dotted_name, property_name
+from analyzers.py_frontend import PyVisitor, DECORATOR, string_building, dotted_name as py_dotted_name
+from analyzers.lexical_mask import LexicalMask, code_matches
+from analyzers.config import rule_enabled, without_disabled
+from analyzers.findings import FIRST_MATCH_KEY
+
+# Express/Flask/FastAPI route methods counted as endpoints
+ROUTE_METHODS = ('get', 'post', 'put', 'delete', 'patch')
+
+# How a SQL string passed to execute() was built
+SQL_BUILDING_DESCRIPTIONS = {
+    'f-string': 'f-string in execute()',
+    'percent': '% formatting in SQL',
+    'format': '.format() in SQL',
+    'concat': 'string concatenation in SQL'
+}
 
 
 class BackendAnalyzer:
     """Analyzes backend code for security, performance, and best practices"""
 
-    def __init__(self):
+    def __init__(self, retain_findings: bool = True, disabled_rules: Optional[Set[str]] = None):
+        """
+        Initialize backend analyzer
+
+        Args:
+            retain_findings: Keep findings for get_bugs() (the analysis pipeline collects them itself)
+            disabled_rules: Lowercased finding categories not to check or report
+        """
+        self.retain_findings = retain_findings
+        self.disabled_rules = disabled_rules or set()
         self.bugs = []
         self.metrics = {
             'has_authentication': False,
@@ -18,23 +45,28 @@ class BackendAnalyzer:
             'has_input_validation': False,
             'has_error_handling': False,
             'has_sql_injection_risk': False,
-            'has_secrets_exposure': False,
             'total_endpoints': 0,
             'total_files': 0
         }
 
-    def analyze_file(self, file_path: str, content: str) -> List[Dict[str, Any]]:
+    def analyze_file(self, file_path: str, content: str, ast_findings: Optional[List[Dict[str, Any]]] = None,
+                     mask: Optional[LexicalMask] = None, file_level: bool = True) -> List[Dict[str, Any]]:
         """
         Analyze a single backend file
 
         Args:
             file_path: Path to file
             content: File content
+            ast_findings: Findings from the shared AST pass (rules it covers skip their regex scan)
+            mask: Lexical mask of the file; eval/exec in comments and strings are ignored
+            file_level: False for one window of a larger file (the caller keeps the first match
+                of first-match-only rules)
 
         Returns:
             List of bugs found
         """
         file_bugs = []
+        use_ast = ast_findings is not None
         lines = content.split('\n')
         self.metrics['total_files'] += 1
 
@@ -43,35 +75,49 @@ class BackendAnalyzer:
         is_javascript = file_path.endswith(('.js', '.ts'))
 
         # Check for SQL injection vulnerabilities
-        file_bugs.extend(self._check_sql_injection(file_path, content, lines, is_python))
+        if rule_enabled(self.disabled_rules, 'SQL Injection'):
+            file_bugs.extend(self._check_sql_injection(file_path, content, lines, is_python, use_ast))
 
         # Check for authentication issues
-        file_bugs.extend(self._check_authentication(file_path, content, lines))
-
-        # Check for secrets exposure
-        file_bugs.extend(self._check_secrets(file_path, content, lines))
+        if rule_enabled(self.disabled_rules, 'Authentication', 'Authorization'):
+            file_bugs.extend(self._check_authentication(file_path, content, lines))
 
         # Check for error handling
-        file_bugs.extend(self._check_error_handling(file_path, content, lines, is_python, is_javascript))
+        if rule_enabled(self.disabled_rules, 'Error Handling'):
+            file_bugs.extend(self._check_error_handling(file_path, content, lines, is_python, is_javascript, file_level))
 
         # Check for CORS misconfigurations
-        file_bugs.extend(self._check_cors(file_path, content, lines))
+        if rule_enabled(self.disabled_rules, 'CORS Misconfiguration'):
+            file_bugs.extend(self._check_cors(file_path, content, lines))
 
         # Check for unsafe operations
-        file_bugs.extend(self._check_unsafe_operations(file_path, content, lines, is_python))
+        if rule_enabled(self.disabled_rules, 'Unsafe Operation', 'Code Injection'):
+            file_bugs.extend(self._check_unsafe_operations(file_path, content, lines, is_python, use_ast, mask))
 
-        # Count endpoints
-        self.metrics['total_endpoints'] += self._count_endpoints(content, is_python, is_javascript)
+        # Count endpoints (the AST pass counts routes itself)
+        if not use_ast:
+            self.metrics['total_endpoints'] += self._count_endpoints(content, is_python, is_javascript)
 
-        self.bugs.extend(file_bugs)
+        # Findings from the shared AST pass
+        if use_ast:
+            file_bugs.extend(ast_findings)
+
+        # Disabled rules sharing a check with enabled ones
+        file_bugs = without_disabled(file_bugs, self.disabled_rules)
+
+        if self.retain_findings:
+            self.bugs.extend(file_bugs)
         return file_bugs
 
-    def _check_sql_injection(self, file_path: str, content: str, lines: List[str], is_python: bool) -> List[Dict[str, Any]]:
+    def _check_sql_injection(self, file_path: str, content: str, lines: List[str], is_python: bool, use_ast: bool = False) -> List[Dict[str, Any]]:
         """Check for SQL injection vulnerabilities"""
         bugs = []
 
         # Dangerous SQL patterns
-        if is_python:
+        if is_python and use_ast:
+            # execute() arguments come from the AST pass
+            sql_patterns = []
+        elif is_python:
             # Python string formatting in SQL
             sql_patterns = [
                 (r'execute\s*\(\s*f["\']', 'f-string in execute()'),
@@ -90,16 +136,7 @@ class BackendAnalyzer:
         for pattern, description in sql_patterns:
             for match in re.finditer(pattern, content):
                 line_num = content[:match.start()].count('\n') + 1
-                bugs.append({
-                    'severity': 'CRITICAL',
-                    'category': 'SQL Injection',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': f'SQL injection vulnerability: {description}',
-                    'impact': 'Attackers can execute arbitrary SQL commands, steal/modify/delete data',
-                    'fix_suggestion': 'Use parameterized queries: execute("SELECT * FROM users WHERE id = ?", [user_id])'
-                })
-                self.metrics['has_sql_injection_risk'] = True
+                bugs.append(self._sql_injection_bug(file_path, line_num, description))
 
         # Check for raw SQL without parameterization
         raw_sql_keywords = ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'DROP']
@@ -180,37 +217,9 @@ class BackendAnalyzer:
 
         return bugs
 
-    def _check_secrets(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
-        """Check for exposed secrets"""
-        bugs = []
-
-        # Hardcoded secrets patterns
-        secret_patterns = [
-            (r'api_key\s*=\s*["\'][a-zA-Z0-9_-]{20,}["\']', 'API key'),
-            (r'secret_key\s*=\s*["\'][^"\']{16,}["\']', 'secret key'),
-            (r'private_key\s*=\s*["\']-----BEGIN', 'private key'),
-            (r'aws_secret_access_key\s*=\s*["\'][^"\']+["\']', 'AWS secret key'),
-            (r'database_url\s*=\s*["\'].*://.*:.*@', 'database URL with credentials')
-        ]
-
-        for pattern, secret_type in secret_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
-                line_num = content[:match.start()].count('\n') + 1
-                bugs.append({
-                    'severity': 'CRITICAL',
-                    'category': 'Exposed Secrets',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': f'Hardcoded {secret_type} in source code',
-                    'impact': 'Credentials exposed in version control, accessible to anyone with code access',
-                    'fix_suggestion': f'Move to environment variables: os.environ.get("{secret_type.upper().replace(" ", "_")}")'
-                })
-                self.metrics['has_secrets_exposure'] = True
-
-        return bugs
-
-    def _check_error_handling(self, file_path: str, content: str, lines: List[str], is_python: bool, is_javascript: bool) -> List[Dict[str, Any]]:
-        """Check for missing error handling"""
+    def _check_error_handling(self, file_path: str, content: str, lines: List[str], is_python: bool, is_javascript: bool,
+                              file_level: bool = True) -> List[Dict[str, Any]]:
+        """Check for missing error handling (each pattern is reported at its first unguarded match)"""
         bugs = []
 
         if is_python:
@@ -231,7 +240,9 @@ class BackendAnalyzer:
                             'impact': 'Unhandled exceptions crash the application',
                             'fix_suggestion': 'Wrap in try/except: try: await operation() except Exception as e: handle_error(e)'
                         })
-                        break
+                        if file_level:
+                            break
+                        bugs[-1][FIRST_MATCH_KEY] = f'backend:{pattern}'
                     else:
                         self.metrics['has_error_handling'] = True
 
@@ -253,7 +264,9 @@ class BackendAnalyzer:
                             'impact': 'Unhandled promise rejections can crash Node.js process',
                             'fix_suggestion': 'Add error handling: try { await operation() } catch (error) { handleError(error) }'
                         })
-                        break
+                        if file_level:
+                            break
+                        bugs[-1][FIRST_MATCH_KEY] = f'backend:{pattern}'
                     else:
                         self.metrics['has_error_handling'] = True
 
@@ -279,7 +292,8 @@ class BackendAnalyzer:
 
         return bugs
 
-    def _check_unsafe_operations(self, file_path: str, content: str, lines: List[str], is_python: bool) -> List[Dict[str, Any]]:
+    def _check_unsafe_operations(self, file_path: str, content: str, lines: List[str], is_python: bool, use_ast: bool = False,
+                                 mask: Optional[LexicalMask] = None) -> List[Dict[str, Any]]:
         """Check for unsafe operations"""
         bugs = []
 
@@ -299,36 +313,108 @@ class BackendAnalyzer:
                         'fix_suggestion': 'Add WHERE clause to limit deletion: DELETE FROM table WHERE id = ?'
                     })
 
-        # Check for eval in Python/JavaScript
-        if re.search(r'\beval\s*\(', content):
-            for match in re.finditer(r'\beval\s*\(', content):
+        # Check for eval in Python/JavaScript (from the AST pass when the file parsed)
+        if not use_ast and re.search(r'\beval\s*\(', content):
+            for match in code_matches(r'\beval\s*\(', content, mask):
                 line_num = content[:match.start()].count('\n') + 1
-                bugs.append({
-                    'severity': 'CRITICAL',
-                    'category': 'Code Injection',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': 'Use of eval() function',
-                    'impact': 'Arbitrary code execution - attacker can run any code',
-                    'fix_suggestion': 'Remove eval() and use safe alternatives like JSON.parse()'
-                })
+                bugs.append(self._eval_bug(file_path, line_num))
 
-        # Check for exec in Python
-        if is_python and re.search(r'\bexec\s*\(', content):
-            for match in re.finditer(r'\bexec\s*\(', content):
+        # Check for exec in Python (from the AST pass when the file parsed)
+        if is_python and not use_ast and re.search(r'\bexec\s*\(', content):
+            for match in code_matches(r'\bexec\s*\(', content, mask):
                 line_num = content[:match.start()].count('\n') + 1
-                bugs.append({
-                    'severity': 'CRITICAL',
-                    'category': 'Code Injection',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': 'Use of exec() function',
-                    'impact': 'Arbitrary code execution vulnerability',
-                    'fix_suggestion': 'Remove exec() and refactor to use safe alternatives'
-                })
+                bugs.append(self._exec_bug(file_path, line_num))
 
         return bugs
 
+    def register_js_handlers(self, visitor: JSVisitor, file_path: str, findings: List[Dict[str, Any]]):
+        """
+        Register the AST versions of the eval and endpoint rules
+
+        Args:
+            visitor: Shared visitor for the file
+            file_path: Path to file
+            findings: List the handlers append to
+        """
+        def on_call(node):
+            if dotted_name(node.callee) == 'eval':
+                findings.append(self._eval_bug(file_path, node_line(node)))
+            elif property_name(node.callee) in ROUTE_METHODS:
+                router = node.callee.object
+                if router.type == 'Identifier' and router.name in ('app', 'router'):
+                    self.metrics['total_endpoints'] += 1
+
+        visitor.on('CallExpression', on_call)
+
+    def register_py_handlers(self, visitor: PyVisitor, file_path: str, findings: List[Dict[str, Any]]):
+        """
+        Register the AST versions of the SQL injection, eval/exec and endpoint rules
+
+        Args:
+            visitor: Shared visitor for the file
+            file_path: Path to file
+            findings: List the handlers append to
+        """
+        def on_call(node):
+            name = py_dotted_name(node.func)
+            if name == 'eval':
+                findings.append(self._eval_bug(file_path, node.lineno))
+            elif name == 'exec':
+                findings.append(self._exec_bug(file_path, node.lineno))
+            elif isinstance(node.func, ast.Attribute) and node.func.attr == 'execute' and node.args:
+                building = string_building(node.args[0])
+                if building:
+                    findings.append(self._sql_injection_bug(
+                        file_path, node.lineno, SQL_BUILDING_DESCRIPTIONS[building]
+                    ))
+
+        def on_decorator(node):
+            # @app.get(...) / @router.post(...) with or without arguments
+            target = node.func if isinstance(node, ast.Call) else node
+            if isinstance(target, ast.Attribute) and target.attr in ROUTE_METHODS:
+                if isinstance(target.value, ast.Name) and target.value.id in ('app', 'router'):
+                    self.metrics['total_endpoints'] += 1
+
+        visitor.on('Call', on_call)
+        visitor.on(DECORATOR, on_decorator)
+
+    def _sql_injection_bug(self, file_path: str, line_num: int, description: str) -> Dict[str, Any]:
+        """Build a SQL injection finding"""
+        self.metrics['has_sql_injection_risk'] = True
+        return {
+            'severity': 'CRITICAL',
+            'category': 'SQL Injection',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': f'SQL injection vulnerability: {description}',
+            'impact': 'Attackers can execute arbitrary SQL commands, steal/modify/delete data',
+            'fix_suggestion': 'Use parameterized queries: execute("SELECT * FROM users WHERE id = ?", [user_id])'
+        }
+
+    def _exec_bug(self, file_path: str, line_num: int) -> Dict[str, Any]:
+        """Build the exec() finding"""
+        return {
+            'severity': 'CRITICAL',
+            'category': 'Code Injection',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': 'Use of exec() function',
+            'impact': 'Arbitrary code execution vulnerability',
+            'fix_suggestion': 'Remove exec() and refactor to use safe alternatives'
+        }
+
+    def _eval_bug(self, file_path: str, line_num: int) -> Dict[str, Any]:
+        """Build the eval() finding"""
+        return {
+            'severity': 'CRITICAL',
+            'category': 'Code Injection',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': 'Use of eval() function',
+            'impact': 'Arbitrary code execution - attacker can run any code',
+            'fix_suggestion': 'Remove eval() and use safe alternatives like JSON.parse()'
+        }
+
     def _count_endpoints(self, content: str, is_python: bool, is_javascript: bool) -> int:
         """Count API endpoints in file"""
         count = 0
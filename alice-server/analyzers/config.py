@@ -0,0 +1,194 @@
+"""
+ALICE Analysis Configuration
+Per-project analyzer selection, rule selection, thresholds and per-analyzer path
+globs, read from an .alice.yml at the archive root or from the project's settings
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import yaml
+except ImportError:  # YAML is a superset of JSON; without PyYAML only JSON-style files parse
+    yaml = None
+
+from utils.ignore_rules import IgnoreMatcher
+
+# Configuration files looked up at the archive root, first match wins
+CONFIG_FILENAMES = ('.alice.yml', '.alice.yaml')
+
+# Largest configuration file read (bytes)
+MAX_CONFIG_BYTES = 64 * 1024
+
+ANALYZERS = ('frontend', 'backend', 'security', 'content')
+
+# Thresholds and their defaults
+DEFAULT_THRESHOLDS = {
+    # Frontend files longer than this are reported as Code Complexity
+    'max_file_lines': 300,
+    # Files larger than this are scanned in overlapping windows (None = ALICE_LARGE_FILE_BYTES)
+    'large_file_bytes': None,
+}
+
+_TOP_LEVEL_KEYS = {'analyzers', 'disable', 'thresholds'}
+_ANALYZER_KEYS = {'enabled', 'paths', 'disable'}
+
+
+def parse_config_text(text: str) -> Dict[str, Any]:
+    """
+    Parse the text of an .alice.yml
+
+    Args:
+        text: File content (YAML, or JSON)
+
+    Returns:
+        Settings dict
+
+    Raises:
+        ValueError: If the text does not parse into a mapping
+    """
+    try:
+        data = yaml.safe_load(text) if yaml is not None else json.loads(text)
+    except Exception as e:
+        raise ValueError(f'could not parse: {e}')
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError('top level must be a mapping')
+    return data
+
+
+def _string_list(value: Any, where: str) -> List[str]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f'{where} must be a list of strings')
+    return value
+
+
+class AnalysisConfig:
+    """Validated analysis settings of one run"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, source: Optional[str] = None):
+        """
+        Initialize configuration
+
+        Example settings (as in .alice.yml):
+
+            analyzers:
+              content: false
+              frontend:
+                paths: ["src/**", "!src/legacy/"]
+                disable: [Accessibility]
+            disable: [Code Complexity]
+            thresholds:
+              max_file_lines: 500
+
+        Rules are named by their finding category. Paths use gitignore syntax; an analyzer
+        with paths only runs on files they match.
+
+        Args:
+            settings: Settings dict (None = defaults)
+            source: Where the settings came from (reported with the result)
+
+        Raises:
+            ValueError: If the settings are invalid
+        """
+        settings = settings or {}
+        if not isinstance(settings, dict):
+            raise ValueError('settings must be a mapping')
+        unknown = set(settings) - _TOP_LEVEL_KEYS
+        if unknown:
+            raise ValueError(f'unknown keys: {", ".join(sorted(unknown))}')
+
+        self.source = source
+        self.disabled_analyzers: Set[str] = set()
+        self.disabled_rules: Set[str] = {rule.lower() for rule in _string_list(settings.get('disable', []), 'disable')}
+        self.analyzer_rules: Dict[str, Set[str]] = {}
+        self._paths: Dict[str, IgnoreMatcher] = {}
+
+        analyzers = settings.get('analyzers') or {}
+        if not isinstance(analyzers, dict):
+            raise ValueError('analyzers must be a mapping')
+        for name, options in analyzers.items():
+            if name not in ANALYZERS:
+                raise ValueError(f'unknown analyzer {name!r} (expected one of {", ".join(ANALYZERS)})')
+            if isinstance(options, bool):
+                options = {'enabled': options}
+            if not isinstance(options, dict):
+                raise ValueError(f'analyzers.{name} must be true, false or a mapping')
+            unknown = set(options) - _ANALYZER_KEYS
+            if unknown:
+                raise ValueError(f'unknown keys in analyzers.{name}: {", ".join(sorted(unknown))}')
+
+            if options.get('enabled', True) is False:
+                self.disabled_analyzers.add(name)
+            if 'disable' in options:
+                self.analyzer_rules[name] = {
+                    rule.lower() for rule in _string_list(options['disable'], f'analyzers.{name}.disable')
+                }
+            if 'paths' in options:
+                matcher = IgnoreMatcher()
+                matcher.add(_string_list(options['paths'], f'analyzers.{name}.paths'), 'paths')
+                self._paths[name] = matcher
+
+        thresholds = settings.get('thresholds') or {}
+        if not isinstance(thresholds, dict):
+            raise ValueError('thresholds must be a mapping')
+        self.thresholds = dict(DEFAULT_THRESHOLDS)
+        for key, value in thresholds.items():
+            if key not in DEFAULT_THRESHOLDS:
+                raise ValueError(f'unknown threshold {key!r}')
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f'thresholds.{key} must be a positive integer')
+            self.thresholds[key] = value
+
+        self._settings = settings
+
+    @property
+    def is_default(self) -> bool:
+        """Whether the settings change nothing"""
+        return (not self.disabled_analyzers and not self.disabled_rules and not self.analyzer_rules
+                and not self._paths and self.thresholds == DEFAULT_THRESHOLDS)
+
+    def runs(self, analyzer: str, relative_path: str) -> bool:
+        """Check whether an analyzer runs on a file"""
+        if analyzer in self.disabled_analyzers:
+            return False
+        matcher = self._paths.get(analyzer)
+        return matcher is None or matcher.selects(relative_path.replace('\\', '/'))
+
+    def disabled_for(self, analyzer: str) -> Set[str]:
+        """Get the lowercased rule categories disabled for an analyzer"""
+        return self.disabled_rules | self.analyzer_rules.get(analyzer, set())
+
+    def digest(self) -> str:
+        """Short digest of the settings ('' for the defaults), to keep cached results apart"""
+        if self.is_default:
+            return ''
+        canonical = json.dumps(self._settings, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:8]
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the effective settings for the report"""
+        return {
+            'source': self.source,
+            'disabled_analyzers': sorted(self.disabled_analyzers),
+            'disabled_rules': sorted(self.disabled_rules),
+            'analyzer_rules': {name: sorted(rules) for name, rules in sorted(self.analyzer_rules.items())},
+            'path_filtered': sorted(self._paths),
+            'thresholds': self.thresholds
+        }
+
+
+def rule_enabled(disabled: Set[str], *categories: str) -> bool:
+    """Check whether any of a check's finding categories is still enabled"""
+    return not disabled or any(category.lower() not in disabled for category in categories)
+
+
+def without_disabled(findings: Iterable[Dict[str, Any]], disabled: Set[str]) -> List[Dict[str, Any]]:
+    """Drop findings of disabled rules"""
+    if not disabled:
+        return list(findings)
+    return [finding for finding in findings if str(finding.get('category', '')).lower() not in disabled]
@@ -3,68 +3,57 @@ ALICE Content Analyzer
 Analyzes code comments, documentation, and text content for grammar and spelling
 """
 
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
+
+from analyzers.lexical_mask import LexicalMask, build_mask
+from analyzers.config import rule_enabled
+from analyzers.spell_checker import comment_words, get_spell_checker
+from analyzers.grammar_rules import get_grammar_checker
+
+# Shortest words spell-checked (identifier parts are often abbreviations)
+MIN_WORD_LENGTH = 3
+MIN_IDENTIFIER_PART_LENGTH = 4
+
+# Shortest words corrected at edit distance 2
+MIN_TWO_EDIT_LENGTH = 6
 
 
 class ContentAnalyzer:
     """Analyzes text content for grammar, spelling, and documentation quality"""
 
-    def __init__(self):
+    def __init__(self, retain_findings: bool = True, disabled_rules: Optional[Set[str]] = None):
+        """
+        Initialize content analyzer
+
+        Args:
+            retain_findings: Keep findings for get_issues() (the analysis pipeline collects them itself)
+            disabled_rules: Lowercased finding categories not to check or report
+        """
+        self.retain_findings = retain_findings
+        self.check_spelling = rule_enabled(disabled_rules or set(), 'Spelling')
+        self.check_grammar = rule_enabled(disabled_rules or set(), 'Grammar')
         self.issues = []
         self.metrics = {
             'has_documentation': False,
             'documentation_quality': 0,
             'comment_count': 0,
             'spelling_errors': 0,
+            'spelling_unchecked': 0,  # comments skipped while the spelling index was not ready
             'grammar_issues': 0
         }
 
-        # Common technical terms that should be ignored in spell check
-        self.technical_terms = {
-            'api', 'url', 'http', 'https', 'json', 'xml', 'html', 'css', 'js',
-            'async', 'await', 'const', 'var', 'let', 'typeof', 'instanceof',
-            'boolean', 'nullable', 'auth', 'auth0', 'oauth', 'jwt', 'csrf',
-            'cors', 'sql', 'nosql', 'postgres', 'mongodb', 'redis', 'npm',
-            'middleware', 'axios', 'uuid', 'enum', 'dto', 'orm', 'cli'
-        }
+        # Dictionary, index and compiled grammar rules are shared by every analyzer in the process
+        self.spell_checker = get_spell_checker() if self.check_spelling else None
+        self.grammar_checker = get_grammar_checker() if self.check_grammar else None
 
-        # Common misspellings in code comments
-        self.common_misspellings = {
-            'recieve': 'receive',
-            'occured': 'occurred',
-            'seperate': 'separate',
-            'definately': 'definitely',
-            'wich': 'which',
-            'thier': 'their',
-            'teh': 'the',
-            'recieved': 'received',
-            'occurance': 'occurrence',
-            'sucessful': 'successful',
-            'sucessfully': 'successfully',
-            'begining': 'beginning',
-            'comming': 'coming',
-            'compatability': 'compatibility',
-            'enviroment': 'environment',
-            'langauge': 'language',
-            'mesage': 'message',
-            'necesary': 'necessary',
-            'occassion': 'occasion',
-            'recomend': 'recommend',
-            'refered': 'referred',
-            'seperated': 'separated',
-            'succesful': 'successful',
-            'temperary': 'temporary',
-            'usualy': 'usually'
-        }
-
-    def analyze_file(self, file_path: str, content: str) -> List[Dict[str, Any]]:
+    def analyze_file(self, file_path: str, content: str, mask: Optional[LexicalMask] = None) -> List[Dict[str, Any]]:
         """
         Analyze content in a file
 
         Args:
             file_path: Path to file
             content: File content
+            mask: Lexical mask already built for the file (built here when omitted)
 
         Returns:
             List of content issues found
@@ -73,7 +62,7 @@ class ContentAnalyzer:
         lines = content.split('\n')
 
         # Extract comments and documentation
-        comments = self._extract_comments(content, file_path)
+        comments = self._extract_comments(content, file_path, mask)
 
         # Analyze each comment
         for comment_info in comments:
@@ -81,12 +70,15 @@ class ContentAnalyzer:
             line_num = comment_info['line']
 
             # Check spelling
-            spelling_issues = self._check_spelling(comment_text, file_path, line_num)
-            file_issues.extend(spelling_issues)
+            if self.check_spelling:
+                file_issues.extend(self._check_spelling(comment_text, file_path, line_num))
 
-            # Check grammar patterns
-            grammar_issues = self._check_grammar(comment_text, file_path, line_num)
-            file_issues.extend(grammar_issues)
+        if self.check_spelling and self.spell_checker is None:
+            self.metrics['spelling_unchecked'] += len(comments)
+
+        # Check grammar patterns (all comments in one pass)
+        if self.check_grammar:
+            file_issues.extend(self._check_grammar(comments, file_path))
 
         # Check for documentation presence
         has_docs = self._check_documentation(content, file_path)
@@ -96,102 +88,71 @@ class ContentAnalyzer:
         # Update metrics
         self.metrics['comment_count'] += len(comments)
 
-        self.issues.extend(file_issues)
+        if self.retain_findings:
+            self.issues.extend(file_issues)
         return file_issues
 
-    def _extract_comments(self, content: str, file_path: str) -> List[Dict[str, str]]:
-        """Extract comments from code"""
-        comments = []
-
-        # Determine file type
-        is_python = file_path.endswith('.py')
-        is_js_family = file_path.endswith(('.js', '.ts', '.jsx', '.tsx'))
-
-        if is_python:
-            # Python comments and docstrings
-            # Single line comments
-            for match in re.finditer(r'#\s*(.+)$', content, re.MULTILINE):
-                line_num = content[:match.start()].count('\n') + 1
-                comments.append({
-                    'text': match.group(1).strip(),
-                    'line': line_num
-                })
-
-            # Docstrings
-            for match in re.finditer(r'"""(.+?)"""', content, re.DOTALL):
-                line_num = content[:match.start()].count('\n') + 1
-                comments.append({
-                    'text': match.group(1).strip(),
-                    'line': line_num
-                })
-
-        if is_js_family:
-            # JavaScript/TypeScript comments
-            # Single line comments
-            for match in re.finditer(r'//\s*(.+)$', content, re.MULTILINE):
-                line_num = content[:match.start()].count('\n') + 1
-                comments.append({
-                    'text': match.group(1).strip(),
-                    'line': line_num
-                })
-
-            # Multi-line comments
-            for match in re.finditer(r'/\*(.+?)\*/', content, re.DOTALL):
-                line_num = content[:match.start()].count('\n') + 1
-                comments.append({
-                    'text': match.group(1).strip(),
-                    'line': line_num
-                })
-
-        return comments
+    def _extract_comments(self, content: str, file_path: str, mask: Optional[LexicalMask] = None) -> List[Dict[str, str]]:
+        """Extract comments and docstrings from code"""
+        if mask is None:
+            mask = build_mask(content, file_path)
+
+        # Files without a lexer (docs, config) have no comments
+        if mask is None:
+            return []
+
+        return mask.comments()
 
     def _check_spelling(self, text: str, file_path: str, line_num: int) -> List[Dict[str, Any]]:
         """Check for spelling errors"""
         issues = []
-
-        # Extract words (ignore code-like patterns)
-        words = re.findall(r'\b[a-z]+\b', text.lower())
-
-        for word, correction in self.common_misspellings.items():
-            if word in words:
-                issues.append({
-                    'severity': 'LOW',
-                    'category': 'Spelling',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': f'Misspelled word: "{word}" should be "{correction}"',
-                    'impact': 'Reduced code professionalism and clarity',
-                    'fix_suggestion': f'Correct spelling to: {correction}'
-                })
-                self.metrics['spelling_errors'] += 1
+        if self.spell_checker is None:
+            return issues
+
+        checked = set()
+        for word, in_identifier in comment_words(text):
+            if word in checked or len(word) < (MIN_IDENTIFIER_PART_LENGTH if in_identifier else MIN_WORD_LENGTH):
+                continue
+            checked.add(word)
+
+            suggestion = self.spell_checker.suggest(word)
+            if suggestion is None:
+                continue
+            correction, distance = suggestion
+            # Short words and identifier parts (often abbreviations) only get one-edit corrections
+            if distance > 1 and (in_identifier or len(word) < MIN_TWO_EDIT_LENGTH):
+                continue
+
+            issues.append({
+                'severity': 'LOW',
+                'category': 'Spelling',
+                'file_path': file_path,
+                'line_number': line_num,
+                'description': f'Misspelled word: "{word}" should be "{correction}"',
+                'impact': 'Reduced code professionalism and clarity',
+                'fix_suggestion': f'Correct spelling to: {correction}'
+            })
+            self.metrics['spelling_errors'] += 1
 
         return issues
 
-    def _check_grammar(self, text: str, file_path: str, line_num: int) -> List[Dict[str, Any]]:
-        """Check for common grammar issues"""
+    def _check_grammar(self, comments: List[Dict[str, Any]], file_path: str) -> List[Dict[str, Any]]:
+        """Check a file's comments against the grammar rule pack"""
         issues = []
-
-        # Common grammar patterns
-        grammar_patterns = [
-            (r'\bit\'s\b', 'its', 'Possessive "its" doesn\'t have an apostrophe'),
-            (r'\byour\s+welcome\b', 'you\'re welcome', 'Should be "you\'re" (you are)'),
-            (r'\bshould\s+of\b', 'should have', 'Should be "should have" not "should of"'),
-            (r'\bcould\s+of\b', 'could have', 'Should be "could have" not "could of"'),
-            (r'\bwould\s+of\b', 'would have', 'Should be "would have" not "would of"')
-        ]
-
-        for pattern, correction, explanation in grammar_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                issues.append({
-                    'severity': 'LOW',
-                    'category': 'Grammar',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': f'Grammar issue: {explanation}',
-                    'impact': 'Reduced code professionalism',
-                    'fix_suggestion': f'Use: {correction}'
-                })
-                self.metrics['grammar_issues'] += 1
+        if self.grammar_checker is None:
+            return issues
+
+        for index, rule in self.grammar_checker.check([comment['text'] for comment in comments]):
+            issues.append({
+                'severity': 'LOW',
+                'category': 'Grammar',
+                'file_path': file_path,
+                'line_number': comments[index]['line'],
+                'description': f'Grammar issue: {rule.explanation}',
+                'impact': 'Reduced code professionalism',
+                'fix_suggestion': f'Use: {rule.correction}'
+            })
+            self.metrics['grammar_issues'] += 1
 
         return issues
 
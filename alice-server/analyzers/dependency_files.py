@@ -0,0 +1,214 @@
+"""
+ALICE Dependency Files
+Extracts (package, version) pairs with their line numbers from npm and Python
+manifests and lockfiles for the offline advisory lookup
+"""
+
+import json
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from utils.file_classifier import PARSED_LOCKFILE_NAMES
+from utils.version_keys import NPM, PYPI, semver_key
+
+# Manifests declaring dependencies
+MANIFEST_NAMES = {'package.json'}
+
+_REQUIREMENTS_NAME = re.compile(r'^requirements([-_.][\w.-]*)?\.txt$')
+
+_PACKAGE_JSON_SECTIONS = ('dependencies', 'devDependencies', 'optionalDependencies', 'peerDependencies')
+
+# Exact pins and the lower bound of ^ / ~ / >= ranges; anything else (tags, URLs, unions) is skipped
+_NPM_SPEC = re.compile(r'^\s*(=|\^|~|>=)?\s*v?(\d+(?:\.\d+){0,2}(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?)\s*$')
+
+_REQUIREMENT_PIN = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*===?\s*([^\s;#,]+)\s*(?:[;#].*)?$')
+
+_TOML_STRING = re.compile(r'^\s*(name|version)\s*=\s*"([^"]*)"\s*$')
+
+
+class Dependency(NamedTuple):
+    """One dependency at one version"""
+    ecosystem: str
+    name: str
+    version: str
+    line_number: int
+    # False when version is only the lower bound of a declared range
+    exact: bool
+
+
+def is_dependency_file(file_path: str) -> bool:
+    """Check whether a file is a parsed manifest or lockfile"""
+    base_name = os.path.basename(file_path).lower()
+    return base_name in PARSED_LOCKFILE_NAMES or base_name in MANIFEST_NAMES or bool(_REQUIREMENTS_NAME.match(base_name))
+
+
+class _Lines:
+    """Offset -> line number, for locating keys found by string search"""
+
+    def __init__(self, content: str):
+        self._starts = [0] + [match.end() for match in re.finditer('\n', content)]
+
+    def of(self, offset: int) -> int:
+        return bisect_right(self._starts, max(offset, 0))
+
+
+def _package_json(content: str) -> Iterator[Dependency]:
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        return
+    lines = _Lines(content)
+    for section in _PACKAGE_JSON_SECTIONS:
+        dependencies = data.get(section)
+        if not isinstance(dependencies, dict):
+            continue
+        cursor = content.find(f'"{section}"')
+        for name, spec in dependencies.items():
+            match = _NPM_SPEC.match(spec) if isinstance(spec, str) else None
+            if not match:
+                continue
+            position = content.find(f'"{name}"', cursor)
+            if position != -1:
+                cursor = position
+            yield Dependency(NPM, name, match.group(2), lines.of(cursor), match.group(1) in (None, '='))
+
+
+def _package_lock(content: str) -> Iterator[Dependency]:
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        return
+    lines = _Lines(content)
+    # Keys are visited in document order, so each search continues from the previous hit
+    cursor = 0
+
+    packages = data.get('packages')
+    if isinstance(packages, dict):
+        # lockfileVersion 2 and 3: "node_modules/a/node_modules/b": {"version": ...}
+        for path, entry in packages.items():
+            if not path or not isinstance(entry, dict) or entry.get('link') or 'node_modules/' not in path:
+                continue
+            position = content.find(f'"{path}"', cursor)
+            if position != -1:
+                cursor = position
+            version = entry.get('version')
+            if isinstance(version, str):
+                name = entry.get('name') or path.rsplit('node_modules/', 1)[1]
+                yield Dependency(NPM, name, version, lines.of(cursor), True)
+        return
+
+    # lockfileVersion 1: nested "dependencies"
+    def walk(dependencies) -> Iterator[Dependency]:
+        nonlocal cursor
+        for name, entry in dependencies.items():
+            if not isinstance(entry, dict):
+                continue
+            position = content.find(f'"{name}"', cursor)
+            if position != -1:
+                cursor = position
+            version = entry.get('version')
+            if isinstance(version, str) and semver_key(version) is not None:
+                yield Dependency(NPM, name, version, lines.of(cursor), True)
+            if isinstance(entry.get('dependencies'), dict):
+                yield from walk(entry['dependencies'])
+
+    if isinstance(data.get('dependencies'), dict):
+        yield from walk(data['dependencies'])
+
+
+def _yarn_name(spec: str) -> Optional[str]:
+    """Package name of a yarn.lock descriptor (pkg@^1.0.0, @scope/pkg@npm:^1.0.0)"""
+    spec = spec.strip().strip('"')
+    at = spec.find('@', 1)
+    return spec[:at] if at > 0 else None
+
+
+def _yarn_lock(content: str) -> Iterator[Dependency]:
+    name = None
+    header_line = 0
+    for line_number, line in enumerate(content.split('\n'), 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        if not line[0].isspace():
+            # Entry header: one or more descriptors of the same package
+            name = _yarn_name(line.rstrip().rstrip(':').split(',')[0]) if line.rstrip().endswith(':') else None
+            header_line = line_number
+            continue
+        stripped = line.strip()
+        if name and stripped.startswith('version'):
+            # yarn v1: version "1.2.3"; berry: version: 1.2.3
+            version = stripped[len('version'):].lstrip(':').strip().strip('"')
+            yield Dependency(NPM, name, version, header_line, True)
+            name = None
+
+
+def _requirements(content: str) -> Iterator[Dependency]:
+    for line_number, line in enumerate(content.split('\n'), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith(('#', '-')):
+            continue
+        match = _REQUIREMENT_PIN.match(stripped.rstrip('\\').strip())
+        if match:
+            yield Dependency(PYPI, match.group(1), match.group(2), line_number, True)
+
+
+def _poetry_lock(content: str) -> Iterator[Dependency]:
+    in_package = False
+    fields: Dict[str, Tuple[str, int]] = {}
+
+    def flush() -> Iterator[Dependency]:
+        if 'name' in fields and 'version' in fields:
+            yield Dependency(PYPI, fields['name'][0], fields['version'][0], fields['name'][1], True)
+        fields.clear()
+
+    for line_number, line in enumerate(content.split('\n'), 1):
+        stripped = line.strip()
+        if stripped.startswith('['):
+            yield from flush()
+            in_package = stripped == '[[package]]'
+            continue
+        if in_package:
+            match = _TOML_STRING.match(line)
+            if match and match.group(1) not in fields:
+                fields[match.group(1)] = (match.group(2), line_number)
+    yield from flush()
+
+
+_PARSERS = {
+    'package.json': _package_json,
+    'package-lock.json': _package_lock,
+    'npm-shrinkwrap.json': _package_lock,
+    'yarn.lock': _yarn_lock,
+    'poetry.lock': _poetry_lock,
+}
+
+
+def parse_dependencies(file_path: str, content: str) -> List[Dependency]:
+    """
+    Extract the dependencies of a manifest or lockfile
+
+    Each (ecosystem, name, version) is reported once, at its first line.
+
+    Args:
+        file_path: Path to file (the name selects the parser)
+        content: File content
+
+    Returns:
+        Dependencies; empty for unsupported or malformed files
+    """
+    base_name = os.path.basename(file_path).lower()
+    parser = _PARSERS.get(base_name) or (_requirements if _REQUIREMENTS_NAME.match(base_name) else None)
+    if parser is None:
+        return []
+
+    dependencies = []
+    seen = set()
+    try:
+        for dependency in parser(content):
+            key = (dependency.ecosystem, dependency.name, dependency.version)
+            if key not in seen:
+                seen.add(key)
+                dependencies.append(dependency)
+    except ValueError as e:
+        print(f"Error parsing dependencies of {file_path}: {e}")
+    return dependencies
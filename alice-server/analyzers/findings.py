@@ -0,0 +1,312 @@
+"""
+ALICE Findings
+Compact finding records backed by interned rule and file tables
+"""
+
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+# Lower is more severe
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITIES)}
+
+# Analyzers a finding can come from, in bitmask order
+SOURCES = ('frontend', 'backend', 'security', 'content')
+
+# Categories that name the same issue across analyzers
+CATEGORY_ALIASES = {
+    'exposed secrets': 'secrets',
+    'hardcoded encryption key': 'secrets',
+    'xss vulnerability': 'xss'
+}
+
+
+# Set on findings of a rule a whole-file scan reports only at its first match: a window of a
+# larger file reports every match with the rule's name here, and analyze_windows keeps the first
+FIRST_MATCH_KEY = 'first_match_of'
+
+# Locations kept on an aggregate finding
+AGGREGATE_SAMPLE_SIZE = 10
+
+
+def normalize_category(category: str) -> str:
+    """Normalize a category for duplicate detection"""
+    category = category.strip().lower()
+    return CATEGORY_ALIASES.get(category, category)
+
+
+class Rule(NamedTuple):
+    """Text shared by every finding of one rule"""
+    severity: str
+    category: str
+    description: str
+    impact: str
+    fix_suggestion: str
+
+
+class Finding(NamedTuple):
+    """One finding: indexes into the store's rule and file tables, the line and the reporting analyzers"""
+    rule_id: int
+    file_id: int
+    line_number: int
+    sources: int = 0  # bitmask over SOURCES
+    count: int = 1  # occurrences collapsed into this record (aggregates)
+
+
+class FindingStore:
+    """
+    Findings of one analysis
+
+    Each distinct rule text and file path is stored once; a finding is four small ints.
+    Findings convert back to the analyzer dict shape only for JSON/database output.
+
+    Findings from different analyzers on the same (file, line, normalized category) are
+    merged as they are added: the most severe report is kept and every analyzer that
+    reported it is recorded in detected_by.
+
+    Occurrences of a rule beyond the per-file or per-analysis cap collapse into one
+    aggregate finding per file (or per analysis) with a count and sample locations.
+    """
+
+    def __init__(self, per_file_cap: Optional[int] = None, per_analysis_cap: Optional[int] = None):
+        """
+        Initialize store
+
+        Args:
+            per_file_cap: Findings kept per rule per file before aggregating (None = no cap)
+            per_analysis_cap: Findings kept per rule per analysis before aggregating (None = no cap)
+        """
+        self.per_file_cap = per_file_cap or None
+        self.per_analysis_cap = per_analysis_cap or None
+        self.rules: List[Rule] = []
+        self.files: List[str] = []
+        self.findings: List[Finding] = []
+        self.duplicates_merged = 0
+        self.findings_aggregated = 0
+        self._rule_ids: Dict[Rule, int] = {}
+        self._file_ids: Dict[str, int] = {}
+        # normalized category of each rule, as an index into _categories
+        self._rule_categories: List[int] = []
+        self._category_ids: Dict[str, int] = {}
+        # (file_id, line, category id) packed into one int -> position
+        self._index: Dict[int, int] = {}
+        self._rule_file_counts: Dict[Tuple[int, int], int] = {}
+        self._rule_counts: Dict[int, int] = {}
+        # (rule_id, file_id or None for analysis-wide) -> position of the aggregate
+        self._aggregates: Dict[Tuple[int, Optional[int]], int] = {}
+        # position of an aggregate -> (scope file_id or None, sampled (file_id, line) pairs)
+        self._samples: Dict[int, Tuple[Optional[int], List[Tuple[int, int]]]] = {}
+        # position of an aggregate carried over from an earlier run -> its sample locations
+        self._carried: Dict[int, List[str]] = {}
+
+    @classmethod
+    def from_dicts(cls, bugs: Iterable[Dict[str, Any]]) -> 'FindingStore':
+        """Build a store from analyzer finding dicts"""
+        store = cls()
+        for bug in bugs:
+            store.add(bug)
+        return store
+
+    def rule_id(self, severity: str, category: str, description: str, impact: str, fix_suggestion: str) -> int:
+        """Get the id of a rule, interning its text on first use"""
+        rule = Rule(severity, category, description, impact, fix_suggestion)
+        rule_id = self._rule_ids.get(rule)
+        if rule_id is None:
+            rule = Rule(*(sys.intern(text) for text in rule))
+            rule_id = len(self.rules)
+            self.rules.append(rule)
+            self._rule_ids[rule] = rule_id
+            category = normalize_category(category)
+            self._rule_categories.append(self._category_ids.setdefault(category, len(self._category_ids)))
+        return rule_id
+
+    def file_id(self, file_path: str) -> int:
+        """Get the id of a file path"""
+        file_id = self._file_ids.get(file_path)
+        if file_id is None:
+            file_id = len(self.files)
+            self.files.append(file_path)
+            self._file_ids[file_path] = file_id
+        return file_id
+
+    def add(self, bug: Dict[str, Any], aggregate: bool = False) -> Finding:
+        """
+        Compact and keep an analyzer finding, merging it into a duplicate from another analyzer
+
+        Args:
+            bug: Finding dict (severity, category, file_path, line_number, description, impact,
+                fix_suggestion, optional detected_by list of analyzer names; occurrences and
+                sample_locations for an aggregate from an earlier run)
+            aggregate: Collapse it into its rule's analysis-wide aggregate whatever the caps
+                (keeps it counted and scored in constant memory)
+
+        Returns:
+            The stored record (the merged one for duplicates)
+        """
+        severity = bug.get('severity', 'LOW')
+        category = bug.get('category', 'Unknown')
+        rule_id = self.rule_id(
+            severity,
+            category,
+            bug.get('description', ''),
+            bug.get('impact', ''),
+            bug.get('fix_suggestion', '')
+        )
+        file_id = self.file_id(bug.get('file_path') or '')
+        line_number = bug.get('line_number') or 0
+        sources = _source_mask(bug.get('detected_by'))
+
+        occurrences = bug.get('occurrences')
+        if occurrences:
+            # An aggregate from an earlier run (a resumed partial analysis) is kept as it was
+            return self._carry(rule_id, file_id, line_number, sources, occurrences, bug.get('sample_locations') or [])
+
+        # Lines and file ids stay below 2**32; the category id takes the high bits
+        key = (self._rule_categories[rule_id] << 64) | (line_number << 32) | file_id
+        position = self._index.get(key)
+
+        if position is not None:
+            existing = self.findings[position]
+            # An analyzer reporting the same key twice found two issues, not a duplicate
+            if sources and not sources & existing.sources:
+                if SEVERITY_RANK.get(severity, len(SEVERITIES)) < SEVERITY_RANK.get(self.rules[existing.rule_id].severity, len(SEVERITIES)):
+                    existing = existing._replace(rule_id=rule_id)
+                merged = existing._replace(sources=existing.sources | sources)
+                self.findings[position] = merged
+                self.duplicates_merged += 1
+                return merged
+
+        if aggregate:
+            return self._aggregate(rule_id, None, file_id, line_number, sources)
+
+        if self.per_file_cap or self.per_analysis_cap:
+            file_count = self._rule_file_counts.get((rule_id, file_id), 0) + 1
+            self._rule_file_counts[(rule_id, file_id)] = file_count
+            rule_count = self._rule_counts.get(rule_id, 0) + 1
+            self._rule_counts[rule_id] = rule_count
+
+            if self.per_analysis_cap and rule_count > self.per_analysis_cap:
+                return self._aggregate(rule_id, None, file_id, line_number, sources)
+            if self.per_file_cap and file_count > self.per_file_cap:
+                return self._aggregate(rule_id, file_id, file_id, line_number, sources)
+
+        finding = Finding(rule_id, file_id, line_number, sources)
+        if position is None:
+            self._index[key] = len(self.findings)
+        self.findings.append(finding)
+        return finding
+
+    def _aggregate(self, rule_id: int, scope: Optional[int], file_id: int, line_number: int, sources: int) -> Finding:
+        """Collapse an over-cap occurrence into the aggregate for its rule and scope"""
+        self.findings_aggregated += 1
+        position = self._aggregates.get((rule_id, scope))
+
+        if position is None:
+            position = len(self.findings)
+            finding = Finding(rule_id, file_id, line_number, sources, 1)
+            self.findings.append(finding)
+            self._aggregates[(rule_id, scope)] = position
+            self._samples[position] = (scope, [(file_id, line_number)])
+            return finding
+
+        finding = self.findings[position]
+        finding = finding._replace(count=finding.count + 1, sources=finding.sources | sources)
+        self.findings[position] = finding
+        samples = self._samples[position][1]
+        if len(samples) < AGGREGATE_SAMPLE_SIZE:
+            samples.append((file_id, line_number))
+        return finding
+
+    def rule(self, finding: Finding) -> Rule:
+        """Get the rule of a finding"""
+        return self.rules[finding.rule_id]
+
+    def severity_counts(self) -> Dict[str, int]:
+        """Count findings per severity (aggregates count every occurrence)"""
+        per_rule = [0] * len(self.rules)
+        for finding in self.findings:
+            per_rule[finding.rule_id] += finding.count
+
+        counts = dict.fromkeys(SEVERITIES, 0)
+        for rule, count in zip(self.rules, per_rule):
+            counts[rule.severity] = counts.get(rule.severity, 0) + count
+        return counts
+
+    def _carry(self, rule_id: int, file_id: int, line_number: int, sources: int, count: int,
+               sample_locations: List[str]) -> Finding:
+        """Keep an aggregate that was already described (its description holds the count)"""
+        self._carried[len(self.findings)] = sample_locations
+        finding = Finding(rule_id, file_id, line_number, sources, count)
+        self.findings.append(finding)
+        return finding
+
+    def to_dict(self, finding: Finding) -> Dict[str, Any]:
+        """Convert a finding to the analyzer dict shape"""
+        rule = self.rules[finding.rule_id]
+        return {
+            'severity': rule.severity,
+            'category': rule.category,
+            'file_path': self.files[finding.file_id] or None,
+            'line_number': finding.line_number or None,
+            'description': rule.description,
+            'impact': rule.impact,
+            'fix_suggestion': rule.fix_suggestion,
+            'detected_by': source_names(finding.sources)
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert every finding to the analyzer dict shape"""
+        bugs = []
+        for position, finding in enumerate(self.findings):
+            bug = self.to_dict(finding)
+            if position in self._samples:
+                self._describe_aggregate(bug, finding, *self._samples[position])
+            elif position in self._carried:
+                bug['occurrences'] = finding.count
+                bug['sample_locations'] = self._carried[position]
+            bugs.append(bug)
+        return bugs
+
+    def _describe_aggregate(self, bug: Dict[str, Any], finding: Finding, scope: Optional[int],
+                            samples: List[Tuple[int, int]]):
+        """Add the occurrence count and sample locations to an aggregate's dict"""
+        bug['occurrences'] = finding.count
+        bug['sample_locations'] = [f'{self.files[file_id]}:{line}' for file_id, line in samples]
+
+        if scope is None:
+            bug['file_path'] = None
+            bug['line_number'] = None
+            where = f'across the codebase, e.g. {", ".join(bug["sample_locations"][:3])}'
+        else:
+            where = f'in this file, e.g. lines {", ".join(str(line) for _, line in samples[:5])}'
+
+        bug['description'] = f'{bug["description"]} ({finding.count} more occurrences {where})'
+
+    def total(self) -> int:
+        """Count every occurrence, including those collapsed into aggregates"""
+        return sum(finding.count for finding in self.findings)
+
+    def detected_by(self, finding: Finding) -> List[str]:
+        """Get the analyzers that reported a finding"""
+        return source_names(finding.sources)
+
+    def __len__(self) -> int:
+        return len(self.findings)
+
+    def __iter__(self) -> Iterator[Finding]:
+        return iter(self.findings)
+
+
+def _source_mask(names: Optional[Iterable[str]]) -> int:
+    """Convert analyzer names to a SOURCES bitmask"""
+    mask = 0
+    for name in names or ():
+        if name in SOURCES:
+            mask |= 1 << SOURCES.index(name)
+    return mask
+
+
+def source_names(mask: int) -> List[str]:
+    """Convert a SOURCES bitmask to analyzer names"""
+    return [name for bit, name in enumerate(SOURCES) if mask & (1 << bit)]
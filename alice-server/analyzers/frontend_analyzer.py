@@ -5,15 +5,38 @@ Analyzes React/JavaScript code for bugs, security issues, and best practices
 
 import re
 import ast
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, Set
 import esprima
 from pathlib import Path
 
+from analyzers.js_frontend import (
+    JSVisitor, node_line, dotted_name, property_name, iter_subtree,
+    jsx_attribute_names, returned_nodes
+)
+from analyzers.lexical_mask import LexicalMask
+from analyzers.config import rule_enabled, without_disabled
+from analyzers.findings import FIRST_MATCH_KEY
+
+# React state setters: setCount, setData, setState
+SETTER_PATTERN = re.compile(r'^set[A-Z]')
+
 
 class FrontendAnalyzer:
     """Analyzes frontend code (React, JavaScript, TypeScript)"""
 
-    def __init__(self):
+    def __init__(self, retain_findings: bool = True, disabled_rules: Optional[Set[str]] = None,
+                 max_file_lines: int = 300):
+        """
+        Initialize frontend analyzer
+
+        Args:
+            retain_findings: Keep findings for get_bugs() (the analysis pipeline collects them itself)
+            disabled_rules: Lowercased finding categories not to check or report
+            max_file_lines: Files longer than this are reported as Code Complexity
+        """
+        self.retain_findings = retain_findings
+        self.disabled_rules = disabled_rules or set()
+        self.max_file_lines = max_file_lines
         self.bugs = []
         self.metrics = {
             'has_typescript': False,
@@ -26,18 +49,24 @@ class FrontendAnalyzer:
             'total_files': 0
         }
 
-    def analyze_file(self, file_path: str, content: str) -> List[Dict[str, Any]]:
+    def analyze_file(self, file_path: str, content: str, ast_findings: Optional[List[Dict[str, Any]]] = None,
+                     mask: Optional[LexicalMask] = None, file_level: bool = True) -> List[Dict[str, Any]]:
         """
         Analyze a single frontend file
 
         Args:
             file_path: Path to file
             content: File content
+            ast_findings: Findings from the shared AST pass (rules it covers skip their regex scan)
+            mask: Lexical mask of the file; security patterns in comments and strings are ignored
+            file_level: False for one window of a larger file (the caller checks the file's length once
+                and keeps the first match of first-match-only rules)
 
         Returns:
             List of bugs found
         """
         file_bugs = []
+        use_ast = ast_findings is not None
 
         # Check file type
         is_typescript = file_path.endswith(('.ts', '.tsx'))
@@ -52,82 +81,95 @@ class FrontendAnalyzer:
         self.metrics['total_files'] += 1
 
         # Check complexity
-        if len(lines) > 300:
-            file_bugs.append({
-                'severity': 'MEDIUM',
-                'category': 'Code Complexity',
-                'file_path': file_path,
-                'line_number': 1,
-                'description': f'File has {len(lines)} lines (>300), consider breaking into smaller components',
-                'impact': 'Reduced maintainability and readability',
-                'fix_suggestion': 'Split into smaller, focused components with single responsibilities'
-            })
+        if file_level:
+            file_bugs.extend(self.check_file_length(file_path, len(lines)))
 
         # Analyze React-specific patterns
-        if is_react:
-            file_bugs.extend(self._check_react_patterns(file_path, content, lines))
+        if is_react and rule_enabled(self.disabled_rules, 'Infinite Loop', 'React Best Practice', 'Performance'):
+            file_bugs.extend(self._check_react_patterns(file_path, content, lines, use_ast, file_level))
 
         # Check for security vulnerabilities
-        file_bugs.extend(self._check_security_issues(file_path, content, lines))
+        if rule_enabled(self.disabled_rules, 'XSS Vulnerability', 'Code Injection', 'Security'):
+            file_bugs.extend(self._check_security_issues(file_path, content, lines, use_ast, mask))
+
+        # Findings from the shared AST pass
+        if use_ast:
+            file_bugs.extend(ast_findings)
 
         # Check for performance issues
-        file_bugs.extend(self._check_performance_issues(file_path, content, lines))
+        if rule_enabled(self.disabled_rules, 'Performance'):
+            file_bugs.extend(self._check_performance_issues(file_path, content, lines))
 
         # Check accessibility
-        file_bugs.extend(self._check_accessibility(file_path, content, lines))
+        if rule_enabled(self.disabled_rules, 'Accessibility'):
+            file_bugs.extend(self._check_accessibility(file_path, content, lines))
 
         # Check error handling
         if self._has_error_handling(content):
             self.metrics['has_error_handling'] = True
 
-        self.bugs.extend(file_bugs)
+        # Disabled rules sharing a check with enabled ones
+        file_bugs = without_disabled(file_bugs, self.disabled_rules)
+
+        if self.retain_findings:
+            self.bugs.extend(file_bugs)
         return file_bugs
 
-    def _check_react_patterns(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
-        """Check for React-specific issues"""
+    def check_file_length(self, file_path: str, line_count: int) -> List[Dict[str, Any]]:
+        """
+        Report a file longer than max_file_lines
+
+        Args:
+            file_path: Path to file
+            line_count: Lines in the whole file (content.split('\\n') length)
+
+        Returns:
+            A Code Complexity finding, or nothing
+        """
+        if line_count <= self.max_file_lines or not rule_enabled(self.disabled_rules, 'Code Complexity'):
+            return []
+        return [{
+            'severity': 'MEDIUM',
+            'category': 'Code Complexity',
+            'file_path': file_path,
+            'line_number': 1,
+            'description': f'File has {line_count} lines (>{self.max_file_lines}), consider breaking into smaller components',
+            'impact': 'Reduced maintainability and readability',
+            'fix_suggestion': 'Split into smaller, focused components with single responsibilities'
+        }]
+
+    def _check_react_patterns(self, file_path: str, content: str, lines: List[str], use_ast: bool = False,
+                              file_level: bool = True) -> List[Dict[str, Any]]:
+        """Check for React-specific issues (each expensive operation is reported at its first match)"""
         bugs = []
 
-        # Check for infinite loop in useEffect
-        useeffect_pattern = r'useEffect\s*\(\s*\(\s*\)\s*=>\s*\{([^}]*)\}'
-        matches = re.finditer(useeffect_pattern, content, re.DOTALL)
+        # useEffect loops and list keys come from the AST pass when the file parsed
+        if not use_ast:
+            # Check for infinite loop in useEffect
+            useeffect_pattern = r'useEffect\s*\(\s*\(\s*\)\s*=>\s*\{([^}]*)\}'
+            matches = re.finditer(useeffect_pattern, content, re.DOTALL)
 
-        for match in matches:
-            effect_body = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            for match in matches:
+                effect_body = match.group(1)
+                line_num = content[:match.start()].count('\n') + 1
 
-            # Check if dependency array is missing or empty
-            deps_pattern = r'\}\s*,\s*\[(.*?)\]'
-            deps_match = re.search(deps_pattern, content[match.end():match.end()+100])
+                # Check if dependency array is missing or empty
+                deps_pattern = r'\}\s*,\s*\[(.*?)\]'
+                deps_match = re.search(deps_pattern, content[match.end():match.end()+100])
 
-            if not deps_match:
-                # No dependency array - runs on every render
-                if 'setState' in effect_body or 'set' in effect_body.lower():
-                    bugs.append({
-                        'severity': 'CRITICAL',
-                        'category': 'Infinite Loop',
-                        'file_path': file_path,
-                        'line_number': line_num,
-                        'description': 'useEffect without dependency array that calls setState creates infinite loop',
-                        'impact': 'Application crash, browser freeze, poor user experience',
-                        'fix_suggestion': 'Add dependency array to useEffect: useEffect(() => { ... }, [dependencies])'
-                    })
+                if not deps_match:
+                    # No dependency array - runs on every render
+                    if 'setState' in effect_body or 'set' in effect_body.lower():
+                        bugs.append(self._infinite_loop_bug(file_path, line_num))
 
-        # Check for missing key prop in lists
-        map_pattern = r'\.map\s*\([^)]*\)\s*=>\s*<'
-        for match in re.finditer(map_pattern, content):
-            line_num = content[:match.start()].count('\n') + 1
-            # Look ahead for key prop
-            next_100_chars = content[match.end():match.end()+100]
-            if 'key=' not in next_100_chars:
-                bugs.append({
-                    'severity': 'MEDIUM',
-                    'category': 'React Best Practice',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': 'Missing key prop in mapped component',
-                    'impact': 'Poor rendering performance, potential bugs with component state',
-                    'fix_suggestion': 'Add unique key prop: .map(item => <Component key={item.id} />)'
-                })
+            # Check for missing key prop in lists
+            map_pattern = r'\.map\s*\([^)]*\)\s*=>\s*<'
+            for match in re.finditer(map_pattern, content):
+                line_num = content[:match.start()].count('\n') + 1
+                # Look ahead for key prop
+                next_100_chars = content[match.end():match.end()+100]
+                if 'key=' not in next_100_chars:
+                    bugs.append(self._missing_key_bug(file_path, line_num))
 
         # Check for expensive operations in render (outside useMemo/useCallback)
         expensive_operations = [
@@ -155,63 +197,41 @@ class FrontendAnalyzer:
                             'fix_suggestion': f'Wrap in useMemo: const result = useMemo(() => {operation}, [deps])'
                         })
                         self.metrics['has_performance_optimizations'] = True
-                        break
+                        if file_level:
+                            break
+                        bugs[-1][FIRST_MATCH_KEY] = f'frontend:{pattern}'
 
         return bugs
 
-    def _check_security_issues(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
+    def _check_security_issues(self, file_path: str, content: str, lines: List[str], use_ast: bool = False,
+                               mask: Optional[LexicalMask] = None) -> List[Dict[str, Any]]:
         """Check for security vulnerabilities"""
         bugs = []
 
-        # Check for dangerouslySetInnerHTML
-        if 'dangerouslySetInnerHTML' in content:
-            for i, line in enumerate(lines, 1):
-                if 'dangerouslySetInnerHTML' in line:
-                    bugs.append({
-                        'severity': 'CRITICAL',
-                        'category': 'XSS Vulnerability',
-                        'file_path': file_path,
-                        'line_number': i,
-                        'description': 'Using dangerouslySetInnerHTML without sanitization',
-                        'impact': 'Cross-Site Scripting (XSS) attack vector - malicious scripts can be injected',
-                        'fix_suggestion': 'Use DOMPurify to sanitize HTML: dangerouslySetInnerHTML={{__html: DOMPurify.sanitize(html)}}'
-                    })
-                    self.metrics['has_security_issues'] = True
-
-        # Check for innerHTML usage
-        if 'innerHTML' in content and 'dangerouslySetInnerHTML' not in content:
-            for i, line in enumerate(lines, 1):
-                if 'innerHTML' in line:
-                    bugs.append({
-                        'severity': 'CRITICAL',
-                        'category': 'XSS Vulnerability',
-                        'file_path': file_path,
-                        'line_number': i,
-                        'description': 'Direct innerHTML manipulation detected',
-                        'impact': 'XSS vulnerability - user input can execute malicious scripts',
-                        'fix_suggestion': 'Use textContent or React rendering instead, or sanitize with DOMPurify'
-                    })
-                    self.metrics['has_security_issues'] = True
-
-        # Check for eval usage
-        if re.search(r'\beval\s*\(', content):
-            for i, line in enumerate(lines, 1):
-                if 'eval(' in line:
-                    bugs.append({
-                        'severity': 'CRITICAL',
-                        'category': 'Code Injection',
-                        'file_path': file_path,
-                        'line_number': i,
-                        'description': 'Use of eval() detected',
-                        'impact': 'Arbitrary code execution vulnerability',
-                        'fix_suggestion': 'Remove eval() and use safe alternatives like JSON.parse or function constructors'
-                    })
-                    self.metrics['has_security_issues'] = True
+        # dangerouslySetInnerHTML, innerHTML and eval come from the AST pass when the file parsed
+        if not use_ast:
+            # Check for dangerouslySetInnerHTML
+            if 'dangerouslySetInnerHTML' in content:
+                for i, line in enumerate(lines, 1):
+                    if 'dangerouslySetInnerHTML' in line and self._in_code(mask, i, line, 'dangerouslySetInnerHTML'):
+                        bugs.append(self._dangerous_html_bug(file_path, i))
+
+            # Check for innerHTML usage
+            if 'innerHTML' in content and 'dangerouslySetInnerHTML' not in content:
+                for i, line in enumerate(lines, 1):
+                    if 'innerHTML' in line and self._in_code(mask, i, line, 'innerHTML'):
+                        bugs.append(self._inner_html_bug(file_path, i))
+
+            # Check for eval usage
+            if re.search(r'\beval\s*\(', content):
+                for i, line in enumerate(lines, 1):
+                    if 'eval(' in line and self._in_code(mask, i, line, 'eval('):
+                        bugs.append(self._eval_bug(file_path, i))
 
         # Check for window.open without validation
         if 'window.open' in content:
             for i, line in enumerate(lines, 1):
-                if 'window.open' in line and 'noopener' not in line:
+                if 'window.open' in line and 'noopener' not in line and self._in_code(mask, i, line, 'window.open'):
                     bugs.append({
                         'severity': 'HIGH',
                         'category': 'Security',
@@ -223,29 +243,119 @@ class FrontendAnalyzer:
                     })
                     self.metrics['has_security_issues'] = True
 
-        # Check for hardcoded secrets/API keys
-        secret_patterns = [
-            (r'api[_-]?key\s*=\s*["\'][^"\']+["\']', 'API key'),
-            (r'secret\s*=\s*["\'][^"\']+["\']', 'secret'),
-            (r'password\s*=\s*["\'][^"\']+["\']', 'password'),
-            (r'token\s*=\s*["\'][^"\']+["\']', 'token')
-        ]
+        return bugs
 
-        for pattern, secret_type in secret_patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
-                line_num = content[:match.start()].count('\n') + 1
-                bugs.append({
-                    'severity': 'CRITICAL',
-                    'category': 'Exposed Secrets',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': f'Hardcoded {secret_type} detected in source code',
-                    'impact': 'Credential exposure - secrets visible in version control and deployments',
-                    'fix_suggestion': f'Move to environment variables: process.env.{secret_type.upper()}'
-                })
-                self.metrics['has_security_issues'] = True
+    def register_js_handlers(self, visitor: JSVisitor, file_path: str, findings: List[Dict[str, Any]]):
+        """
+        Register the AST versions of the React and XSS rules
 
-        return bugs
+        Args:
+            visitor: Shared visitor for the file
+            file_path: Path to file
+            findings: List the handlers append to
+        """
+        def on_call(node):
+            callee = dotted_name(node.callee)
+
+            # useEffect without dependency array that sets state
+            if callee in ('useEffect', 'React.useEffect') and len(node.arguments) < 2 and node.arguments:
+                effect = node.arguments[0]
+                if effect.type in ('ArrowFunctionExpression', 'FunctionExpression'):
+                    if any(n.type == 'Identifier' and SETTER_PATTERN.match(n.name) for n in iter_subtree(effect.body)):
+                        findings.append(self._infinite_loop_bug(file_path, node_line(node)))
+
+            # JSX returned from .map() without a key
+            elif property_name(node.callee) == 'map' and node.arguments:
+                mapper = node.arguments[0]
+                if mapper.type in ('ArrowFunctionExpression', 'FunctionExpression'):
+                    for returned in returned_nodes(mapper):
+                        if returned.type == 'JSXElement' and 'key' not in jsx_attribute_names(returned):
+                            findings.append(self._missing_key_bug(file_path, node_line(returned)))
+                            break
+
+            elif callee == 'eval':
+                findings.append(self._eval_bug(file_path, node_line(node)))
+
+        def on_assignment(node):
+            if property_name(node.left) == 'innerHTML':
+                findings.append(self._inner_html_bug(file_path, node_line(node)))
+
+        def on_jsx_attribute(node):
+            if node.name.type == 'JSXIdentifier' and node.name.name == 'dangerouslySetInnerHTML':
+                findings.append(self._dangerous_html_bug(file_path, node_line(node)))
+
+        visitor.on('CallExpression', on_call)
+        visitor.on('AssignmentExpression', on_assignment)
+        visitor.on('JSXAttribute', on_jsx_attribute)
+
+    def _infinite_loop_bug(self, file_path: str, line_num: int) -> Dict[str, Any]:
+        """Build the useEffect infinite loop finding"""
+        return {
+            'severity': 'CRITICAL',
+            'category': 'Infinite Loop',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': 'useEffect without dependency array that calls setState creates infinite loop',
+            'impact': 'Application crash, browser freeze, poor user experience',
+            'fix_suggestion': 'Add dependency array to useEffect: useEffect(() => { ... }, [dependencies])'
+        }
+
+    def _missing_key_bug(self, file_path: str, line_num: int) -> Dict[str, Any]:
+        """Build the missing key prop finding"""
+        return {
+            'severity': 'MEDIUM',
+            'category': 'React Best Practice',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': 'Missing key prop in mapped component',
+            'impact': 'Poor rendering performance, potential bugs with component state',
+            'fix_suggestion': 'Add unique key prop: .map(item => <Component key={item.id} />)'
+        }
+
+    def _dangerous_html_bug(self, file_path: str, line_num: int) -> Dict[str, Any]:
+        """Build the dangerouslySetInnerHTML finding"""
+        self.metrics['has_security_issues'] = True
+        return {
+            'severity': 'CRITICAL',
+            'category': 'XSS Vulnerability',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': 'Using dangerouslySetInnerHTML without sanitization',
+            'impact': 'Cross-Site Scripting (XSS) attack vector - malicious scripts can be injected',
+            'fix_suggestion': 'Use DOMPurify to sanitize HTML: dangerouslySetInnerHTML={{__html: DOMPurify.sanitize(html)}}'
+        }
+
+    def _inner_html_bug(self, file_path: str, line_num: int) -> Dict[str, Any]:
+        """Build the innerHTML finding"""
+        self.metrics['has_security_issues'] = True
+        return {
+            'severity': 'CRITICAL',
+            'category': 'XSS Vulnerability',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': 'Direct innerHTML manipulation detected',
+            'impact': 'XSS vulnerability - user input can execute malicious scripts',
+            'fix_suggestion': 'Use textContent or React rendering instead, or sanitize with DOMPurify'
+        }
+
+    def _eval_bug(self, file_path: str, line_num: int) -> Dict[str, Any]:
+        """Build the eval() finding"""
+        self.metrics['has_security_issues'] = True
+        return {
+            'severity': 'CRITICAL',
+            'category': 'Code Injection',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': 'Use of eval() detected',
+            'impact': 'Arbitrary code execution vulnerability',
+            'fix_suggestion': 'Remove eval() and use safe alternatives like JSON.parse or function constructors'
+        }
+
+    def _in_code(self, mask: Optional[LexicalMask], line_num: int, line: str, needle: str) -> bool:
+        """Check whether the first occurrence of needle on a line is code (always True without a mask)"""
+        if mask is None:
+            return True
+        return mask.is_code(mask.line_start(line_num) + line.index(needle))
 
     def _check_performance_issues(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
         """Check for performance issues"""
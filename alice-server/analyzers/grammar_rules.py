@@ -0,0 +1,238 @@
+"""
+ALICE Grammar Rules
+Loads the grammar rule pack from data/grammar/rules.json and matches all of its
+rules against all of a file's comments in one tokenizing pass
+"""
+
+import json
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+GRAMMAR_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'grammar', 'rules.json'
+)
+
+# Joins the comments of a batch; neither whitespace nor a word character, so no rule spans two comments
+_SEPARATOR = '\0'
+
+_RULE_ID = re.compile(r'^[A-Za-z_]\w*$')
+
+# Letter runs: the comment tokens looked up in the trigger index, and the literal words rules are indexed by
+_WORD = re.compile(r'[A-Za-z]+')
+
+# Pattern text that cannot continue a letter run
+_WORD_ENDS = ('\\s', '\\b', '\\W', '[\\s', ' ', '-', "'")
+
+
+def _structure(pattern: str) -> Iterator[Tuple[int, str, int]]:
+    """Yield (index, character, group depth) of a pattern's metacharacters, skipping escapes and classes"""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 1
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            yield i, char, depth
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            yield i, char, depth
+        elif char == '|':
+            yield i, char, depth
+        i += 1
+
+
+def _ends_word(rest: str) -> Optional[bool]:
+    """Whether pattern text following a literal word ends the word (None: a quantifier applies to its last letter)"""
+    if rest[:1] in ('?', '*', '+', '{'):
+        return None
+    return rest.startswith(_WORD_ENDS)
+
+
+def _leading_words(pattern: str) -> Optional[Set[Tuple[str, bool]]]:
+    """
+    Literal words every match of a pattern starts with
+
+    Understands alternatives that each start, after an optional \\b, with a literal
+    word or with a non-capturing group of such alternatives.
+
+    Returns:
+        (lowercase word, whether the word runs to the end of the pattern) pairs,
+        or None when they cannot be determined
+    """
+    bars = [i for i, char, depth in _structure(pattern) if char == '|' and depth == 0]
+    bounds = zip([0] + [bar + 1 for bar in bars], bars + [len(pattern)])
+
+    words = set()
+    for alternative in (pattern[start:end] for start, end in bounds):
+        if alternative.startswith('\\b'):
+            alternative = alternative[2:]
+
+        literal = _WORD.match(alternative)
+        if literal:
+            rest = alternative[literal.end():]
+            ends = _ends_word(rest)
+            if ends is None or not (ends or rest == ''):
+                return None
+            words.add((literal.group().lower(), rest == ''))
+            continue
+
+        if not alternative.startswith('(?:'):
+            return None
+        close = next((i for i, char, depth in _structure(alternative) if char == ')' and depth == 0), None)
+        if close is None:
+            return None
+        group_words = _leading_words(alternative[3:close])
+        rest = alternative[close + 1:]
+        # A quantified group can be skipped, exposing whatever follows it
+        if group_words is None or rest[:1] in ('?', '*', '+', '{'):
+            return None
+        for word, open_ended in group_words:
+            if open_ended and rest and not _ends_word(rest):
+                return None
+            words.add((word, open_ended and rest == ''))
+    return words
+
+
+def rule_triggers(pattern: str) -> Optional[Set[str]]:
+    """
+    Words at which a rule can match
+
+    Args:
+        pattern: Rule regex
+
+    Returns:
+        Lowercase words (as split by the comment tokenizer), or None when the
+        rule has to be searched for everywhere
+    """
+    words = _leading_words(pattern)
+    # A word running to the end of the pattern may be the prefix of a longer token
+    if not words or any(open_ended for _, open_ended in words):
+        return None
+    return {word for word, _ in words}
+
+
+class GrammarRule(NamedTuple):
+    """One grammar rule of the rule pack"""
+    id: str
+    pattern: str
+    correction: str
+    explanation: str
+
+
+def load_rules(path: str = GRAMMAR_RULES_PATH) -> List[GrammarRule]:
+    """
+    Load and validate a grammar rule pack
+
+    Rules with a missing field, a duplicate or invalid id, or a pattern that
+    does not compile are skipped.
+
+    Args:
+        path: Rule pack JSON file ({"rules": [{id, pattern, correction, explanation}]})
+
+    Returns:
+        Valid rules in file order
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('rules', [])
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Error loading grammar rules from {path}: {e}")
+        return []
+
+    rules = []
+    seen = set()
+    for entry in entries:
+        try:
+            rule = GrammarRule(str(entry['id']), entry['pattern'], entry['correction'], entry['explanation'])
+            if not _RULE_ID.match(rule.id) or rule.id in seen:
+                raise ValueError('invalid or duplicate id')
+            re.compile(rule.pattern, re.IGNORECASE)
+        except (KeyError, TypeError, ValueError, re.error) as e:
+            print(f"Skipping grammar rule {entry.get('id') if isinstance(entry, dict) else entry!r}: {e}")
+            continue
+        seen.add(rule.id)
+        rules.append(rule)
+    return rules
+
+
+class GrammarChecker:
+    """
+    Matches a rule pack against batches of comments
+
+    Rules are indexed by the words they start with, so a batch costs one tokenizing
+    pass plus a match attempt per rule whose trigger word occurs, however many
+    rules the pack has. Rules without literal leading words are searched for
+    across the whole batch.
+    """
+
+    def __init__(self, rules: List[GrammarRule]):
+        self.rules = rules
+        self.triggered: Dict[str, List[Tuple[int, Pattern]]] = {}
+        self.untriggered: List[Tuple[int, Pattern]] = []
+        for order, rule in enumerate(rules):
+            compiled = (order, re.compile(rule.pattern, re.IGNORECASE))
+            triggers = rule_triggers(rule.pattern)
+            if triggers is None:
+                self.untriggered.append(compiled)
+            else:
+                for word in triggers:
+                    self.triggered.setdefault(word, []).append(compiled)
+
+    def check(self, texts: List[str]) -> List[Tuple[int, GrammarRule]]:
+        """
+        Find rule violations in a batch of comments
+
+        The comments are joined into one string and match offsets mapped back to comments.
+
+        Args:
+            texts: Comment texts
+
+        Returns:
+            (comment index, rule) pairs, each rule at most once per comment, ordered by
+            comment and then by rule pack order
+        """
+        if not self.rules or not texts:
+            return []
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(_SEPARATOR)
+        batch = _SEPARATOR.join(texts)
+
+        hits = set()
+        for token in _WORD.finditer(batch):
+            candidates = self.triggered.get(token.group().lower())
+            if not candidates:
+                continue
+            comment = bisect_right(starts, token.start()) - 1
+            for order, pattern in candidates:
+                if (comment, order) not in hits and pattern.match(batch, token.start()):
+                    hits.add((comment, order))
+
+        for order, pattern in self.untriggered:
+            for match in pattern.finditer(batch):
+                hits.add((bisect_right(starts, match.start()) - 1, order))
+
+        return [(comment, self.rules[order]) for comment, order in sorted(hits)]
+
+
+_grammar_checker = None
+
+
+def get_grammar_checker() -> GrammarChecker:
+    """Get the process's grammar checker (loaded and compiled on first use)"""
+    global _grammar_checker
+    if _grammar_checker is None:
+        _grammar_checker = GrammarChecker(load_rules())
+    return _grammar_checker
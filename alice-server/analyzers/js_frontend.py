@@ -0,0 +1,216 @@
+"""
+ALICE JavaScript Front-end
+Parses JavaScript/JSX once with esprima and dispatches AST nodes to analyzer handlers
+"""
+
+import hashlib
+import os
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import esprima
+from esprima.nodes import Node
+
+# esprima has no TypeScript support; .ts/.tsx keep the regex rules
+PARSE_EXTENSIONS = ('.js', '.jsx', '.mjs', '.cjs')
+
+# Larger files keep the regex rules: esprima takes about 3ms per KB, several times the regex pass
+AST_MAX_FILE_BYTES = int(os.environ.get('ALICE_AST_MAX_FILE_BYTES', 64 * 1024))
+
+# Parsed trees kept by content hash, bounded by the size of their sources: a tree takes
+# roughly 120 bytes per source byte, so the default holds about 60MB of trees
+AST_CACHE_SOURCE_BYTES = int(os.environ.get('ALICE_AST_CACHE_SOURCE_BYTES', 512 * 1024))
+
+# Larger files are parsed without caching their tree
+AST_CACHE_MAX_FILE_BYTES = AST_CACHE_SOURCE_BYTES // 4
+
+_PARSE_OPTIONS = {'jsx': True, 'tolerant': True, 'loc': True}
+
+# content hash -> (tree, source bytes)
+_tree_cache: 'OrderedDict[str, Tuple[Optional[Node], int]]' = OrderedDict()
+_tree_cache_bytes = 0
+
+Handler = Callable[[Node], None]
+
+FUNCTION_TYPES = ('FunctionExpression', 'ArrowFunctionExpression', 'FunctionDeclaration')
+
+
+def parse_js(content: str) -> Tuple[Optional[Node], bool]:
+    """
+    Parse JavaScript/JSX source, reusing trees for identical content
+
+    Tries module then script goal; content that neither accepts is cached as a failure
+    so callers fall back to the regex rules. Trees of files over AST_CACHE_MAX_FILE_BYTES
+    are not cached.
+
+    Args:
+        content: File content
+
+    Returns:
+        Tuple of (tree or None, cache_hit)
+    """
+    global _tree_cache_bytes
+    source = content.encode('utf-8', errors='ignore')
+    key = hashlib.sha1(source).hexdigest()
+    if key in _tree_cache:
+        _tree_cache.move_to_end(key)
+        return _tree_cache[key][0], True
+
+    tree = None
+    for parse in (esprima.parseModule, esprima.parseScript):
+        try:
+            tree = parse(content, _PARSE_OPTIONS)
+            break
+        except Exception:
+            continue
+
+    if len(source) <= AST_CACHE_MAX_FILE_BYTES:
+        _tree_cache[key] = (tree, len(source))
+        _tree_cache_bytes += len(source)
+        while _tree_cache_bytes > AST_CACHE_SOURCE_BYTES:
+            _tree_cache_bytes -= _tree_cache.popitem(last=False)[1][1]
+
+    return tree, False
+
+
+def iter_children(node: Node) -> Iterator[Node]:
+    """Yield the direct child nodes of an AST node"""
+    for value in vars(node).values():
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, Node):
+                    yield item
+
+
+def iter_subtree(node: Node, into_functions: bool = True) -> Iterator[Node]:
+    """
+    Yield every node below node (excluding node itself)
+
+    Args:
+        node: Subtree root
+        into_functions: Descend into nested function bodies
+    """
+    stack = list(iter_children(node))
+    while stack:
+        current = stack.pop()
+        yield current
+        if not into_functions and current.type in FUNCTION_TYPES:
+            continue
+        stack.extend(iter_children(current))
+
+
+def node_line(node: Node) -> int:
+    """Get the 1-based line a node starts on"""
+    return node.loc.start.line if getattr(node, 'loc', None) else 1
+
+
+def dotted_name(node: Optional[Node]) -> Optional[str]:
+    """
+    Get a dotted name for identifiers and plain member chains
+
+    Returns:
+        e.g. "eval", "app.get", "React.useEffect"; None for computed or call-based chains
+    """
+    if node is None:
+        return None
+    if node.type == 'Identifier':
+        return node.name
+    if node.type == 'MemberExpression' and not node.computed:
+        base = dotted_name(node.object)
+        if base is not None and node.property.type == 'Identifier':
+            return f'{base}.{node.property.name}'
+    return None
+
+
+def property_name(node: Optional[Node]) -> Optional[str]:
+    """Get the (non-computed) property name of a member expression"""
+    if node is not None and node.type == 'MemberExpression' and not node.computed:
+        if node.property.type == 'Identifier':
+            return node.property.name
+    return None
+
+
+def is_dynamic_string(node: Optional[Node]) -> bool:
+    """Check for strings assembled at runtime: concatenation or interpolated template literals"""
+    if node is None:
+        return False
+    if node.type == 'TemplateLiteral':
+        return bool(node.expressions)
+    if node.type == 'BinaryExpression' and node.operator == '+':
+        return not (node.left.type == 'Literal' and node.right.type == 'Literal')
+    return False
+
+
+def jsx_attribute_names(element: Node) -> List[str]:
+    """Get attribute names on a JSX element's opening tag"""
+    names = []
+    for attribute in element.openingElement.attributes:
+        if attribute.type == 'JSXAttribute' and attribute.name.type == 'JSXIdentifier':
+            names.append(attribute.name.name)
+    return names
+
+
+def returned_nodes(function: Node) -> List[Node]:
+    """Get the expressions a function returns (arrow expression body or return statements)"""
+    if function.body.type != 'BlockStatement':
+        return [function.body]
+    return [
+        node.argument for node in iter_subtree(function.body, into_functions=False)
+        if node.type == 'ReturnStatement' and node.argument is not None
+    ]
+
+
+class JSVisitor:
+    """Walks a tree once and calls every handler registered for each node type"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def on(self, node_type: str, handler: Handler):
+        """
+        Register a handler
+
+        Args:
+            node_type: ESTree node type, e.g. "CallExpression"
+            handler: Called with each matching node
+        """
+        self._handlers[node_type].append(handler)
+
+    def walk(self, tree: Node):
+        """Visit every node of the tree in source order"""
+        if not self._handlers:
+            return
+
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            for handler in self._handlers.get(node.type, ()):
+                handler(node)
+            children = list(iter_children(node))
+            children.reverse()
+            stack.extend(children)
+
+
+def run_handlers(tree: Node, registrations: List[Tuple[Any, str]], file_path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Let each analyzer register its handlers, then walk the tree once
+
+    Args:
+        tree: Parsed tree
+        registrations: (analyzer, name) pairs; analyzers implement register_js_handlers
+        file_path: Path to file
+
+    Returns:
+        Findings per analyzer name
+    """
+    visitor = JSVisitor()
+    findings: Dict[str, List[Dict[str, Any]]] = {}
+
+    for analyzer, name in registrations:
+        findings[name] = []
+        analyzer.register_js_handlers(visitor, file_path, findings[name])
+
+    visitor.walk(tree)
+    return findings
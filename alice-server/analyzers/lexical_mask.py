@@ -0,0 +1,391 @@
+"""
+ALICE Lexical Mask
+Splits a source file into comment, string-literal and code spans in one linear pass
+"""
+
+import io
+import re
+import tokenize
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PYTHON_EXTENSIONS = ('.py',)
+JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+
+# Span kinds
+COMMENT = 'comment'
+STRING = 'string'
+
+# Characters after which "/" starts a regex literal rather than a division
+# ("<" is left out so JSX closing tags are not read as regexes)
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%>~^')
+_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await')
+
+# Python 3.12+ tokenizes f-strings into parts
+_FSTRING_START = getattr(tokenize, 'FSTRING_START', None)
+_FSTRING_END = getattr(tokenize, 'FSTRING_END', None)
+
+
+class LexicalMask:
+    """Comment and string-literal spans of one file, with O(log n) offset lookups"""
+
+    def __init__(self, content: str, spans: List[Tuple[int, int, str]], docstrings: List[Tuple[int, int]] = ()):
+        """
+        Initialize mask
+
+        Args:
+            content: File content
+            spans: (start, end, kind) non-code spans in source order, end exclusive
+            docstrings: (start, end) string spans that are documentation (Python docstrings)
+        """
+        self.content = content
+        self.spans = spans
+        self.docstrings = list(docstrings)
+        self._starts = [start for start, _, _ in spans]
+        self._line_starts = [0]
+        self._line_starts.extend(i + 1 for i, char in enumerate(content) if char == '\n')
+
+    def _span_at(self, offset: int) -> Optional[Tuple[int, int, str]]:
+        index = bisect_right(self._starts, offset) - 1
+        if index >= 0:
+            span = self.spans[index]
+            if offset < span[1]:
+                return span
+        return None
+
+    def is_code(self, offset: int) -> bool:
+        """Check whether an offset falls outside every comment and string literal"""
+        return self._span_at(offset) is None
+
+    def is_comment(self, offset: int) -> bool:
+        """Check whether an offset falls inside a comment"""
+        span = self._span_at(offset)
+        return span is not None and span[2] == COMMENT
+
+    def is_string(self, offset: int) -> bool:
+        """Check whether an offset falls inside a string literal"""
+        span = self._span_at(offset)
+        return span is not None and span[2] == STRING
+
+    def line_of(self, offset: int) -> int:
+        """Get the 1-based line of an offset"""
+        return bisect_right(self._line_starts, offset)
+
+    def line_start(self, line_num: int) -> int:
+        """Get the offset of the first character of a 1-based line"""
+        return self._line_starts[min(max(line_num, 1), len(self._line_starts)) - 1]
+
+    def comments(self) -> List[Dict[str, str]]:
+        """
+        Get comment and docstring text
+
+        Returns:
+            List of {'text', 'line'} dicts with delimiters removed, in source order
+        """
+        comments = []
+        blocks = [(start, end) for start, end, kind in self.spans if kind == COMMENT]
+        blocks.extend(self.docstrings)
+        blocks.sort()
+
+        for start, end in blocks:
+            text = _strip_delimiters(self.content[start:end])
+            if text:
+                comments.append({'text': text, 'line': self.line_of(start)})
+
+        return comments
+
+
+def _strip_delimiters(raw: str) -> str:
+    """Remove comment markers or string quotes and surrounding whitespace"""
+    if raw.startswith('#'):
+        return raw[1:].strip()
+    if raw.startswith('//'):
+        return raw[2:].strip()
+    if raw.startswith('/*'):
+        return raw[2:-2].strip() if raw.endswith('*/') else raw[2:].strip()
+
+    # Python string literal with optional prefix
+    body = raw.lstrip('rRbBuUfF')
+    for quote in ('"""', "'''", '"', "'"):
+        if body.startswith(quote):
+            return body[len(quote):len(body) - len(quote) if body.endswith(quote) else len(body)].strip()
+    return raw.strip()
+
+
+def _python_spans(content: str) -> Tuple[List[Tuple[int, int, str]], List[Tuple[int, int]]]:
+    """Lex Python with the stdlib tokenizer"""
+    line_starts = [0]
+    line_starts.extend(i + 1 for i, char in enumerate(content) if char == '\n')
+
+    def offset(position):
+        row, col = position
+        return line_starts[row - 1] + col if row - 1 < len(line_starts) else len(content)
+
+    spans = []
+    docstrings = []
+    statement_start = True
+    fstring_depth = 0
+    fstring_start = 0
+
+    for token in tokenize.generate_tokens(io.StringIO(content).readline):
+        kind = token.type
+
+        if _FSTRING_START is not None and kind == _FSTRING_START:
+            if fstring_depth == 0:
+                fstring_start = offset(token.start)
+            fstring_depth += 1
+            continue
+        if _FSTRING_END is not None and kind == _FSTRING_END:
+            fstring_depth -= 1
+            if fstring_depth == 0:
+                spans.append((fstring_start, offset(token.end), STRING))
+                statement_start = False
+            continue
+        if fstring_depth:
+            continue
+
+        if kind == tokenize.COMMENT:
+            spans.append((offset(token.start), offset(token.end), COMMENT))
+        elif kind == tokenize.STRING:
+            start, end = offset(token.start), offset(token.end)
+            spans.append((start, end, STRING))
+            # A string that opens a statement is a docstring (or a bare comment string)
+            if statement_start and token.string.lstrip('rRbBuUfF')[:3] in ('"""', "'''"):
+                docstrings.append((start, end))
+            statement_start = False
+        elif kind in (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT):
+            statement_start = True
+        elif kind != tokenize.NL:
+            statement_start = False
+
+    return spans, docstrings
+
+
+def _scan_spans(content: str, python: bool) -> Tuple[List[Tuple[int, int, str]], List[Tuple[int, int]]]:
+    """
+    Lex with a character state machine
+
+    Used for JavaScript/TypeScript, and for Python the tokenizer rejects. Handles line
+    and block comments, quoted strings, template literals with nested ${} code and
+    (for JavaScript) regex literals. Unterminated quotes end at the line break.
+    """
+    spans = []
+    docstrings = []
+    length = len(content)
+    i = 0
+    last_significant = ''
+    last_word = ''
+    # Brace depth per open template literal ${...}
+    template_stack: List[int] = []
+
+    while i < length:
+        char = content[i]
+
+        # Line comments
+        if (python and char == '#') or (not python and char == '/' and content.startswith('//', i)):
+            end = content.find('\n', i)
+            end = length if end < 0 else end
+            spans.append((i, end, COMMENT))
+            i = end
+            continue
+
+        if not python and content.startswith('/*', i):
+            end = content.find('*/', i + 2)
+            end = length if end < 0 else end + 2
+            spans.append((i, end, COMMENT))
+            i = end
+            continue
+
+        # Triple-quoted Python strings
+        if python and content.startswith(('"""', "'''"), i):
+            quote = content[i:i + 3]
+            end = i + 3
+            while True:
+                end = content.find(quote, end)
+                if end < 0:
+                    end = length
+                    break
+                if content[end - 1] != '\\':
+                    end += 3
+                    break
+                end += 1
+            spans.append((i, end, STRING))
+            # A string that opens a statement is a docstring (or a bare comment string)
+            if not content[content.rfind('\n', 0, i) + 1:i].strip():
+                docstrings.append((i, end))
+            i = end
+            last_significant = quote[0]
+            continue
+
+        if char in ('"', "'") or (not python and char == '`'):
+            if char == '`':
+                # Template literal: only the text outside ${...} is string
+                end = _template_end(content, i, spans, template_stack)
+            else:
+                end = _string_end(content, i, char)
+                spans.append((i, end, STRING))
+            i = end
+            last_significant = char
+            last_word = ''
+            continue
+
+        # Closing brace of a ${...} inside a template literal resumes the string
+        if not python and template_stack:
+            if char == '{':
+                template_stack[-1] += 1
+            elif char == '}':
+                if template_stack[-1] == 0:
+                    template_stack.pop()
+                    i = _template_end(content, i, spans, template_stack)
+                    last_significant = '`'
+                    continue
+                template_stack[-1] -= 1
+
+        # Regex literals
+        if not python and char == '/' and (last_significant in _REGEX_PRECEDERS or last_significant == ''
+                                           or last_word in _REGEX_KEYWORDS):
+            end = _regex_end(content, i)
+            if end is not None:
+                spans.append((i, end, STRING))
+                i = end
+                last_significant = '/'
+                last_word = ''
+                continue
+
+        if not char.isspace():
+            if char.isalnum() or char in '_$':
+                start = i
+                while i < length and (content[i].isalnum() or content[i] in '_$'):
+                    i += 1
+                last_word = content[start:i]
+                last_significant = 'a'
+                continue
+            last_significant = char
+            last_word = ''
+        i += 1
+
+    return spans, docstrings
+
+
+def _string_end(content: str, start: int, quote: str) -> int:
+    """Get the end of a quoted string (exclusive); unterminated strings end at the line break"""
+    i = start + 1
+    length = len(content)
+    while i < length:
+        char = content[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == quote:
+            return i + 1
+        if char == '\n':
+            return i
+        i += 1
+    return length
+
+
+def _template_end(content: str, start: int, spans: List[Tuple[int, int, str]],
+                  template_stack: List[int]) -> int:
+    """
+    Record the string part of a template literal up to its end or the next ${
+
+    Args:
+        content: File content
+        start: Offset of the opening backtick, or of the } that closes an interpolation
+        spans: Span list to append to
+        template_stack: Open interpolation depths; a new ${ pushes a level
+
+    Returns:
+        Offset to continue scanning from
+    """
+    i = start + 1
+    length = len(content)
+    while i < length:
+        char = content[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '`':
+            spans.append((start, i + 1, STRING))
+            return i + 1
+        if char == '$' and content.startswith('${', i):
+            spans.append((start, i + 2, STRING))
+            template_stack.append(0)
+            return i + 2
+        i += 1
+    spans.append((start, length, STRING))
+    return length
+
+
+def _regex_end(content: str, start: int) -> Optional[int]:
+    """Get the end of a regex literal (with flags), or None when "/" is not one"""
+    i = start + 1
+    length = len(content)
+    in_class = False
+    while i < length:
+        char = content[i]
+        if char == '\n':
+            return None
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < length and content[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return None
+
+
+def build_mask(content: str, file_path: str) -> Optional[LexicalMask]:
+    """
+    Lex a source file once
+
+    Args:
+        content: File content
+        file_path: Path to file (selects the lexer)
+
+    Returns:
+        LexicalMask, or None for file types without a lexer
+    """
+    if file_path.endswith(PYTHON_EXTENSIONS):
+        try:
+            spans, docstrings = _python_spans(content)
+        except (tokenize.TokenError, IndentationError, SyntaxError):
+            spans, docstrings = _scan_spans(content, python=True)
+        return LexicalMask(content, spans, docstrings)
+
+    if file_path.endswith(JS_EXTENSIONS):
+        spans, docstrings = _scan_spans(content, python=False)
+        return LexicalMask(content, spans, docstrings)
+
+    return None
+
+
+def code_matches(pattern: str, content: str, mask: Optional[LexicalMask], flags: int = 0,
+                 include_strings: bool = False) -> Iterator['re.Match']:
+    """
+    Find regex matches that start in code
+
+    Args:
+        pattern: Regular expression
+        content: File content
+        mask: Lexical mask of the content; None keeps every match
+        flags: re flags
+        include_strings: Also keep matches inside string literals (e.g. algorithm names passed as strings)
+
+    Yields:
+        Matches outside comments (and, unless include_strings, outside string literals)
+    """
+    for match in re.finditer(pattern, content, flags):
+        if mask is not None:
+            if include_strings and mask.is_comment(match.start()):
+                continue
+            if not include_strings and not mask.is_code(match.start()):
+                continue
+        yield match
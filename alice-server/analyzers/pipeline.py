@@ -0,0 +1,332 @@
+"""
+ALICE Analysis Pipeline
+Routes files to the analyzers and scans very large files window by window
+"""
+
+import time
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+from analyzers import js_frontend, py_frontend
+from analyzers.lexical_mask import build_mask
+from analyzers.frontend_analyzer import FrontendAnalyzer
+from analyzers.backend_analyzer import BackendAnalyzer
+from analyzers.security_analyzer import SecurityAnalyzer
+from analyzers.content_analyzer import ContentAnalyzer
+from analyzers.config import AnalysisConfig
+from analyzers.findings import FIRST_MATCH_KEY
+from analyzers.dependency_files import is_dependency_file
+
+FRONTEND_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+BACKEND_EXTENSIONS = ('.py', '.js', '.ts')
+SECURITY_EXTENSIONS = ('.py', '.js', '.ts', '.jsx', '.tsx')
+
+# Version of the rule set; cached per-file results from another version are not reused.
+# Bump whenever a rule's findings or metrics change.
+ANALYZER_VERSION = '2026.10.19'
+
+
+def _tagged(findings: List[Dict[str, Any]], analyzer: str) -> List[Dict[str, Any]]:
+    """Record which analyzer produced each finding (used to merge cross-analyzer duplicates)"""
+    for finding in findings:
+        finding['detected_by'] = [analyzer]
+    return findings
+
+
+class AnalyzerSet:
+    """The four analyzers of one analysis run, with the file routing rules"""
+
+    def __init__(self, deadline: Optional[float] = None, config: Optional[AnalysisConfig] = None):
+        """
+        Initialize analyzers
+
+        Args:
+            deadline: time.monotonic() value after which no further analyzer is started
+            config: Project analysis settings (analyzers, rules, thresholds, paths); defaults when omitted
+        """
+        self.deadline = deadline
+        self.config = config or AnalysisConfig()
+        # Set when a file was cut short by the deadline
+        self.deadline_exceeded = False
+        self.frontend = FrontendAnalyzer(
+            retain_findings=False,
+            disabled_rules=self.config.disabled_for('frontend'),
+            max_file_lines=self.config.thresholds['max_file_lines']
+        )
+        self.backend = BackendAnalyzer(retain_findings=False, disabled_rules=self.config.disabled_for('backend'))
+        self.security = SecurityAnalyzer(retain_findings=False, disabled_rules=self.config.disabled_for('security'))
+        self.content = ContentAnalyzer(retain_findings=False, disabled_rules=self.config.disabled_for('content'))
+        self.parsing = {
+            'js_files_parsed': 0,
+            'js_parse_failures': 0,
+            'js_parse_skipped': 0,
+            'js_cache_hits': 0,
+            'js_parse_ms': 0.0,
+            'py_files_parsed': 0,
+            'py_parse_failures': 0,
+            'py_parse_ms': 0.0,
+            'lex_ms': 0.0
+        }
+
+    def analyze(self, relative_path: str, content: str, security_only: bool = False,
+                use_ast: bool = True, file_level: bool = True) -> List[Dict[str, Any]]:
+        """
+        Run every applicable analyzer over one file
+
+        Args:
+            relative_path: Path inside the archive
+            content: File content
+            security_only: Only run the security scan (minified or generated files)
+            use_ast: Parse JavaScript for the AST rules (windows of a file are not parseable)
+            file_level: False for one window of a larger file (file-level checks are made by analyze_windows)
+
+        Returns:
+            Findings from all analyzers
+        """
+        findings = []
+        runs = self._applicable(relative_path, security_only)
+        if not runs:
+            return findings
+
+        # Comment/string spans, shared by every analyzer
+        started = time.perf_counter()
+        mask = build_mask(content, relative_path)
+        self.parsing['lex_ms'] += (time.perf_counter() - started) * 1000
+
+        if security_only:
+            if 'security' in runs and not self._out_of_time():
+                findings.extend(_tagged(self.security.analyze_file(relative_path, content, mask=mask), 'security'))
+            return findings
+
+        ast_findings = self._run_ast_pass(relative_path, content, runs) if use_ast else {}
+
+        # Determine file type and analyze
+        if 'frontend' in runs and not self._out_of_time():
+            findings.extend(_tagged(self.frontend.analyze_file(relative_path, content, ast_findings.get('frontend'), mask, file_level), 'frontend'))
+
+        if 'backend' in runs and not self._out_of_time():
+            findings.extend(_tagged(self.backend.analyze_file(relative_path, content, ast_findings.get('backend'), mask, file_level), 'backend'))
+
+        # Security analysis for all code files
+        if 'security' in runs and not self._out_of_time():
+            findings.extend(_tagged(self.security.analyze_file(relative_path, content, ast_findings.get('security'), mask, file_level), 'security'))
+
+        # Content analysis for all files
+        if 'content' in runs and not self._out_of_time():
+            findings.extend(_tagged(self.content.analyze_file(relative_path, content, mask), 'content'))
+
+        return findings
+
+    def _applicable(self, relative_path: str, security_only: bool = False) -> Set[str]:
+        """Get the analyzers that run on a file: routed by extension, then filtered by the config"""
+        # Manifests and lockfiles go to the security analyzer's advisory lookup
+        security = relative_path.endswith(SECURITY_EXTENSIONS) or is_dependency_file(relative_path)
+        if security_only:
+            candidates = ['security'] if security else []
+        else:
+            candidates = ['content']
+            if relative_path.endswith(FRONTEND_EXTENSIONS):
+                candidates.append('frontend')
+            if relative_path.endswith(BACKEND_EXTENSIONS):
+                candidates.append('backend')
+            if security:
+                candidates.append('security')
+        return {name for name in candidates if self.config.runs(name, relative_path)}
+
+    def _out_of_time(self) -> bool:
+        """Check the deadline before starting an analyzer (a running analyzer is never interrupted)"""
+        if self.deadline is not None and not self.deadline_exceeded and time.monotonic() > self.deadline:
+            self.deadline_exceeded = True
+        return self.deadline_exceeded
+
+    def _run_ast_pass(self, relative_path: str, content: str, runs: Set[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Parse a JavaScript or Python file once and run every analyzer's AST rules in one walk
+
+        Args:
+            relative_path: Path inside the archive
+            content: File content
+            runs: Analyzers that run on the file (only their rules are registered)
+
+        Returns:
+            AST findings per analyzer section; empty when the file is not parsed, so
+            every analyzer keeps its regex rules
+        """
+        registrations = [
+            (analyzer, section) for analyzer, section in
+            ((self.security, 'security'), (self.frontend, 'frontend'), (self.backend, 'backend'))
+            if section in runs
+        ]
+        if not registrations:
+            return {}
+
+        if relative_path.endswith(js_frontend.PARSE_EXTENSIONS):
+            # Characters, not encoded bytes: close enough for source code, and free
+            if len(content) > js_frontend.AST_MAX_FILE_BYTES:
+                self.parsing['js_parse_skipped'] += 1
+                return {}
+
+            started = time.perf_counter()
+            tree, cache_hit = js_frontend.parse_js(content)
+            self.parsing['js_parse_ms'] += (time.perf_counter() - started) * 1000
+
+            if cache_hit:
+                self.parsing['js_cache_hits'] += 1
+            if tree is None:
+                self.parsing['js_parse_failures'] += 1
+                return {}
+            self.parsing['js_files_parsed'] += 1
+
+            return js_frontend.run_handlers(tree, registrations, relative_path)
+
+        if relative_path.endswith(py_frontend.PARSE_EXTENSIONS):
+            started = time.perf_counter()
+            tree = py_frontend.parse_py(content)
+            self.parsing['py_parse_ms'] += (time.perf_counter() - started) * 1000
+
+            if tree is None:
+                self.parsing['py_parse_failures'] += 1
+                return {}
+
+            try:
+                findings = py_frontend.run_handlers(
+                    tree, [(analyzer, section) for analyzer, section in registrations if section != 'frontend'], relative_path
+                )
+            except RecursionError:
+                # Pathologically nested expressions; the regex rules still apply
+                self.parsing['py_parse_failures'] += 1
+                return {}
+
+            self.parsing['py_files_parsed'] += 1
+            return findings
+
+        return {}
+
+    def analyze_windows(self, relative_path: str, windows: Iterable[Tuple[str, int, int, int]],
+                        security_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Run the analyzers over a large file one overlapping window at a time
+
+        Findings are shifted to file line numbers and kept only when they fall on a line
+        the window owns, so matches shorter than the overlap are reported exactly once.
+        "Whole file contains X" guards see one window at a time; the line-count check
+        runs once for the whole file, rules a whole-file scan reports only at their first
+        match keep their first owned match across all windows, and per-file counters are
+        corrected afterwards.
+
+        Args:
+            relative_path: Path inside the archive
+            windows: (text, first_line, owned_first_line, owned_last_line) tuples
+            security_only: Only run the security scan
+
+        Returns:
+            Findings with file line numbers
+        """
+        findings = []
+        boundary_line = None
+        boundary_keys = set()
+        total_lines = 0
+        # Rule -> its earliest owned match
+        first_matches: Dict[str, Dict[str, Any]] = {}
+
+        files_before = {
+            analyzer: analyzer.metrics['total_files']
+            for analyzer in (self.frontend, self.backend)
+        }
+        lines_before = self.frontend.metrics['total_lines']
+
+        for text, first_line, owned_first, owned_last in windows:
+            window_keys = set()
+
+            for finding in self.analyze(relative_path, text, security_only, use_ast=False, file_level=False):
+                line_number = first_line + (finding.get('line_number') or 1) - 1
+                if line_number < owned_first or line_number > owned_last:
+                    continue
+
+                # A line longer than the window is shared with the previous window
+                key = (line_number, finding.get('category'), finding.get('description'))
+                if line_number == boundary_line and key in boundary_keys:
+                    continue
+                if line_number == owned_last:
+                    window_keys.add(key)
+
+                finding['line_number'] = line_number
+                rule = finding.pop(FIRST_MATCH_KEY, None)
+                if rule is None:
+                    findings.append(finding)
+                elif rule not in first_matches or line_number < first_matches[rule]['line_number']:
+                    first_matches[rule] = finding
+
+            boundary_line = owned_last
+            boundary_keys = window_keys
+            # Lines as content.split('\n') counts them: a final newline starts an empty last line
+            total_lines = owned_last + (1 if text.endswith('\n') else 0)
+
+            if self.deadline_exceeded:
+                break
+
+        findings.extend(first_matches.values())
+
+        # Count the file once, not once per window
+        for analyzer, before in files_before.items():
+            if analyzer.metrics['total_files'] > before:
+                analyzer.metrics['total_files'] = before + 1
+        if self.frontend.metrics['total_files'] > files_before[self.frontend]:
+            self.frontend.metrics['total_lines'] = lines_before + total_lines
+            findings.extend(_tagged(self.frontend.check_file_length(relative_path, total_lines), 'frontend'))
+
+        return findings
+
+    def merge_metrics(self, metrics: Dict[str, Dict[str, Any]]):
+        """
+        Fold another run's metrics (e.g. a cached file's) into these analyzers
+
+        Flags are OR'ed and counters added; derived values are recomputed by get_metrics().
+
+        Args:
+            metrics: Metrics keyed by section, as returned by get_metrics()
+        """
+        targets = {
+            'frontend': self.frontend.metrics,
+            'backend': self.backend.metrics,
+            'security': self.security.metrics,
+            'content': self.content.metrics,
+            'parsing': self.parsing
+        }
+
+        for section, values in metrics.items():
+            target = targets.get(section)
+            if target is None:
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    target[key] = bool(target.get(key)) or value
+                elif isinstance(value, (int, float)):
+                    target[key] = target.get(key, 0) + value
+
+    def snapshot_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Copy the raw metric counters (restored with restore_metrics())"""
+        return {
+            'frontend': dict(self.frontend.metrics),
+            'backend': dict(self.backend.metrics),
+            'security': dict(self.security.metrics),
+            'content': dict(self.content.metrics),
+            'parsing': dict(self.parsing)
+        }
+
+    def restore_metrics(self, snapshot: Dict[str, Dict[str, Any]]):
+        """Reset the raw metric counters to a snapshot_metrics() copy"""
+        self.frontend.metrics = dict(snapshot['frontend'])
+        self.backend.metrics = dict(snapshot['backend'])
+        self.security.metrics = dict(snapshot['security'])
+        self.content.metrics = dict(snapshot['content'])
+        self.parsing = dict(snapshot['parsing'])
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get metrics of all analyzers keyed by section"""
+        return {
+            'frontend': self.frontend.get_metrics(),
+            'backend': self.backend.get_metrics(),
+            'security': self.security.get_metrics(),
+            'content': self.content.get_metrics(),
+            'parsing': self.parsing
+        }
@@ -0,0 +1,136 @@
+"""
+ALICE Python Front-end
+Parses Python once with the stdlib ast module and dispatches nodes to analyzer handlers
+"""
+
+import ast
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PARSE_EXTENSIONS = ('.py',)
+
+# Pseudo node type for handlers that receive each decorator expression
+DECORATOR = 'decorator'
+
+Handler = Callable[[ast.AST], None]
+
+
+def parse_py(content: str) -> Optional[ast.Module]:
+    """
+    Parse Python source
+
+    Args:
+        content: File content
+
+    Returns:
+        Module tree, or None when the source does not parse (callers fall back to the regex rules)
+    """
+    try:
+        return ast.parse(content)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None
+
+
+def node_line(node: ast.AST) -> int:
+    """Get the 1-based line a node starts on"""
+    return getattr(node, 'lineno', 1)
+
+
+def dotted_name(node: Optional[ast.AST]) -> Optional[str]:
+    """
+    Get a dotted name for names and plain attribute chains
+
+    Returns:
+        e.g. "eval", "os.system", "self.cursor.execute"; None for call-based chains
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = dotted_name(node.value)
+        if base is not None:
+            return f'{base}.{node.attr}'
+    return None
+
+
+def _is_str(node: ast.AST) -> bool:
+    return isinstance(node, ast.Constant) and isinstance(node.value, str)
+
+
+def string_building(node: Optional[ast.AST]) -> Optional[str]:
+    """
+    Classify strings assembled at runtime
+
+    Returns:
+        'f-string', 'percent', 'format' or 'concat'; None for literals and plain values
+    """
+    if isinstance(node, ast.JoinedStr):
+        if any(isinstance(value, ast.FormattedValue) for value in node.values):
+            return 'f-string'
+        return None
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, ast.Mod) and _is_str(node.left):
+            return 'percent'
+        if isinstance(node.op, ast.Add) and not (_is_str(node.left) and _is_str(node.right)):
+            return 'concat'
+        return None
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        if node.func.attr == 'format' and _is_str(node.func.value):
+            return 'format'
+    return None
+
+
+class PyVisitor(ast.NodeVisitor):
+    """Walks a tree once and calls every handler registered for each node type"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def on(self, node_type: str, handler: Handler):
+        """
+        Register a handler
+
+        Args:
+            node_type: ast class name, e.g. "Call", or DECORATOR
+            handler: Called with each matching node
+        """
+        self._handlers[node_type].append(handler)
+
+    def visit(self, node: ast.AST):
+        for handler in self._handlers.get(type(node).__name__, ()):
+            handler(node)
+
+        decorator_handlers = self._handlers.get(DECORATOR)
+        if decorator_handlers:
+            for decorator in getattr(node, 'decorator_list', ()):
+                for handler in decorator_handlers:
+                    handler(decorator)
+
+        self.generic_visit(node)
+
+    def walk(self, tree: ast.AST):
+        """Visit every node of the tree"""
+        if self._handlers:
+            self.visit(tree)
+
+
+def run_handlers(tree: ast.AST, registrations: List[Tuple[Any, str]], file_path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Let each analyzer register its handlers, then walk the tree once
+
+    Args:
+        tree: Parsed tree
+        registrations: (analyzer, name) pairs; analyzers implement register_py_handlers
+        file_path: Path to file
+
+    Returns:
+        Findings per analyzer name
+    """
+    visitor = PyVisitor()
+    findings: Dict[str, List[Dict[str, Any]]] = {}
+
+    for analyzer, name in registrations:
+        findings[name] = []
+        analyzer.register_py_handlers(visitor, file_path, findings[name])
+
+    visitor.walk(tree)
+    return findings
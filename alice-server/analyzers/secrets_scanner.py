@@ -0,0 +1,296 @@
+"""
+ALICE Secrets Scanner
+Finds hardcoded credentials in one pass over a file: provider-prefixed tokens,
+private key headers, URLs with credentials, literals assigned to secret-sounding
+names, and high-entropy string literals
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # entropy is then scored token by token
+    np = None
+
+from utils.file_classifier import LOCKFILE_NAMES, PARSED_LOCKFILE_NAMES
+
+# Provider tokens, recognized by prefix wherever they appear: (kind, regex)
+PROVIDER_PATTERNS = [
+    ('AWS access key ID', r'(?:AKIA|ASIA|ABIA|ACCA)[0-9A-Z]{16}\b'),
+    ('Stripe secret key', r'[sr]k_live_[0-9A-Za-z]{16,}'),
+    ('GitHub token', r'gh[pousr]_[0-9A-Za-z]{36,}|github_pat_[0-9A-Za-z_]{22,}'),
+    ('Slack token', r'xox[abposr]-[0-9A-Za-z-]{10,}'),
+    ('Google API key', r'AIza[0-9A-Za-z_-]{35}'),
+    ('private key', r'-----BEGIN (?:[A-Z0-9]+ )*PRIVATE KEY(?: BLOCK)?-----'),
+]
+
+# First characters of the provider patterns, keyword names, URL credentials and literals
+_FIRST_CHARS = 'Asrgx-' + 'sptkSPTK' + ':' + '"\'`'
+
+# Names whose assigned string literal is reported: (kind, name regex), first match wins
+# (a keyword followed by another letter is a different word: keyboard, tokenizer, secretary).
+# Names match case-insensitively, except a bare key: lowercase and a word of its own
+# (key, encryption_key, self.key), not the end of another word (monkey, cacheKey, STORAGE_KEY)
+SECRET_NAMES = [
+    ('AWS secret key', r'aws_?secret'),
+    ('API key', r'api_?key'),
+    ('password', r'passw(?:or)?d|pwd'),
+    ('secret', r'secret(?!ar)'),
+    ('token', r'token(?![a-z])'),
+    ('encryption key', r'(?<![A-Za-z0-9])(?-i:key)(?![A-Za-z0-9])'),
+]
+
+# Shortest assigned literal reported
+MIN_SECRET_LENGTH = 8
+
+# String literals scored for entropy
+MIN_ENTROPY_LENGTH = 20
+MAX_ENTROPY_LENGTH = 200
+
+# Longest name around a keyword and longest assigned value matched (bounds the work per
+# match in minified code, which has very long identifier runs and lines)
+MAX_NAME_LENGTH = 100
+MAX_VALUE_LENGTH = 1000
+
+# Reported when a literal's entropy reaches this share of the maximum for its length and alphabet
+ENTROPY_RATIO = 0.85
+
+# Test code and fixtures only get the provider token and private key checks
+FIXTURE_PATH = re.compile(
+    r'(?:^|/)(?:tests?|__tests__|spec|fixtures?|__fixtures__|__mocks__|testdata)/'
+    r'|(?:^|/)(?:test_[^/]*\.py|[^/]*_test\.py|[^/]*\.(?:test|spec)\.[jt]sx?)$'
+)
+
+_IDENTIFIER_CHARS = r'[A-Za-z0-9_$.-]'
+_NAME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$.-')
+_LITERAL_CHARS = r'[A-Za-z0-9+/=_-]'
+
+# Every alternative starts at a character from _FIRST_CHARS, so most offsets are rejected by
+# the leading lookahead alone. Assignments match from the keyword (name = "value", name: 'value',
+# "name": "value", name := "value"), the rest of the name being read back from the content,
+# and URL credentials from "://".
+_COMBINED = re.compile(
+    f'(?=[{re.escape(_FIRST_CHARS)}])(?:'
+    + '|'.join(f'(?P<provider_{index}>{pattern})' for index, (_, pattern) in enumerate(PROVIDER_PATTERNS))
+    + rf'|(?P<keyword>(?i:secret|passw|pwd|token|key)){_IDENTIFIER_CHARS}{{0,{MAX_NAME_LENGTH}}}["\']?\s*(?::=|=|:)\s*'
+      rf'(?P<quote>["\'`])(?P<value>[^"\'`\n]{{0,{MAX_VALUE_LENGTH}}})(?P=quote)'
+    + r'|://[^\s:/@"\'`]{1,200}:(?P<url_password>[^\s@/"\'`]{1,200})@'
+    # A quoted object key ("...": value) is not a literal to score
+    + rf'|(?P<literal_quote>["\'`])(?P<literal>{_LITERAL_CHARS}{{{MIN_ENTROPY_LENGTH},{MAX_ENTROPY_LENGTH}}})(?P=literal_quote)(?!\s*:)'
+    + ')'
+)
+
+_PROVIDER = re.compile('|'.join(f'(?P<provider_{index}>{pattern})' for index, (_, pattern) in enumerate(PROVIDER_PATTERNS)))
+_SECRET_NAMES = [(kind, re.compile(pattern, re.IGNORECASE)) for kind, pattern in SECRET_NAMES]
+_KEY_MATERIAL = re.compile(r'^[A-Za-z0-9+/=]{16,}$')
+# Key material this long with digits is reported without scoring its entropy
+MIN_KEY_LENGTH = 32
+_ENTROPY_CANDIDATE = re.compile(rf'^{_LITERAL_CHARS}{{{MIN_ENTROPY_LENGTH},{MAX_ENTROPY_LENGTH}}}$')
+_HEX = re.compile(r'^[0-9a-fA-F]+$')
+_PLACEHOLDER = re.compile(r'^(?:x+|\*+|\.+|<[^>]*>|your[-_ ].*|change[-_ ]?me|placeholder|redacted|example|dummy)$|\$\{|\{\{|%\(?s', re.IGNORECASE)
+
+
+class SecretMatch(NamedTuple):
+    """One suspected secret"""
+    kind: str
+    line_number: int
+    # Name the value is assigned to, if any
+    name: Optional[str]
+    # 'provider', 'assignment', 'url' or 'entropy'
+    rule: str
+
+
+def shannon_entropy(tokens: List[str]) -> List[float]:
+    """
+    Shannon entropy (bits per character) of each token
+
+    With NumPy, all tokens of a file are scored in one vectorized pass.
+
+    Args:
+        tokens: ASCII strings
+
+    Returns:
+        Entropy per token
+    """
+    if not tokens:
+        return []
+    if np is None:
+        entropies = []
+        for token in tokens:
+            length = len(token)
+            entropies.append(-sum(count / length * math.log2(count / length) for count in Counter(token).values()))
+        return entropies
+
+    lengths = np.fromiter((len(token) for token in tokens), dtype=np.int64, count=len(tokens))
+    data = np.frombuffer(''.join(tokens).encode('ascii'), dtype=np.uint8).astype(np.int64)
+    owners = np.repeat(np.arange(len(tokens), dtype=np.int64), lengths)
+    # Count each (token, character) pair, then sum -p*log2(p) per token
+    pairs, counts = np.unique(owners * 256 + data, return_counts=True)
+    owners = pairs // 256
+    probabilities = counts / lengths[owners]
+    return np.bincount(owners, weights=-probabilities * np.log2(probabilities), minlength=len(tokens)).tolist()
+
+
+def _max_entropy(token: str) -> float:
+    """Entropy of a uniformly random token of the same length and alphabet"""
+    alphabet = 16 if _HEX.match(token) else 64
+    return math.log2(min(len(token), alphabet))
+
+
+def _looks_random(token: str) -> bool:
+    """Cheap pre-filter: random tokens mix letters and digits"""
+    return any(char.isdigit() for char in token) and any(char.isalpha() for char in token)
+
+
+def _is_key_material(literal: str) -> bool:
+    """Check whether a literal assigned to a bare key looks like a key rather than a name or label"""
+    if not _KEY_MATERIAL.match(literal) or not _looks_random(literal):
+        return False
+    if len(literal) >= MIN_KEY_LENGTH:
+        return True
+    return shannon_entropy([literal])[0] >= ENTROPY_RATIO * _max_entropy(literal)
+
+
+def _name_before(content: str, offset: int) -> str:
+    """Read the start of an identifier back from an offset"""
+    start = offset
+    while start > 0 and offset - start < MAX_NAME_LENGTH and content[start - 1] in _NAME_CHARS:
+        start -= 1
+    return content[start:offset]
+
+
+def is_scanned(file_path: str) -> bool:
+    """Check whether a file is scanned at all (lockfiles are not)"""
+    base_name = os.path.basename(file_path).lower()
+    return base_name not in LOCKFILE_NAMES and base_name not in PARSED_LOCKFILE_NAMES
+
+
+def scan_secrets(file_path: str, content: str) -> List[SecretMatch]:
+    """
+    Find hardcoded secrets in a file
+
+    Args:
+        file_path: Path to file (lockfiles are not scanned; test code only for provider tokens)
+        content: File content
+
+    Returns:
+        Suspected secrets in file order, at most one per line
+    """
+    if not is_scanned(file_path):
+        return []
+    fixture = bool(FIXTURE_PATH.search(file_path.replace('\\', '/')))
+
+    found: Dict[int, SecretMatch] = {}
+    # (line, token) of literals left for entropy scoring
+    candidates = []
+    line_number, line_offset = 1, 0
+
+    for match in _COMBINED.finditer(content):
+        start = match.start()
+        # Matches come in file order, so lines are counted incrementally
+        line_number += content.count('\n', line_offset, start)
+        line_offset = start
+        if line_number in found:
+            continue
+        group = match.lastgroup
+        if group.startswith('provider_') and start and content[start - 1].isalnum():
+            # Provider prefix inside a longer word
+            continue
+
+        name = None
+        if match.group('keyword') is not None:
+            name = _name_before(content, start) + content[start:match.start('quote')].rstrip(' \t\'":=')
+            literal = match.group('value')
+        else:
+            literal = match.group('literal')
+
+        # Provider tokens are recognized inside literals too
+        provider = _PROVIDER.search(literal) if literal else None
+        if provider:
+            group = provider.lastgroup
+        if group.startswith('provider_'):
+            found[line_number] = SecretMatch(PROVIDER_PATTERNS[int(group[len('provider_'):])][0], line_number, name, 'provider')
+            continue
+
+        if fixture:
+            continue
+
+        if group == 'url_password':
+            if not _PLACEHOLDER.search(match.group('url_password')):
+                found[line_number] = SecretMatch('database URL with credentials', line_number, None, 'url')
+            continue
+
+        if name is not None and len(literal) >= MIN_SECRET_LENGTH and not _PLACEHOLDER.search(literal) and ' ' not in literal.strip():
+            kind = next((kind for kind, pattern in _SECRET_NAMES if pattern.search(name)), None)
+            # A bare key is only reported when the value looks like key material
+            if kind is not None and (kind != 'encryption key' or _is_key_material(literal)):
+                found[line_number] = SecretMatch(kind, line_number, name, 'assignment')
+                continue
+
+        if _ENTROPY_CANDIDATE.match(literal) and _looks_random(literal):
+            candidates.append((line_number, literal))
+
+    candidates = [(line_number, token) for line_number, token in candidates if line_number not in found]
+    for (line_number, token), entropy in zip(candidates, shannon_entropy([token for _, token in candidates])):
+        if line_number not in found and entropy >= ENTROPY_RATIO * _max_entropy(token):
+            found[line_number] = SecretMatch('high-entropy string', line_number, None, 'entropy')
+
+    return [found[line_number] for line_number in sorted(found)]
+
+
+def _environment_name(secret: SecretMatch) -> str:
+    name = secret.name or secret.kind
+    name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name.split('.')[-1])
+    return re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').upper() or 'SECRET'
+
+
+def secret_finding(file_path: str, secret: SecretMatch) -> Dict[str, Any]:
+    """
+    Build the finding for a suspected secret
+
+    Args:
+        file_path: Path to file
+        secret: Match from scan_secrets()
+
+    Returns:
+        Finding dict
+    """
+    variable = _environment_name(secret)
+    if file_path.endswith('.py'):
+        fix = f'Move to environment variables: os.environ.get("{variable}")'
+    else:
+        fix = f'Move to environment variables: process.env.{variable}'
+
+    if secret.rule == 'entropy':
+        return {
+            'severity': 'MEDIUM',
+            'category': 'Exposed Secrets',
+            'file_path': file_path,
+            'line_number': secret.line_number,
+            'description': 'High-entropy string literal may be a hardcoded credential',
+            'impact': 'If this is a credential, it is exposed in version control and deployments',
+            'fix_suggestion': f'{fix} (ignore if the value is not secret, e.g. a hash or ID)'
+        }
+    if secret.kind == 'encryption key':
+        return {
+            'severity': 'CRITICAL',
+            'category': 'Hardcoded Encryption Key',
+            'file_path': file_path,
+            'line_number': secret.line_number,
+            'description': 'Encryption key hardcoded in source code',
+            'impact': 'Compromised key exposes all encrypted data',
+            'fix_suggestion': f'{fix}, or use a key management system, and rotate the key'
+        }
+    return {
+        'severity': 'CRITICAL',
+        'category': 'Exposed Secrets',
+        'file_path': file_path,
+        'line_number': secret.line_number,
+        'description': f'Hardcoded {secret.kind} in source code',
+        'impact': 'Credentials exposed in version control, accessible to anyone with code access',
+        'fix_suggestion': f'{fix} and rotate the exposed credential'
+    }
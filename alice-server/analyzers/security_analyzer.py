@@ -4,40 +4,99 @@ Specialized security vulnerability scanner
 """
 
 import re
-from typing import List, Dict, Any
+import ast
+from typing import List, Dict, Any, Optional, Set
+
+from analyzers.js_frontend import JSVisitor, node_line, dotted_name, is_dynamic_string
+from analyzers.py_frontend import PyVisitor, string_building, dotted_name as py_dotted_name
+from analyzers.lexical_mask import LexicalMask, code_matches
+from analyzers.config import rule_enabled, without_disabled
+from analyzers.findings import FIRST_MATCH_KEY
+from analyzers.dependency_files import Dependency, is_dependency_file, parse_dependencies
+from analyzers.secrets_scanner import scan_secrets, secret_finding
+from utils.advisory_db import Advisory, get_advisory_db
+
+# child_process functions and the command they are reported as
+COMMAND_FUNCTIONS = {
+    'exec': 'exec', 'execSync': 'exec',
+    'spawn': 'spawn', 'spawnSync': 'spawn',
+    'system': 'system'
+}
+
+# Weak algorithms by lower-cased Python name: (algorithm, fix)
+WEAK_ALGORITHMS = {
+    'md5': ('MD5', 'Use SHA-256 or stronger'),
+    'sha1': ('SHA-1', 'Use SHA-256 or stronger'),
+    'des': ('DES', 'Use AES-256'),
+    'rc4': ('RC4', 'Use AES-256'),
+    'arc4': ('RC4', 'Use AES-256')
+}
 
 
 class SecurityAnalyzer:
     """Dedicated security vulnerability scanner"""
 
-    def __init__(self):
+    def __init__(self, retain_findings: bool = True, disabled_rules: Optional[Set[str]] = None):
+        """
+        Initialize security analyzer
+
+        Args:
+            retain_findings: Keep findings for get_vulnerabilities() (the analysis pipeline collects them itself)
+            disabled_rules: Lowercased finding categories not to check or report
+        """
+        self.retain_findings = retain_findings
+        self.disabled_rules = disabled_rules or set()
         self.vulnerabilities = []
         self.metrics = {
             'total_vulnerabilities': 0,
             'critical_vulns': 0,
             'high_vulns': 0,
-            'medium_vulns': 0
+            'medium_vulns': 0,
+            'exposed_secrets': 0,
+            'dependencies_checked': 0,
+            'vulnerable_dependencies': 0
         }
 
-    def analyze_file(self, file_path: str, content: str) -> List[Dict[str, Any]]:
+    def analyze_file(self, file_path: str, content: str, ast_findings: Optional[List[Dict[str, Any]]] = None,
+                     mask: Optional[LexicalMask] = None, file_level: bool = True) -> List[Dict[str, Any]]:
         """
         Scan file for security vulnerabilities
 
         Args:
             file_path: Path to file
             content: File content
+            ast_findings: Findings from the shared AST pass (rules it covers skip their regex scan)
+            mask: Lexical mask of the file; command and algorithm patterns in comments are ignored
+            file_level: False for one window of a larger file (the caller keeps the first match
+                of first-match-only rules)
 
         Returns:
             List of vulnerabilities found
         """
         file_vulns = []
         lines = content.split('\n')
-
-        # Check for common vulnerability patterns
-        file_vulns.extend(self._check_injection_vulnerabilities(file_path, content, lines))
-        file_vulns.extend(self._check_crypto_issues(file_path, content, lines))
-        file_vulns.extend(self._check_file_operations(file_path, content, lines))
-        file_vulns.extend(self._check_dependency_vulnerabilities(file_path, content, lines))
+        use_ast = ast_findings is not None
+
+        disabled = self.disabled_rules
+        if is_dependency_file(file_path):
+            # Manifests and lockfiles only get the advisory lookup
+            if rule_enabled(disabled, 'Vulnerable Dependency'):
+                file_vulns.extend(self._check_dependency_vulnerabilities(file_path, content))
+        else:
+            # Check for common vulnerability patterns
+            if rule_enabled(disabled, 'Command Injection', 'Path Traversal', 'LDAP Injection'):
+                file_vulns.extend(self._check_injection_vulnerabilities(file_path, content, lines, use_ast, mask))
+            if rule_enabled(disabled, 'Weak Cryptography', 'Weak Randomness'):
+                file_vulns.extend(self._check_crypto_issues(file_path, content, lines, use_ast and file_path.endswith('.py'), mask))
+            if rule_enabled(disabled, 'Exposed Secrets', 'Hardcoded Encryption Key'):
+                file_vulns.extend(self._check_secrets(file_path, content))
+            if use_ast:
+                file_vulns.extend(ast_findings)
+            if rule_enabled(disabled, 'Unrestricted File Upload'):
+                file_vulns.extend(self._check_file_operations(file_path, content, lines, file_level))
+
+        # Disabled rules sharing a check with enabled ones
+        file_vulns = without_disabled(file_vulns, disabled)
 
         # Update metrics
         for vuln in file_vulns:
@@ -49,15 +108,17 @@ class SecurityAnalyzer:
             elif vuln['severity'] == 'MEDIUM':
                 self.metrics['medium_vulns'] += 1
 
-        self.vulnerabilities.extend(file_vulns)
+        if self.retain_findings:
+            self.vulnerabilities.extend(file_vulns)
         return file_vulns
 
-    def _check_injection_vulnerabilities(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
+    def _check_injection_vulnerabilities(self, file_path: str, content: str, lines: List[str], use_ast: bool = False,
+                                         mask: Optional[LexicalMask] = None) -> List[Dict[str, Any]]:
         """Check for injection vulnerabilities"""
         vulns = []
 
-        # Command injection
-        command_patterns = [
+        # Command injection (from the AST pass when the file parsed)
+        command_patterns = [] if use_ast else [
             (r'exec\([^)]*\+', 'Command injection via exec'),
             (r'spawn\([^)]*\+', 'Command injection via spawn'),
             (r'system\([^)]*\+', 'Command injection via system'),
@@ -66,17 +127,9 @@ class SecurityAnalyzer:
         ]
 
         for pattern, description in command_patterns:
-            for match in re.finditer(pattern, content):
+            for match in code_matches(pattern, content, mask):
                 line_num = content[:match.start()].count('\n') + 1
-                vulns.append({
-                    'severity': 'CRITICAL',
-                    'category': 'Command Injection',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': description,
-                    'impact': 'Attacker can execute arbitrary system commands on the server',
-                    'fix_suggestion': 'Use parameterized commands and validate/sanitize all input'
-                })
+                vulns.append(self._command_injection_vuln(file_path, line_num, description))
 
         # Path traversal
         path_patterns = [
@@ -117,44 +170,113 @@ class SecurityAnalyzer:
 
         return vulns
 
-    def _check_crypto_issues(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
+    def register_js_handlers(self, visitor: JSVisitor, file_path: str, findings: List[Dict[str, Any]]):
+        """
+        Register the AST version of the command injection rule
+
+        Catches commands built from template literals as well as concatenation.
+
+        Args:
+            visitor: Shared visitor for the file
+            file_path: Path to file
+            findings: List the handlers append to
+        """
+        def on_call(node):
+            name = dotted_name(node.callee)
+            command = COMMAND_FUNCTIONS.get(name.rsplit('.', 1)[-1]) if name else None
+            if command and node.arguments and is_dynamic_string(node.arguments[0]):
+                findings.append(self._command_injection_vuln(
+                    file_path, node_line(node), f'Command injection via {command}'
+                ))
+
+        visitor.on('CallExpression', on_call)
+
+    def register_py_handlers(self, visitor: PyVisitor, file_path: str, findings: List[Dict[str, Any]]):
+        """
+        Register the AST versions of the command injection and weak algorithm rules
+
+        Only code is matched: algorithm names in comments, docstrings and log messages
+        are not reported.
+
+        Args:
+            visitor: Shared visitor for the file
+            file_path: Path to file
+            findings: List the handlers append to
+        """
+        def on_call(node):
+            name = py_dotted_name(node.func)
+            if not name or not node.args or not string_building(node.args[0]):
+                return
+            if name.startswith('subprocess.'):
+                command = 'subprocess'
+            elif name == 'os.system':
+                command = 'os.system'
+            else:
+                command = COMMAND_FUNCTIONS.get(name.rsplit('.', 1)[-1])
+            if command:
+                findings.append(self._command_injection_vuln(
+                    file_path, node.lineno, f'Command injection via {command}'
+                ))
+
+        def on_name(identifier, node):
+            weak = WEAK_ALGORITHMS.get(identifier.lower())
+            if weak:
+                findings.append(self._weak_crypto_vuln(file_path, node.lineno, *weak))
+
+        def on_hashlib_new(node):
+            # hashlib.new('md5')
+            if py_dotted_name(node.func) == 'hashlib.new' and node.args:
+                algorithm = node.args[0]
+                if isinstance(algorithm, ast.Constant) and isinstance(algorithm.value, str):
+                    on_name(algorithm.value, node)
+
+        visitor.on('Call', on_call)
+        visitor.on('Call', on_hashlib_new)
+        visitor.on('Name', lambda node: on_name(node.id, node))
+        visitor.on('Attribute', lambda node: on_name(node.attr, node))
+
+    def _weak_crypto_vuln(self, file_path: str, line_num: int, algorithm: str, fix: str) -> Dict[str, Any]:
+        """Build a weak cryptographic algorithm finding"""
+        return {
+            'severity': 'HIGH',
+            'category': 'Weak Cryptography',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': f'Use of weak cryptographic algorithm: {algorithm}',
+            'impact': 'Encrypted data can be compromised through cryptographic attacks',
+            'fix_suggestion': fix
+        }
+
+    def _command_injection_vuln(self, file_path: str, line_num: int, description: str) -> Dict[str, Any]:
+        """Build a command injection finding"""
+        return {
+            'severity': 'CRITICAL',
+            'category': 'Command Injection',
+            'file_path': file_path,
+            'line_number': line_num,
+            'description': description,
+            'impact': 'Attacker can execute arbitrary system commands on the server',
+            'fix_suggestion': 'Use parameterized commands and validate/sanitize all input'
+        }
+
+    def _check_crypto_issues(self, file_path: str, content: str, lines: List[str], use_python_ast: bool = False,
+                             mask: Optional[LexicalMask] = None) -> List[Dict[str, Any]]:
         """Check for cryptography issues"""
         vulns = []
 
-        # Weak crypto algorithms
-        weak_algorithms = [
+        # Weak crypto algorithms (from the AST pass when a Python file parsed)
+        weak_algorithms = [] if use_python_ast else [
             (r'\bMD5\b', 'MD5', 'Use SHA-256 or stronger'),
             (r'\bSHA1\b', 'SHA-1', 'Use SHA-256 or stronger'),
             (r'\bDES\b', 'DES', 'Use AES-256'),
             (r'\bRC4\b', 'RC4', 'Use AES-256')
         ]
 
+        # Algorithm names are often passed as strings (createHash('md5')), so only comments are ignored
         for pattern, algorithm, fix in weak_algorithms:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
-                line_num = content[:match.start()].count('\n') + 1
-                vulns.append({
-                    'severity': 'HIGH',
-                    'category': 'Weak Cryptography',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': f'Use of weak cryptographic algorithm: {algorithm}',
-                    'impact': 'Encrypted data can be compromised through cryptographic attacks',
-                    'fix_suggestion': fix
-                })
-
-        # Hardcoded encryption keys
-        if re.search(r'key\s*=\s*["\'][a-zA-Z0-9+/=]{16,}["\']', content):
-            for match in re.finditer(r'key\s*=\s*["\'][a-zA-Z0-9+/=]{16,}["\']', content):
+            for match in code_matches(pattern, content, mask, re.IGNORECASE, include_strings=True):
                 line_num = content[:match.start()].count('\n') + 1
-                vulns.append({
-                    'severity': 'CRITICAL',
-                    'category': 'Hardcoded Encryption Key',
-                    'file_path': file_path,
-                    'line_number': line_num,
-                    'description': 'Encryption key hardcoded in source code',
-                    'impact': 'Compromised key exposes all encrypted data',
-                    'fix_suggestion': 'Store encryption keys in secure key management system or environment variables'
-                })
+                vulns.append(self._weak_crypto_vuln(file_path, line_num, algorithm, fix))
 
         # Random number generation issues
         weak_random = [
@@ -181,8 +303,9 @@ class SecurityAnalyzer:
 
         return vulns
 
-    def _check_file_operations(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
-        """Check for unsafe file operations"""
+    def _check_file_operations(self, file_path: str, content: str, lines: List[str],
+                               file_level: bool = True) -> List[Dict[str, Any]]:
+        """Check for unsafe file operations (each upload pattern is reported at its first match)"""
         vulns = []
 
         # Unrestricted file upload
@@ -208,28 +331,67 @@ class SecurityAnalyzer:
                         'impact': 'Attacker can upload malicious files (shells, malware)',
                         'fix_suggestion': 'Validate file types, limit file size, sanitize filenames, scan for malware'
                     })
-                    break
+                    if file_level:
+                        break
+                    vulns[-1][FIRST_MATCH_KEY] = f'security:{pattern}'
 
         return vulns
 
-    def _check_dependency_vulnerabilities(self, file_path: str, content: str, lines: List[str]) -> List[Dict[str, Any]]:
-        """Check for known vulnerable dependencies"""
+    def _check_secrets(self, file_path: str, content: str) -> List[Dict[str, Any]]:
+        """Check for hardcoded credentials and keys"""
+        secrets = scan_secrets(file_path, content)
+        self.metrics['exposed_secrets'] += len(secrets)
+        return [secret_finding(file_path, secret) for secret in secrets]
+
+    def _check_dependency_vulnerabilities(self, file_path: str, content: str) -> List[Dict[str, Any]]:
+        """Check manifest and lockfile dependencies against the offline advisory database"""
         vulns = []
 
-        # Check package.json or requirements.txt for outdated packages
-        if file_path.endswith('package.json') or file_path.endswith('requirements.txt'):
-            vulns.append({
-                'severity': 'MEDIUM',
-                'category': 'Dependency Management',
-                'file_path': file_path,
-                'line_number': 1,
-                'description': 'Dependency file detected - run security audit',
-                'impact': 'Outdated dependencies may contain known vulnerabilities',
-                'fix_suggestion': 'Run: npm audit fix (Node.js) or pip-audit (Python) to check for vulnerabilities'
-            })
+        advisory_db = get_advisory_db()
+        if advisory_db is None:
+            # No advisories imported (see import_advisories.py)
+            return vulns
+
+        dependencies = parse_dependencies(file_path, content)
+        self.metrics['dependencies_checked'] += len(dependencies)
+
+        by_ecosystem = {}
+        for dependency in dependencies:
+            by_ecosystem.setdefault(dependency.ecosystem, []).append(dependency)
+
+        for ecosystem, ecosystem_dependencies in by_ecosystem.items():
+            affected = advisory_db.lookup(ecosystem, ((d.name, d.version) for d in ecosystem_dependencies))
+            for dependency in ecosystem_dependencies:
+                advisories = affected.get((dependency.name, dependency.version))
+                if not advisories:
+                    continue
+                self.metrics['vulnerable_dependencies'] += 1
+                for advisory in advisories:
+                    vulns.append(self._vulnerable_dependency(file_path, dependency, advisory))
 
         return vulns
 
+    def _vulnerable_dependency(self, file_path: str, dependency: Dependency, advisory: Advisory) -> Dict[str, Any]:
+        identifier = advisory.osv_id
+        cve = next((alias for alias in advisory.aliases if alias.startswith('CVE-')), None)
+        if cve:
+            identifier += f' ({cve})'
+        version = dependency.version if dependency.exact else f'{dependency.version} (lowest version allowed by the declared range)'
+
+        if advisory.fixed:
+            fix = f'Upgrade {dependency.name} to {advisory.fixed} or later'
+        else:
+            fix = f'No fixed {dependency.name} release is known; replace the package or mitigate as described in {advisory.osv_id}'
+        return {
+            'severity': advisory.severity,
+            'category': 'Vulnerable Dependency',
+            'file_path': file_path,
+            'line_number': dependency.line_number,
+            'description': f'{dependency.name} {version} is affected by {identifier}: {advisory.summary}'.rstrip(': '),
+            'impact': 'Known vulnerability in a dependency shipped with the application',
+            'fix_suggestion': fix
+        }
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get security metrics"""
         return self.metrics
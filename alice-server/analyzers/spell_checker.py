@@ -0,0 +1,424 @@
+"""
+ALICE Spell Checker
+SymSpell-style spelling correction for comments: an English dictionary plus technical
+vocabulary, indexed by symmetric deletes in a compact file that is memory-mapped at startup
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+_SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Word list ("word count" per line) and technical terms (one per line)
+DICTIONARY_PATH = os.path.join(_SERVER_DIR, 'data', 'spelling', 'words_en.txt')
+TECHNICAL_TERMS_PATH = os.path.join(_SERVER_DIR, 'data', 'spelling', 'technical.txt')
+
+# Index file, prebuilt by build_spelling_index.py and rebuilt in the background when the word lists
+# change (relative paths are relative to alice-server/; when the location is not writable the index
+# is kept in the temp directory)
+SPELLING_INDEX_PATH = os.path.join(
+    _SERVER_DIR,
+    os.environ.get('ALICE_SPELLING_INDEX', os.path.join('data', 'spelling', 'spelling.idx'))
+)
+
+# Largest edit distance suggested
+MAX_EDIT_DISTANCE = 2
+
+# Only the first PREFIX_LENGTH characters of a word are indexed (SymSpell's prefix indexing),
+# keeping the index small; candidates are verified against the whole word
+PREFIX_LENGTH = 7
+
+# Count given to technical terms, ranking them with common English words
+TECHNICAL_TERM_COUNT = 100_000_000
+
+# Words whose verdict is kept per process
+CORRECTION_CACHE_SIZE = 65536
+
+# magic, sources digest, max edit distance, prefix length, words, word blob bytes, entries
+_HEADER = struct.Struct('=8s32sIIIxxxxQQ')
+_MAGIC = b'ALSPELL1'
+
+_LOW_BITS = 0xFFFFFFFF
+
+# Plural and possessive endings stripped to find a known word (configs, repo's); other
+# inflections of English words are in the dictionary: (suffix, replacement)
+_SUFFIXES = (("'s", ''), ("s'", ''), ('ies', 'y'), ('es', ''), ('s', ''))
+
+# British spellings accepted when the American one is known (serialise, behaviour, analyse, centre)
+_BRITISH = [(re.compile(pattern), replacement) for pattern, replacement in (
+    (r'is(e|ed|es|ing|er|ers|ation|ations)$', r'iz\1'),
+    (r'our(s|ed|ing|ite|ites|able)?$', r'or\1'),
+    (r'ys(e|ed|es|ing)$', r'yz\1'),
+    (r'tre(s)?$', r'ter\1'),
+    (r'(?<=[aeiou])ll(ed|ing|er|ers)$', r'l\1'),
+)]
+
+# Removed from comment text before tokenizing: inline code, URLs, e-mail addresses and paths
+_NOT_PROSE = re.compile(r'`[^`]*`|\S*(?:://|@|/|\\)\S*')
+_TOKEN = re.compile(r"[A-Za-z0-9_']+")
+_IDENTIFIER_PART = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+')
+_SENTENCE_END = re.compile(r'[.!?:]\s*$')
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """The word and every string made by deleting up to max_distance of its characters"""
+    found = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for text in frontier:
+            if len(text) > 1:
+                for i in range(len(text)):
+                    delete = text[:i] + text[i + 1:]
+                    if delete not in found:
+                        found.add(delete)
+                        next_frontier.append(delete)
+        frontier = next_frontier
+    return found
+
+
+def _hash(text: str) -> int:
+    return zlib.crc32(text.encode('utf-8'))
+
+
+def edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions)
+
+    Returns:
+        Distance, or None when it exceeds limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return None
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def _read_word_lists(dictionary_path: str, technical_terms_path: str) -> Dict[str, int]:
+    """Word -> count, technical terms included"""
+    counts: Dict[str, int] = {}
+    with open(dictionary_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2 and not line.startswith('#'):
+                counts[parts[0].lower()] = max(counts.get(parts[0].lower(), 0), int(parts[1]))
+    if os.path.exists(technical_terms_path):
+        with open(technical_terms_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                term = line.strip().lower()
+                if term and not term.startswith('#'):
+                    counts[term] = max(counts.get(term, 0), TECHNICAL_TERM_COUNT)
+    return counts
+
+
+def _sources_digest(dictionary_path: str, technical_terms_path: str) -> bytes:
+    digest = hashlib.sha256(f'{MAX_EDIT_DISTANCE}/{PREFIX_LENGTH}/{sys.byteorder}'.encode())
+    for path in (dictionary_path, technical_terms_path):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.digest()
+
+
+def build_index(index_path: str, dictionary_path: str = DICTIONARY_PATH,
+                technical_terms_path: str = TECHNICAL_TERMS_PATH) -> int:
+    """
+    Build the symmetric-delete index file
+
+    Layout: header, newline-joined words, word counts (uint64), then sorted uint64 entries
+    (crc32 of a delete << 32 | word number), all in native byte order. The file is written
+    next to index_path and moved into place when complete.
+
+    Args:
+        index_path: Index file to write
+        dictionary_path: Word list
+        technical_terms_path: Technical vocabulary
+
+    Returns:
+        Number of entries
+    """
+    counts = _read_word_lists(dictionary_path, technical_terms_path)
+    words = sorted(counts)
+
+    entries = array('Q')
+    for number, word in enumerate(words):
+        entries.extend(_hash(delete) << 32 | number for delete in _deletes(word[:PREFIX_LENGTH], MAX_EDIT_DISTANCE))
+    entries = array('Q', sorted(entries))
+
+    blob = '\n'.join(words).encode('utf-8')
+    padding = b'\0' * (-(_HEADER.size + len(blob)) % 8)
+    header = _HEADER.pack(_MAGIC, _sources_digest(dictionary_path, technical_terms_path),
+                          MAX_EDIT_DISTANCE, PREFIX_LENGTH, len(words), len(blob), len(entries))
+
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    temp_path = f'{index_path}.{os.getpid()}.building'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(blob)
+            f.write(padding)
+            array('Q', (counts[word] for word in words)).tofile(f)
+            entries.tofile(f)
+        os.replace(temp_path, index_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+    return len(entries)
+
+
+class SpellChecker:
+    """Dictionary lookups and suggestions over a memory-mapped index"""
+
+    def __init__(self, index_path: str, digest: Optional[bytes] = None):
+        """
+        Open an index
+
+        Args:
+            index_path: File written by build_index()
+            digest: Expected sources digest (None = accept any)
+
+        Raises:
+            ValueError: If the file is not a current index
+        """
+        with open(index_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError('truncated index')
+        magic, file_digest, max_distance, prefix_length, word_count, blob_bytes, entry_count = \
+            _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or (digest is not None and file_digest != digest):
+            raise ValueError('stale index')
+        if max_distance != MAX_EDIT_DISTANCE or prefix_length != PREFIX_LENGTH:
+            raise ValueError('index built with other parameters')
+
+        view = memoryview(self._map)
+        offset = _HEADER.size
+        self._words: List[str] = bytes(view[offset:offset + blob_bytes]).decode('utf-8').split('\n')
+        offset += blob_bytes + (-(offset + blob_bytes) % 8)
+        self._counts = view[offset:offset + word_count * 8].cast('Q')
+        offset += word_count * 8
+        self._entries = view[offset:offset + entry_count * 8].cast('Q')
+        if len(self._words) != word_count or len(self._entries) != entry_count:
+            raise ValueError('truncated index')
+
+        self._numbers = {word: number for number, word in enumerate(self._words)}
+        self._cache: Dict[str, Optional[Tuple[str, int]]] = {}
+
+    def is_known(self, word: str) -> bool:
+        """Check whether a lowercased word (its plural or British spelling included) is in the dictionary"""
+        if word in self._numbers:
+            return True
+        for suffix, replacement in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                if word[:-len(suffix)] + replacement in self._numbers:
+                    return True
+        for pattern, replacement in _BRITISH:
+            american = pattern.sub(replacement, word)
+            if american != word and american in self._numbers:
+                return True
+        return False
+
+    def suggest(self, word: str) -> Optional[Tuple[str, int]]:
+        """
+        Find the most likely intended word for an unknown word
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            Tuple of (suggestion, edit distance), or None when the word is known or
+            nothing is within MAX_EDIT_DISTANCE
+        """
+        if word in self._cache:
+            return self._cache[word]
+        suggestion = None if self.is_known(word) else self._lookup(word)
+        if len(self._cache) >= CORRECTION_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[word] = suggestion
+        return suggestion
+
+    def _lookup(self, word: str) -> Optional[Tuple[str, int]]:
+        entries = self._entries
+        candidates = set()
+        for delete in _deletes(word[:PREFIX_LENGTH], MAX_EDIT_DISTANCE):
+            delete_hash = _hash(delete)
+            i = bisect_left(entries, delete_hash << 32)
+            while i < len(entries) and entries[i] >> 32 == delete_hash:
+                candidates.add(entries[i] & _LOW_BITS)
+                i += 1
+
+        best = None
+        for number in candidates:
+            candidate = self._words[number]
+            distance = edit_distance(word, candidate, best[0] if best else MAX_EDIT_DISTANCE)
+            if distance is None:
+                continue
+            # Closest first, then the most frequent
+            rank = (distance, -self._counts[number], candidate)
+            if best is None or rank < best:
+                best = rank
+        return (best[2], best[0]) if best else None
+
+
+def verify_index(index_path: str, dictionary_path: str = DICTIONARY_PATH,
+                 technical_terms_path: str = TECHNICAL_TERMS_PATH):
+    """
+    Check that an index is current for the word lists
+
+    Raises:
+        OSError: If the index cannot be read
+        ValueError: If it is stale or built with other parameters
+    """
+    SpellChecker(index_path, _sources_digest(dictionary_path, technical_terms_path))
+
+
+def comment_words(text: str) -> Iterator[Tuple[str, bool]]:
+    """
+    Words of a comment worth spell-checking
+
+    Inline code, URLs and paths are dropped. Identifiers are split into their camelCase /
+    snake_case parts. Words with digits, all-caps words (acronyms) and capitalized words
+    inside a sentence (names) are skipped.
+
+    Args:
+        text: Comment text
+
+    Yields:
+        Tuple of (word, part of an identifier)
+    """
+    text = _NOT_PROSE.sub(' ', text)
+    for match in _TOKEN.finditer(text):
+        token = match.group(0).strip("'_")
+        if not token or any(char.isdigit() for char in token):
+            continue
+
+        if '_' in token or re.search(r'[a-z][A-Z]', token):
+            for part in re.split(r'_+', token):
+                for piece in _IDENTIFIER_PART.findall(part):
+                    if not piece.isupper():
+                        yield piece.lower(), True
+            continue
+
+        if len(token) > 1 and token.isupper():
+            continue
+        if token[0].isupper() and match.start() and not _SENTENCE_END.search(text[:match.start()]):
+            continue
+        yield token.lower(), False
+
+
+_spell_checker = None
+_spell_checker_opened = False
+_spell_checker_lock = threading.Lock()
+_index_build: Optional[threading.Thread] = None
+
+
+def _index_candidates(digest: bytes) -> List[str]:
+    return [SPELLING_INDEX_PATH, os.path.join(tempfile.gettempdir(), f'alice-spelling-{digest.hex()[:12]}.idx')]
+
+
+def _open_index(digest: bytes) -> Optional[SpellChecker]:
+    for path in _index_candidates(digest):
+        try:
+            return SpellChecker(path, digest)
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def _build_index(digest: bytes) -> Optional[str]:
+    """Build the index where writable; returns its path, or None"""
+    for path in _index_candidates(digest):
+        try:
+            build_index(path)
+            return path
+        except OSError as e:
+            print(f"Could not write spelling index to {path}: {e}")
+    return None
+
+
+def _build_in_background(digest: bytes):
+    global _spell_checker_opened
+    print("Spelling index missing or stale; building it (prebuild with: python build_spelling_index.py)")
+    if _build_index(digest) is None:
+        # Nowhere to write it: spelling stays off in this process
+        with _spell_checker_lock:
+            _spell_checker_opened = True
+
+
+def get_spell_checker() -> Optional[SpellChecker]:
+    """
+    Get the process's spell checker
+
+    A missing or stale index is never built on the caller's thread: it is built in the
+    background and spelling is skipped (None) until it is ready. Deployments ship the
+    index prebuilt by build_spelling_index.py.
+
+    Returns:
+        SpellChecker, or None when the dictionary is missing or the index is not ready
+    """
+    global _spell_checker, _spell_checker_opened, _index_build
+    if not _spell_checker_opened:
+        with _spell_checker_lock:
+            if not _spell_checker_opened:
+                if not os.path.exists(DICTIONARY_PATH):
+                    print(f"Spelling dictionary not found at {DICTIONARY_PATH}")
+                    _spell_checker_opened = True
+                elif _index_build is None or not _index_build.is_alive():
+                    digest = _sources_digest(DICTIONARY_PATH, TECHNICAL_TERMS_PATH)
+                    _spell_checker = _open_index(digest)
+                    if _spell_checker is not None:
+                        _spell_checker_opened = True
+                    elif _index_build is None:
+                        _index_build = threading.Thread(
+                            target=_build_in_background, args=(digest,), name='alice-spelling-index', daemon=True
+                        )
+                        _index_build.start()
+                    else:
+                        # Built, yet unreadable: do not rebuild on every call
+                        _spell_checker_opened = True
+    return _spell_checker
+
+
+def load_spell_checker() -> Optional[SpellChecker]:
+    """
+    Open the process's spell checker, building the index first when needed
+
+    Blocks for the build; for scripts and harnesses, not request handlers.
+
+    Returns:
+        SpellChecker, or None when the dictionary is missing or the index cannot be written
+    """
+    global _spell_checker, _spell_checker_opened
+    with _spell_checker_lock:
+        if not _spell_checker_opened and os.path.exists(DICTIONARY_PATH):
+            digest = _sources_digest(DICTIONARY_PATH, TECHNICAL_TERMS_PATH)
+            _spell_checker = _open_index(digest)
+            if _spell_checker is None and _build_index(digest) is not None:
+                _spell_checker = _open_index(digest)
+        _spell_checker_opened = True
+    return _spell_checker
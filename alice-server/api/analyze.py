@@ -5,11 +5,14 @@ Main endpoint for code analysis
 
 import os
 import json
+import time
+import hashlib
 import tempfile
 import zipfile
 import shutil
-from datetime import datetime
-from typing import Dict, Any, List
+import posixpath
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Tuple
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from pathlib import Path
@@ -18,14 +21,25 @@ from pathlib import Path
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from analyzers.frontend_analyzer import FrontendAnalyzer
-from analyzers.backend_analyzer import BackendAnalyzer
-from analyzers.security_analyzer import SecurityAnalyzer
-from analyzers.content_analyzer import ContentAnalyzer
+from analyzers.pipeline import AnalyzerSet, ANALYZER_VERSION
+from analyzers.dependency_files import is_dependency_file
+from analyzers.findings import FindingStore
+from analyzers.config import AnalysisConfig, parse_config_text, CONFIG_FILENAMES, MAX_CONFIG_BYTES
 from api.scoring import get_scoring_engine
 from utils.email_client import get_email_client
-from database.models import DatabaseManager, Analysis, Bug, Report, Developer, Project
+from database.models import DatabaseManager, Analysis, AnalysisJob, Bug, Report, Developer, Project
 from utils.encryption import EncryptionManager
+from utils.memory import MemoryTracker
+from utils.chunked_reader import iter_windows
+from utils.file_classifier import classify_file, sniff, ANALYZE, SKIP, DOWNGRADE, DEPENDENCIES
+from utils.sandbox import Sandbox, ResourceLimitExceeded
+from utils.file_cache import FileResultCache, validate_manifest
+from utils.idempotency import submission_fingerprint, MAX_IDEMPOTENCY_KEY_LENGTH
+from utils.sampling import StratifiedEstimator, fraction_sample, sample_order
+from utils.risk_order import past_critical_paths, risk_key
+from utils import background, job_queue
+from utils.diff_parser import ChangedFile, parse_unified_diff, read_bundle, MAX_DIFF_BYTES
+from utils.ignore_rules import IgnoreMatcher, build_matcher, parse_patterns, MAX_GITIGNORE_BYTES
 
 app = Flask(__name__)
 
@@ -34,7 +48,7 @@ CORS(app, resources={
     r"/api/*": {
         "origins": "*",
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "X-API-Key", "X-Admin-Key"],
+        "allow_headers": ["Content-Type", "X-API-Key", "X-Admin-Key", "Idempotency-Key"],
         "max_age": 3600
     }
 })
@@ -45,8 +59,253 @@ BUILD_TIMESTAMP = datetime.utcnow().isoformat()
 # Initialize database
 db_manager = DatabaseManager(os.environ.get('DATABASE_URL', 'postgresql://localhost/alice'))
 
+# Memory limits (soft budget in MB; files above the threshold are scanned in windows)
+MEMORY_BUDGET_MB = int(os.environ.get('ALICE_MEMORY_BUDGET_MB', 0)) or None
+LARGE_FILE_BYTES = int(os.environ.get('ALICE_LARGE_FILE_BYTES', 1024 * 1024))
 
-def analyze_codebase(archive_path: str, project_id: str, developer_email: str = None) -> Dict[str, Any]:
+# Findings kept per rule per file / per analysis before the rest collapse into an aggregate (0 = no cap)
+RULE_CAP_PER_FILE = int(os.environ.get('ALICE_RULE_CAP_PER_FILE', 25))
+RULE_CAP_PER_ANALYSIS = int(os.environ.get('ALICE_RULE_CAP_PER_ANALYSIS', 200))
+
+# Lines around a changed line whose findings still count in diff analysis
+DIFF_CONTEXT_LINES = int(os.environ.get('ALICE_DIFF_CONTEXT_LINES', 3))
+
+# Identical submissions (or retries with the same Idempotency-Key) within this window reuse the stored analysis
+IDEMPOTENCY_WINDOW_SECONDS = int(os.environ.get('ALICE_IDEMPOTENCY_WINDOW_SECONDS', 3600))
+
+# Share of each directory/language stratum analyzed in sampling mode when no fraction or time budget is given
+SAMPLE_FRACTION = float(os.environ.get('ALICE_SAMPLE_FRACTION', 0.1))
+
+# Seconds from request arrival after which analysis stops and a partial result is stored
+# (keep below the function timeout, leaving time to store the result; 0 = no deadline)
+ANALYSIS_DEADLINE_SECONDS = float(os.environ.get('ALICE_ANALYSIS_DEADLINE_SECONDS', 45))
+
+# Re-run partial analyses in the background by default (clients can ask with complete_remaining)
+QUEUE_REMAINDER = os.environ.get('ALICE_QUEUE_REMAINDER', 'false').lower() == 'true'
+
+# Remaining files listed in a partial result
+PARTIAL_LISTED_FILES = 100
+
+# Per-file sandbox: analyze each file in a worker subprocess with these limits
+SANDBOX = os.environ.get('ALICE_SANDBOX', 'false').lower() == 'true'
+SANDBOX_CPU_SECONDS = float(os.environ.get('ALICE_SANDBOX_CPU_SECONDS', 10))
+SANDBOX_MEMORY_MB = int(os.environ.get('ALICE_SANDBOX_MEMORY_MB', 1024))
+SANDBOX_TIMEOUT_SECONDS = float(os.environ.get('ALICE_SANDBOX_TIMEOUT_SECONDS', 20))
+
+# Severities kept finding by finding once the memory budget is approached (the others
+# collapse into one counted, scored aggregate per rule)
+RETAINED_SEVERITIES = ('CRITICAL', 'HIGH')
+
+
+def _new_sandbox() -> Sandbox:
+    """Create a per-file sandbox with the configured limits"""
+    return Sandbox(
+        cpu_seconds=SANDBOX_CPU_SECONDS or None,
+        memory_mb=SANDBOX_MEMORY_MB or None,
+        timeout_seconds=SANDBOX_TIMEOUT_SECONDS or None
+    )
+
+
+def _extract_archive(archive_path: str, target_dir: str,
+                     ignore_patterns: Optional[List[str]] = None) -> Tuple[IgnoreMatcher, Dict[str, int]]:
+    """
+    Extract an upload, leaving ignored files compressed and unread
+
+    .gitignore files in the archive are read first and compiled, with the default and
+    project ignore patterns, into one matcher; every other member is checked against it.
+
+    Args:
+        archive_path: Uploaded zip file
+        target_dir: Directory to extract into
+        ignore_patterns: Project-level ignore patterns (gitignore syntax)
+
+    Returns:
+        Tuple of (matcher, pruned file count per rule source)
+    """
+    ignored = {}
+    with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+        members = [
+            (info.filename.replace('\\', '/').lstrip('/'), info)
+            for info in zip_ref.infolist() if not info.is_dir()
+        ]
+
+        defaults = build_matcher()
+        gitignores = {
+            name: zip_ref.read(info).decode('utf-8', errors='ignore')
+            for name, info in members
+            if posixpath.basename(name) == '.gitignore' and info.file_size <= MAX_GITIGNORE_BYTES
+            and not defaults.ignored_by(name)
+        }
+        matcher = build_matcher(ignore_patterns, gitignores)
+
+        for name, info in members:
+            source = matcher.ignored_by(name)
+            if source:
+                ignored[source] = ignored.get(source, 0) + 1
+            else:
+                zip_ref.extract(info, target_dir)
+
+    return matcher, ignored
+
+
+def _analyze_path(analyzers: AnalyzerSet, file_path: str, relative_path: str, large_file_bytes: int,
+                  use_ast: bool = True) -> Tuple[List[Dict[str, Any]], str, Optional[str], bool]:
+    """
+    Classify and analyze one extracted file
+
+    Args:
+        analyzers: Analyzers to run (and accumulate metrics in)
+        file_path: Path on disk
+        relative_path: Path inside the archive
+        large_file_bytes: Files larger than this are scanned in overlapping windows
+        use_ast: Run the parsed (deep tier) rules; False keeps to literal/regex checks
+
+    Returns:
+        Tuple of (findings, classifier action, classifier reason, windowed)
+    """
+    # Skip binary files, other lockfiles and source maps; security-scan only minified/generated code
+    action, reason = classify_file(os.path.basename(file_path), sniff(file_path))
+    if action == SKIP:
+        return [], action, reason, False
+    security_only = action in (DOWNGRADE, DEPENDENCIES)
+
+    # Lockfiles are parsed whole, never windowed
+    if action != DEPENDENCIES and os.path.getsize(file_path) > large_file_bytes:
+        return analyzers.analyze_windows(relative_path, iter_windows(file_path), security_only), action, reason, True
+
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+    return analyzers.analyze(relative_path, content, security_only, use_ast), action, reason, False
+
+
+def _partial_report(work: List[Tuple[str, str]], position: int, incomplete_file: Optional[str],
+                    skipped_files: Dict[str, int]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Describe an analysis cut short by its deadline
+
+    Args:
+        work: Files in analysis order
+        position: Index of the first file not (fully) analyzed
+        incomplete_file: File stopped between analyzers, if any
+        skipped_files: Skip reasons counted so far
+
+    Returns:
+        Tuple of (partial-result block of the analysis result, every file not fully analyzed)
+    """
+    unanalyzed = [relative_path for relative_path, _ in work[position:]]
+    remaining = unanalyzed[1:] if incomplete_file is not None else unanalyzed
+    return {
+        'deadline_exceeded': True,
+        'files_total': len(work),
+        'files_analyzed': position,
+        'files_skipped': sum(skipped_files.values()),
+        'files_remaining': len(remaining) + (incomplete_file is not None),
+        'incomplete_file': incomplete_file,
+        'remaining_files': remaining[:PARTIAL_LISTED_FILES]
+    }, unanalyzed
+
+
+def _analyze_isolated(file_path: str, relative_path: str, large_file_bytes: int, use_ast: bool,
+                      deadline: Optional[float],
+                      config: Optional[AnalysisConfig] = None) -> Tuple[List[Dict[str, Any]], str, Optional[str], bool, Dict[str, Any], bool]:
+    """
+    Analyze one file with its own analyzers (cacheable, and runnable in a sandbox worker)
+
+    Returns:
+        Tuple of (findings, classifier action, classifier reason, windowed, metrics, deadline exceeded)
+    """
+    analyzers = AnalyzerSet(deadline, config)
+    bugs, action, reason, windowed = _analyze_path(analyzers, file_path, relative_path, large_file_bytes, use_ast)
+    return bugs, action, reason, windowed, analyzers.get_metrics(), analyzers.deadline_exceeded
+
+
+def _aborted_bug(relative_path: str, limit: str) -> Dict[str, Any]:
+    """Finding reported for a file whose analysis hit a sandbox limit"""
+    return {
+        'severity': 'LOW',
+        'category': 'Analysis Aborted',
+        'file_path': relative_path,
+        'line_number': None,
+        'description': f'analysis aborted: resource limit ({limit})',
+        'impact': 'This file was not analyzed, so issues in it are not reported',
+        'fix_suggestion': 'Split very large or generated files, or exclude them from the upload'
+    }
+
+
+def _project_config(project: Project, archive_path: Optional[str] = None,
+                    config_text: Optional[str] = None) -> AnalysisConfig:
+    """
+    Get the analysis settings of a submission
+
+    An .alice.yml at the archive root (or its text, sent with a manifest) takes precedence
+    over the settings stored on the project.
+
+    Args:
+        project: Submitting project
+        archive_path: Uploaded zip file
+        config_text: Content of the client's .alice.yml, if sent separately
+
+    Returns:
+        AnalysisConfig
+
+    Raises:
+        ValueError: If the settings are invalid
+    """
+    if config_text is None and archive_path is not None:
+        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+            for name in CONFIG_FILENAMES:
+                try:
+                    info = zip_ref.getinfo(name)
+                except KeyError:
+                    continue
+                if info.file_size > MAX_CONFIG_BYTES:
+                    raise ValueError(f'{name} is larger than {MAX_CONFIG_BYTES} bytes')
+                config_text = zip_ref.read(info).decode('utf-8', errors='ignore')
+                break
+
+    if config_text is not None:
+        try:
+            return AnalysisConfig(parse_config_text(config_text), source='.alice.yml')
+        except ValueError as e:
+            raise ValueError(f'Invalid .alice.yml: {e}')
+
+    if project.analysis_config:
+        try:
+            return AnalysisConfig(project.analysis_config, source='project')
+        except ValueError as e:
+            raise ValueError(f'Invalid project analysis settings: {e}')
+
+    return AnalysisConfig()
+
+
+def _file_sha256(file_path: str) -> str:
+    """Hash a file the way the SDK builds its manifest"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def analyze_codebase(
+    archive_path: str,
+    project_id: str,
+    developer_email: str = None,
+    memory_budget_mb: Optional[int] = None,
+    large_file_bytes: Optional[int] = None,
+    manifest: Optional[Dict[str, str]] = None,
+    file_cache: Optional[FileResultCache] = None,
+    gate_paths: Optional[Set[str]] = None,
+    sample_fraction: Optional[float] = None,
+    sample_seconds: Optional[float] = None,
+    fast_tier: bool = False,
+    deadline: Optional[float] = None,
+    sandboxed: Optional[bool] = None,
+    ignore_patterns: Optional[List[str]] = None,
+    config: Optional[AnalysisConfig] = None,
+    only_paths: Optional[List[str]] = None,
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Analyze uploaded code archive
 
@@ -54,87 +313,339 @@ def analyze_codebase(archive_path: str, project_id: str, developer_email: str =
         archive_path: Path to uploaded zip file
         project_id: Project ID
         developer_email: Optional developer email
+        memory_budget_mb: Soft memory budget (default ALICE_MEMORY_BUDGET_MB, unset disables it)
+        large_file_bytes: Files larger than this are scanned in overlapping windows
+        manifest: Incremental upload: every file of the codebase as relative path -> sha256.
+            The archive then only holds files without a cached result.
+        file_cache: Cached per-file results (required with manifest)
+        gate_paths: Fail-fast gate mode: files with past critical findings. Files are analyzed
+            riskiest first and analysis stops at the first critical finding (result['gate']).
+        sample_fraction: Sampling mode: analyze this share of every directory/language stratum
+            and extrapolate counts and score (result['estimated'], result['sampling'])
+        sample_seconds: Sampling mode: analyze a proportional stratified sample until this time budget is spent
+        fast_tier: Only run the cheap tier (literal/regex checks, size classification, secrets);
+            the parsed AST rules are left to a deep-tier run
+        deadline: time.monotonic() value checked between files and between analyzers; once it
+            passes, the files analyzed so far are scored as a provisional result (result['partial'])
+        sandboxed: Analyze each file in a worker subprocess under CPU/memory/wall-clock limits
+            (default ALICE_SANDBOX); files hitting a limit are reported as aborted
+        ignore_patterns: Project-level ignore patterns (gitignore syntax), applied with the
+            defaults and the archive's .gitignore files; matching files are never extracted
+        config: Analyzer/rule selection, thresholds and per-analyzer paths (see _project_config);
+            file_cache must be built with the same config
+        only_paths: Analyze only these files (the unanalyzed_files of a partial result)
+        previous: Stored partial result this run resumes (with only_paths): its findings and
+            metrics are carried over and scored with the new ones (result['resumed']); the file it
+            was cut short in is analyzed again, once
 
     Returns:
         Analysis results
     """
+    memory = MemoryTracker(memory_budget_mb if memory_budget_mb is not None else MEMORY_BUDGET_MB)
+    config = config or AnalysisConfig()
+    large_file_bytes = large_file_bytes or config.thresholds['large_file_bytes'] or LARGE_FILE_BYTES
+
     # Extract archive
     temp_dir = tempfile.mkdtemp()
+    memory.start()
 
     try:
-        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
+        with memory.stage('extract'):
+            matcher, ignored_files = _extract_archive(archive_path, temp_dir, ignore_patterns)
 
         # Initialize analyzers
-        frontend_analyzer = FrontendAnalyzer()
-        backend_analyzer = BackendAnalyzer()
-        security_analyzer = SecurityAnalyzer()
-        content_analyzer = ContentAnalyzer()
+        analyzers = AnalyzerSet(deadline, config)
+        sandbox = _new_sandbox() if (SANDBOX if sandboxed is None else sandboxed) else None
+        aborted_files = {}
+
+        all_bugs = FindingStore(RULE_CAP_PER_FILE, RULE_CAP_PER_ANALYSIS)
+        collapsed_bugs = {}
+        windowed_files = 0
+        skipped_files = {}
+        downgraded_files = {}
+        incremental = None
+        gate = None
+        estimator = None
+        sample_deadline = None
+        partial = None
+        unanalyzed_files = None
+        resumed = None
+        cut_short = False
+        scoring_engine = get_scoring_engine()
+
+        retried_file = None
+        if previous is not None:
+            # Carry the files analyzed so far over; they are scored with this run's. The file the
+            # earlier run was cut short in is analyzed again whole, so its findings are not kept.
+            incomplete_file = (previous.get('partial') or {}).get('incomplete_file')
+            if incomplete_file is not None and incomplete_file in (only_paths or ()):
+                retried_file = incomplete_file
+            for bug in previous['bugs']:
+                if retried_file is None or bug.get('file_path') != retried_file:
+                    all_bugs.add(bug)
+            analyzers.merge_metrics(previous['metrics'])
+            for counts, earlier in ((skipped_files, 'skipped'), (downgraded_files, 'downgraded'), (aborted_files, 'aborted')):
+                counts.update(previous['metrics']['files'].get(earlier) or {})
+            earlier_resumed = previous.get('resumed') or {'runs': 1, 'incomplete_files': []}
+            resumed = {'runs': earlier_resumed['runs'] + 1, 'incomplete_files': list(earlier_resumed['incomplete_files'])}
+
+        def collect(bugs: List[Dict[str, Any]]):
+            # Near the budget, keep only findings that decide deployment individually
+            if memory.approaching_budget():
+                for bug in bugs:
+                    severity = bug.get('severity')
+                    if severity in RETAINED_SEVERITIES:
+                        all_bugs.add(bug)
+                    else:
+                        all_bugs.add(bug, aggregate=True)
+                        collapsed_bugs[severity] = collapsed_bugs.get(severity, 0) + 1
+            else:
+                for bug in bugs:
+                    all_bugs.add(bug)
+
+        def count_classification(skipped_reason: Optional[str], downgraded_reason: Optional[str]):
+            if skipped_reason:
+                skipped_files[skipped_reason] = skipped_files.get(skipped_reason, 0) + 1
+            if downgraded_reason:
+                downgraded_files[downgraded_reason] = downgraded_files.get(downgraded_reason, 0) + 1
+
+        def analyze_isolated(relative_path: str, file_path: str):
+            if sandbox is None:
+                return _analyze_isolated(file_path, relative_path, large_file_bytes, not fast_tier, deadline, config)
+            try:
+                return sandbox.run(_analyze_isolated, file_path, relative_path, large_file_bytes, not fast_tier, deadline, config)
+            except ResourceLimitExceeded as e:
+                # The worker was killed and replaced; report the file and carry on
+                aborted_files[relative_path] = e.limit
+                return [_aborted_bug(relative_path, e.limit)], ANALYZE, None, False, {}, False
+
+        def analyze_uploaded(relative_path: str, file_path: str):
+            nonlocal windowed_files, cut_short
+            if sandbox is None:
+                bugs, action, reason, windowed = _analyze_path(analyzers, file_path, relative_path, large_file_bytes, not fast_tier)
+                cut_short = analyzers.deadline_exceeded
+            else:
+                bugs, action, reason, windowed, file_metrics, cut_short = analyze_isolated(relative_path, file_path)
+                analyzers.merge_metrics(file_metrics)
+            count_classification(reason if action == SKIP else None, reason if action == DOWNGRADE else None)
+            windowed_files += windowed
+            collect(bugs)
+            return bugs
+
+        def analyze_listed(relative_path: str, content_hash: str):
+            nonlocal windowed_files, cut_short
+            cached = file_cache.get(relative_path, content_hash) if file_cache else None
+            if cached is not None:
+                analyzers.merge_metrics(cached['metrics'])
+                count_classification(cached['skipped_reason'], cached['downgraded_reason'])
+                collect(cached['findings'])
+                incremental['cached_files'] += 1
+                return cached['findings']
+
+            file_path = uploaded.get(relative_path)
+            if file_path is None:
+                # Neither cached nor uploaded (e.g. evicted between manifest and upload)
+                incremental['unavailable_files'] += 1
+                return []
+
+            # Analyze in isolation so this file's metric contributions can be cached
+            bugs, action, reason, windowed, file_metrics, cut_short = analyze_isolated(relative_path, file_path)
+            skipped_reason = reason if action == SKIP else None
+            downgraded_reason = reason if action == DOWNGRADE else None
 
-        all_bugs = []
+            # Only full results are cached; a fast-tier result would hide the deep rules, one analyzed
+            # while the spelling index was building would hide spelling findings for good, and
+            # dependency findings change with the advisory database rather than the file
+            cacheable = (not fast_tier and not cut_short and relative_path not in aborted_files
+                         and not file_metrics['content'].get('spelling_unchecked')
+                         and not is_dependency_file(relative_path))
+            if file_cache and cacheable and _file_sha256(file_path) == content_hash:
+                file_cache.put(relative_path, content_hash, bugs, file_metrics, skipped_reason, downgraded_reason)
+
+            analyzers.merge_metrics(file_metrics)
+            count_classification(skipped_reason, downgraded_reason)
+            windowed_files += windowed
+            collect(bugs)
+            incremental['analyzed_files'] += 1
+            return bugs
 
         # Analyze all files
-        for root, dirs, files in os.walk(temp_dir):
-            # Skip node_modules, venv, etc.
-            dirs[:] = [d for d in dirs if d not in ['node_modules', 'venv', '.git', 'dist', 'build', '__pycache__']]
+        with memory.stage('analyze'):
+            # (relative path, path on disk or manifest hash)
+            work = []
+            uploaded = {}
+            for root, dirs, files in os.walk(temp_dir):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    relative_path = os.path.relpath(file_path, temp_dir)
 
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, temp_dir)
+                    if manifest is not None:
+                        uploaded[relative_path.replace(os.sep, '/')] = file_path
+                    else:
+                        work.append((relative_path, file_path))
 
-                # Skip binary files and dependencies
-                if file.endswith(('.pyc', '.png', '.jpg', '.gif', '.svg', '.lock', '.map')):
-                    continue
+            if manifest is not None:
+                incremental = {'cached_files': 0, 'analyzed_files': 0, 'unavailable_files': 0}
+                work = []
+                for relative_path, content_hash in sorted(manifest.items()):
+                    source = matcher.ignored_by(relative_path)
+                    if source:
+                        ignored_files[source] = ignored_files.get(source, 0) + 1
+                    else:
+                        work.append((relative_path, content_hash))
+                analyze_file = analyze_listed
+            else:
+                analyze_file = analyze_uploaded
 
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
+            if only_paths is not None:
+                wanted = set(only_paths)
+                work = [item for item in work if item[0] in wanted]
+
+            if gate_paths is not None:
+                work.sort(key=lambda item: risk_key(item[0], gate_paths))
+                gate = {'stopped_early': False, 'files_scanned': 0, 'files_total': len(work)}
 
-                    # Determine file type and analyze
-                    if file.endswith(('.js', '.jsx', '.ts', '.tsx')):
-                        bugs = frontend_analyzer.analyze_file(relative_path, content)
-                        all_bugs.extend(bugs)
+            elif sample_fraction or sample_seconds:
+                estimator = StratifiedEstimator(relative_path for relative_path, _ in work)
+                sources = dict(work)
+                if sample_fraction:
+                    order = fraction_sample(sources, min(sample_fraction, 1.0), project_id)
+                else:
+                    order = sample_order(sources, project_id)
+                work = [(relative_path, sources[relative_path]) for relative_path in order]
+                if sample_seconds:
+                    sample_deadline = time.monotonic() + sample_seconds
 
-                    if file.endswith(('.py', '.js', '.ts')):
-                        bugs = backend_analyzer.analyze_file(relative_path, content)
-                        all_bugs.extend(bugs)
+            for position, (relative_path, source) in enumerate(work):
+                if sample_deadline is not None and estimator.sampled and time.monotonic() > sample_deadline:
+                    break
 
-                    # Security analysis for all code files
-                    if file.endswith(('.py', '.js', '.ts', '.jsx', '.tsx')):
-                        vulns = security_analyzer.analyze_file(relative_path, content)
-                        all_bugs.extend(vulns)
+                if deadline is not None and time.monotonic() > deadline:
+                    partial, unanalyzed_files = _partial_report(work, position, None, skipped_files)
+                    break
 
-                    # Content analysis for all files
-                    issues = content_analyzer.analyze_file(relative_path, content)
-                    all_bugs.extend(issues)
+                if deadline is not None:
+                    before = analyzers.snapshot_metrics(), dict(skipped_files), dict(downgraded_files)
 
+                try:
+                    bugs = analyze_file(relative_path, source)
                 except Exception as e:
                     print(f"Error analyzing {relative_path}: {e}")
+                    bugs = []
 
-        # Get metrics
-        frontend_metrics = frontend_analyzer.get_metrics()
-        backend_metrics = backend_analyzer.get_metrics()
-        security_metrics = security_analyzer.get_metrics()
-        content_metrics = content_analyzer.get_metrics()
+                if cut_short:
+                    # Out of time between analyzers: report what this file produced and stop, but leave
+                    # it out of the metrics so a resumed run can analyze it whole
+                    analyzers.restore_metrics(before[0])
+                    for counts, earlier in zip((skipped_files, downgraded_files), before[1:]):
+                        counts.clear()
+                        counts.update(earlier)
+                    partial, unanalyzed_files = _partial_report(work, position, relative_path, skipped_files)
+                    if relative_path == retried_file:
+                        # Too slow for a whole run twice: keep what it got to rather than retry it forever
+                        unanalyzed_files = unanalyzed_files[1:]
+                        resumed['incomplete_files'].append(relative_path)
+                    break
 
-        # Calculate score
-        scoring_engine = get_scoring_engine()
-        score, grade, role_level, strengths, weaknesses = scoring_engine.calculate_score(
-            all_bugs,
-            frontend_metrics,
-            backend_metrics,
-            security_metrics,
-            content_metrics
-        )
+                if estimator is not None:
+                    file_bugs = FindingStore.from_dicts(bugs)
+                    values = {severity.lower(): count for severity, count in file_bugs.severity_counts().items()}
+                    values['penalty'] = sum(
+                        scoring_engine.finding_penalty(file_bugs.to_dict(finding)) * finding.count
+                        for finding in file_bugs
+                    )
+                    estimator.record(relative_path, values)
+
+                if gate is not None:
+                    gate['files_scanned'] += 1
+                    # One critical finding makes BLOCKED certain; the rest only refines the report
+                    critical = next((bug for bug in bugs if bug.get('severity') == 'CRITICAL'), None)
+                    if critical is not None and gate['files_scanned'] < gate['files_total']:
+                        gate['stopped_early'] = True
+                        gate['deciding_finding'] = critical
+                        break
+
+        with memory.stage('score'):
+            # Get metrics
+            metrics = analyzers.get_metrics()
+            metrics['files'] = {
+                'skipped': skipped_files,
+                'downgraded': downgraded_files,
+                'aborted': aborted_files,
+                'ignored': ignored_files
+            }
+            frontend_metrics = metrics['frontend']
+            backend_metrics = metrics['backend']
 
-        # Count bugs by severity
-        critical_bugs = len([b for b in all_bugs if b.get('severity') == 'CRITICAL'])
-        high_bugs = len([b for b in all_bugs if b.get('severity') == 'HIGH'])
-        medium_bugs = len([b for b in all_bugs if b.get('severity') == 'MEDIUM'])
-        low_bugs = len([b for b in all_bugs if b.get('severity') == 'LOW'])
+            # Calculate score
+            score, grade, role_level, strengths, weaknesses = scoring_engine.calculate_score(
+                all_bugs,
+                frontend_metrics,
+                backend_metrics,
+                metrics['security'],
+                metrics['content']
+            )
+
+            # Count bugs by severity (aggregates count every occurrence)
+            severity_counts = all_bugs.severity_counts()
+            critical_bugs = severity_counts['CRITICAL']
+            high_bugs = severity_counts['HIGH']
+            medium_bugs = severity_counts['MEDIUM']
+            low_bugs = severity_counts['LOW']
+
+            # Determine deployment status
+            deployment_status = scoring_engine.determine_deployment_status(score, critical_bugs, high_bugs)
+            # Unanalyzed files can still hold critical issues
+            if partial and deployment_status == 'APPROVED':
+                deployment_status = 'CAUTION'
 
-        # Determine deployment status
-        deployment_status = scoring_engine.determine_deployment_status(score, critical_bugs, high_bugs)
+        memory_report = memory.report()
+        memory_report['findings_collapsed'] = collapsed_bugs
+        memory_report['windowed_files'] = windowed_files
+        memory_report['findings_retained'] = len(all_bugs)
+        memory_report['finding_rules'] = len(all_bugs.rules)
+        memory_report['duplicates_merged'] = all_bugs.duplicates_merged
+        memory_report['findings_aggregated'] = all_bugs.findings_aggregated
+
+        sampling = None
+        if estimator is not None:
+            # Extrapolate the sample to the whole codebase
+            estimates = {
+                key: estimator.estimate(key)
+                for key in ('critical', 'high', 'medium', 'low', 'penalty')
+            }
+            provisional = scoring_engine.estimate_score(
+                estimates['penalty'],
+                estimates['critical'],
+                estimates['high'],
+                frontend_metrics,
+                backend_metrics,
+                metrics['security'],
+                metrics['content']
+            )
+            score = provisional['score']
+            grade = provisional['grade']
+            role_level = provisional['role_level']
+            deployment_status = provisional['deployment_status']
+            critical_bugs, high_bugs, medium_bugs, low_bugs = (
+                round(estimates[key]['estimate']) for key in ('critical', 'high', 'medium', 'low')
+            )
+
+            sampling = estimator.summary()
+            sampling.update({
+                'fraction': sample_fraction,
+                'time_budget_seconds': sample_seconds,
+                'confidence': 0.95,
+                'quality_score': {
+                    'estimate': score,
+                    'low': provisional['score_low'],
+                    'high': provisional['score_high']
+                },
+                'bugs': {
+                    key: {bound: round(value, 1) for bound, value in estimates[key].items()}
+                    for key in ('critical', 'high', 'medium', 'low')
+                }
+            })
 
         # Build result
         result = {
@@ -147,32 +658,522 @@ def analyze_codebase(archive_path: str, project_id: str, developer_email: str =
             'high_bugs': high_bugs,
             'medium_bugs': medium_bugs,
             'low_bugs': low_bugs,
-            'total_bugs': len(all_bugs),
-            'bugs': all_bugs,
+            'total_bugs': (
+                critical_bugs + high_bugs + medium_bugs + low_bugs if sampling
+                else all_bugs.total()
+            ),
+            'bugs': all_bugs.to_dicts(),
             'strengths': strengths,
             'weaknesses': weaknesses,
-            'metrics': {
-                'frontend': frontend_metrics,
-                'backend': backend_metrics,
-                'security': security_metrics,
-                'content': content_metrics
-            },
+            'metrics': metrics,
+            'memory': memory_report,
+            'incremental': incremental,
+            'gate': gate,
+            'tier': 'fast' if fast_tier else 'full',
+            'partial': partial,
+            'unanalyzed_files': unanalyzed_files,
+            'resumed': resumed,
+            'estimated': sampling is not None,
+            'sampling': sampling,
+            'config': None if config.is_default else config.summary(),
             'analyzed_at': datetime.utcnow().isoformat()
         }
 
         return result
 
     finally:
+        memory.stop()
+        if sandbox is not None:
+            sandbox.close()
         # Cleanup
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+def analyze_diff(
+    changed_files: List[ChangedFile],
+    contents: Optional[Dict[str, str]] = None,
+    context_lines: Optional[int] = None,
+    ignore_patterns: Optional[List[str]] = None,
+    config: Optional[AnalysisConfig] = None
+) -> Dict[str, Any]:
+    """
+    Analyze only what a diff changes
+
+    Args:
+        changed_files: Parsed diff (head side)
+        contents: Full head-side content per path; files without it are rebuilt from their hunks
+        context_lines: Lines around a change whose findings are kept (default ALICE_DIFF_CONTEXT_LINES)
+        ignore_patterns: Project-level ignore patterns (gitignore syntax)
+        config: Analyzer/rule selection, thresholds and per-analyzer paths
+
+    Returns:
+        Analysis results for the changed lines
+    """
+    context_lines = DIFF_CONTEXT_LINES if context_lines is None else context_lines
+    contents = contents or {}
+
+    analyzers = AnalyzerSet(config=config)
+    all_bugs = FindingStore(RULE_CAP_PER_FILE, RULE_CAP_PER_ANALYSIS)
+    outside_hunks = 0
+    skipped_files = {}
+    ignored_files = {}
+    analyzed_files = 0
+    matcher = build_matcher(ignore_patterns, {
+        path: content for path, content in contents.items() if posixpath.basename(path) == '.gitignore'
+    })
+
+    for changed in changed_files:
+        source = matcher.ignored_by(changed.path)
+        if source:
+            ignored_files[source] = ignored_files.get(source, 0) + 1
+            continue
+
+        try:
+            content = contents.get(changed.path)
+            if content is None:
+                content = changed.reconstruct()
+
+            action, reason = classify_file(os.path.basename(changed.path), content[:8192].encode('utf-8', errors='ignore'))
+            if action == SKIP:
+                skipped_files[reason] = skipped_files.get(reason, 0) + 1
+                continue
+
+            analyzed_files += 1
+            for bug in analyzers.analyze(changed.path, content, action in (DOWNGRADE, DEPENDENCIES)):
+                line_number = bug.get('line_number')
+                # File-level findings only belong to files the diff adds
+                if (changed.touches(line_number, context_lines) if line_number else changed.added):
+                    all_bugs.add(bug)
+                else:
+                    outside_hunks += 1
+
+        except Exception as e:
+            print(f"Error analyzing {changed.path}: {e}")
+
+    metrics = analyzers.get_metrics()
+    metrics['files'] = {'skipped': skipped_files, 'downgraded': {}, 'ignored': ignored_files}
+
+    scoring_engine = get_scoring_engine()
+    score, grade, role_level, strengths, weaknesses = scoring_engine.calculate_score(
+        all_bugs,
+        metrics['frontend'],
+        metrics['backend'],
+        metrics['security'],
+        metrics['content']
+    )
+
+    severity_counts = all_bugs.severity_counts()
+    deployment_status = scoring_engine.determine_deployment_status(
+        score,
+        severity_counts['CRITICAL'],
+        severity_counts['HIGH']
+    )
+
+    return {
+        'quality_score': score,
+        'deployment_status': deployment_status,
+        'changed_files': len(changed_files),
+        'analyzed_files': analyzed_files,
+        'changed_lines': sum(len(changed.changed) for changed in changed_files),
+        'context_lines': context_lines,
+        'critical_bugs': severity_counts['CRITICAL'],
+        'high_bugs': severity_counts['HIGH'],
+        'medium_bugs': severity_counts['MEDIUM'],
+        'low_bugs': severity_counts['LOW'],
+        'total_bugs': all_bugs.total(),
+        'findings_outside_changes': outside_hunks,
+        'bugs': all_bugs.to_dicts(),
+        'metrics': metrics,
+        'analyzed_at': datetime.utcnow().isoformat()
+    }
+
+
+def _spelling_unchecked(result: Dict[str, Any]) -> bool:
+    """Whether comments went unchecked for spelling because this instance's index was still building"""
+    return bool(result['metrics']['content'].get('spelling_unchecked'))
+
+
+def _technical_response(analysis_id: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the technical report returned to the client (no grades/assessments)"""
+    response = {
+        'status': 'success',
+        'analysis_id': analysis_id,
+        'quality_score': result['quality_score'],
+        'deployment_status': result['deployment_status'],
+        'total_files': result['total_files'],
+        'issues': {
+            'critical': result['critical_bugs'],
+            'high': result['high_bugs'],
+            'medium': result['medium_bugs'],
+            'low': result['low_bugs']
+        },
+        'bugs': result['bugs'],
+        'analyzed_at': result['analyzed_at']
+    }
+    if _spelling_unchecked(result):
+        # Analyzing again once the index is ready reports the spelling findings too
+        response['spelling'] = 'unavailable'
+    return response
+
+
+def _find_previous_submission(session, project_id, submission_hash: str,
+                              idempotency_key: Optional[str]) -> Optional[Analysis]:
+    """
+    Find a recent analysis of the same submission
+
+    Args:
+        session: Database session
+        project_id: Project of the submission
+        submission_hash: Fingerprint of the archive contents
+        idempotency_key: Client-supplied retry key, if any
+
+    Returns:
+        Most recent matching analysis within the idempotency window, or None
+    """
+    if IDEMPOTENCY_WINDOW_SECONDS <= 0:
+        return None
+
+    query = session.query(Analysis).filter(
+        Analysis.project_id == project_id,
+        Analysis.analyzed_at >= datetime.utcnow() - timedelta(seconds=IDEMPOTENCY_WINDOW_SECONDS)
+    )
+    if idempotency_key:
+        query = query.filter(Analysis.idempotency_key == idempotency_key)
+    else:
+        query = query.filter(Analysis.submission_hash == submission_hash)
+
+    return query.order_by(Analysis.analyzed_at.desc()).first()
+
+
+def _update_developer(session, result: Dict[str, Any], developer_email: Optional[str],
+                      developer_name: str) -> Optional[Developer]:
+    """Get or create the developer and record their latest grade"""
+    if not developer_email:
+        return None
+
+    developer = session.query(Developer).filter_by(email=developer_email).first()
+    if not developer:
+        developer = Developer(
+            name=developer_name,
+            email=developer_email,
+            current_grade=result['grade'],
+            current_score=result['quality_score'],
+            role_level=result['role_level']
+        )
+        session.add(developer)
+    else:
+        developer.current_grade = result['grade']
+        developer.current_score = result['quality_score']
+        developer.role_level = result['role_level']
+    return developer
+
+
+def _apply_result(analysis: Analysis, result: Dict[str, Any]):
+    """Copy an analysis result onto its Analysis row"""
+    analysis.quality_score = result['quality_score']
+    analysis.grade = result['grade']
+    analysis.role_level = result['role_level']
+    analysis.total_files = result['total_files']
+    analysis.critical_bugs = result['critical_bugs']
+    analysis.high_bugs = result['high_bugs']
+    analysis.medium_bugs = result['medium_bugs']
+    analysis.low_bugs = result['low_bugs']
+    analysis.deployment_status = result['deployment_status']
+    analysis.strengths = result['strengths']
+    analysis.weaknesses = result['weaknesses']
+    # The full unanalyzed list travels with the queued job, not the stored result
+    analysis.raw_data = {key: value for key, value in result.items() if key != 'unanalyzed_files'}
+    analysis.tier = result.get('tier', 'full')
+    if result.get('partial') and analysis.tier == 'full':
+        analysis.tier = 'partial'
+
+
+def _store_bugs(session, analysis_id, bugs: List[Dict[str, Any]]):
+    """Store the findings of an analysis"""
+    for bug in bugs:
+        bug_record = Bug(
+            analysis_id=analysis_id,
+            severity=bug.get('severity', 'LOW'),
+            category=bug.get('category', 'Unknown'),
+            file_path=bug.get('file_path'),
+            line_number=bug.get('line_number'),
+            description=bug.get('description', ''),
+            impact=bug.get('impact', ''),
+            fix_suggestion=bug.get('fix_suggestion', ''),
+            detected_by=bug.get('detected_by'),
+            occurrences=bug.get('occurrences', 1)
+        )
+        session.add(bug_record)
+
+
+def _store_analysis(session, project: Project, result: Dict[str, Any], developer_email: Optional[str],
+                    developer_name: str, submission_hash: Optional[str] = None,
+                    idempotency_key: Optional[str] = None) -> Analysis:
+    """
+    Store an analysis, its bugs and the developer's latest grade (caller commits)
+
+    A fast-tier, gate or partial result links the developer but leaves their grade to the completed analysis.
+    A result without spelling checks is not replayed to retries of the same submission.
+
+    Returns:
+        The flushed Analysis
+    """
+    if result.get('tier') in ('fast', 'gate') or result.get('partial'):
+        developer = session.query(Developer).filter_by(email=developer_email).first() if developer_email else None
+        if developer_email and not developer:
+            developer = Developer(name=developer_name, email=developer_email)
+            session.add(developer)
+            session.flush()
+    else:
+        developer = _update_developer(session, result, developer_email, developer_name)
+
+    if _spelling_unchecked(result):
+        submission_hash = idempotency_key = None
+
+    # Store analysis in database
+    analysis = Analysis(
+        project_id=project.id,
+        developer_id=developer.id if developer else None,
+        submission_hash=submission_hash,
+        idempotency_key=idempotency_key
+    )
+    _apply_result(analysis, result)
+    session.add(analysis)
+    session.flush()
+
+    _store_bugs(session, analysis.id, result['bugs'])
+    return analysis
+
+
+def _send_reports(project_name: str, result: Dict[str, Any], developer_email: Optional[str], developer_name: str):
+    """Email the technical report and management assessment"""
+    email_client = get_email_client()
+
+    # Technical report to developer
+    if developer_email:
+        summary = {
+            'total_files': result['total_files'],
+            'tests_passed': max(0, result['total_files'] - result['critical_bugs']),
+            'tests_failed': result['critical_bugs'],
+            'critical_bugs': result['critical_bugs'],
+            'high_bugs': result['high_bugs'],
+            'medium_bugs': result['medium_bugs']
+        }
+
+        email_client.send_technical_report(
+            developer_email,
+            project_name,
+            result['quality_score'],
+            result['deployment_status'],
+            result['bugs'],
+            summary
+        )
+
+        # Management assessment
+        email_client.send_management_assessment(
+            developer_name,
+            developer_email,
+            project_name,
+            result['grade'],
+            result['quality_score'],
+            result['role_level'],
+            {
+                'total_files': result['total_files'],
+                'critical_bugs': result['critical_bugs'],
+                'high_bugs': result['high_bugs'],
+                'medium_bugs': result['medium_bugs'],
+                'test_failure_rate': (result['critical_bugs'] / max(result['total_files'], 1)) * 100
+            },
+            result['strengths'],
+            result['weaknesses']
+        )
+
+
+def _complete_analysis(archive_path: str, analysis_id, developer_email: Optional[str], developer_name: str,
+                       manifest: Optional[Dict[str, str]], tier: str = 'deep', superseded: str = 'fast_tier',
+                       job_id=None, remaining_files: Optional[List[str]] = None, deadline: Optional[float] = None):
+    """
+    Queued job: run the full analysis behind a provisional (fast-tier, gate or partial) one and update it
+
+    The provisional result stays available as raw_data[superseded]; bugs are replaced by the
+    full set, the developer's grade is updated and the reports are emailed. The job row is
+    deleted in the same transaction as the update.
+
+    A job with remaining_files resumes the stored partial result: only those files are analyzed
+    and merged into it. A run that reaches its deadline stores its progress as a partial result
+    and queues the files it did not reach instead of failing and starting over.
+
+    Args:
+        archive_path: Uploaded archive (deleted when done)
+        analysis_id: Provisional Analysis to update
+        developer_email: Optional developer email
+        developer_name: Developer name
+        manifest: Incremental upload manifest, if any
+        tier: Tier recorded for the completed analysis
+        superseded: raw_data key keeping the provisional result
+        job_id: Queued job being run
+        remaining_files: Files the stored partial result has left (None = analyze the whole archive)
+        deadline: time.monotonic() value after which the run stores what it has and re-queues the rest
+    """
+    session = db_manager.get_session()
+
+    try:
+        analysis = session.query(Analysis).filter_by(id=analysis_id).first()
+        if not analysis:
+            return
+        project = session.query(Project).filter_by(id=analysis.project_id).first()
+
+        config = _project_config(project, archive_path)
+        file_cache = None
+        if manifest is not None:
+            file_cache = FileResultCache(session, project.id, config)
+            file_cache.load(manifest)
+
+        result = analyze_codebase(
+            archive_path, str(project.id), developer_email, manifest=manifest, file_cache=file_cache,
+            deadline=deadline, ignore_patterns=parse_patterns(project.ignore_patterns), config=config,
+            only_paths=remaining_files, previous=analysis.raw_data if remaining_files is not None else None
+        )
+        result['tier'] = tier
+        # An earlier run of this completion already kept the provisional result
+        result[superseded] = analysis.raw_data.get(superseded) or {
+            key: analysis.raw_data.get(key)
+            for key in ('quality_score', 'grade', 'deployment_status', 'critical_bugs', 'high_bugs',
+                        'medium_bugs', 'low_bugs', 'total_bugs', 'bugs', 'analyzed_at')
+        }
+
+        _apply_result(analysis, result)
+        if _spelling_unchecked(result):
+            # Not replayed to retries, as in _store_analysis
+            analysis.submission_hash = analysis.idempotency_key = None
+        session.query(Bug).filter_by(analysis_id=analysis.id).delete(synchronize_session=False)
+        _store_bugs(session, analysis.id, result['bugs'])
+        if job_id is not None:
+            session.query(AnalysisJob).filter_by(id=job_id).delete(synchronize_session=False)
+
+        if result['partial']:
+            # Out of time again: keep the progress and queue what is still left
+            _defer_completion(
+                session, analysis, archive_path, manifest, developer_email, developer_name, tier, superseded,
+                result['unanalyzed_files']
+            )
+            return
+
+        if tier == 'deep':
+            analysis.deep_completed_at = datetime.utcnow()
+        _update_developer(session, result, developer_email, developer_name)
+        session.commit()
+
+        _send_reports(project.name, result, developer_email, developer_name)
+
+    except Exception:
+        session.rollback()
+        raise
+
+    finally:
+        session.close()
+        try:
+            os.unlink(archive_path)
+        except OSError:
+            pass
+
+
+def _defer_completion(session, analysis: Analysis, archive_path: str, manifest: Optional[Dict[str, str]],
+                      developer_email: Optional[str], developer_name: str, tier: str, superseded: str,
+                      remaining_files: Optional[List[str]] = None):
+    """
+    Queue the completion of a provisional analysis and commit it with the analysis
+
+    The job is durable: if this instance is frozen or recycled after responding, the
+    /api/jobs/run drain (Vercel Cron) picks it up. This process starts on it right away.
+    A partial analysis passes its unanalyzed files so the job analyzes only those.
+    """
+    job = job_queue.enqueue(
+        session, analysis.id, archive_path, manifest, developer_email, developer_name, tier, superseded,
+        remaining_files
+    )
+    session.commit()
+    background.submit(_run_job, job.id)
+
+
+def _run_job(job_id=None, deadline: Optional[float] = None) -> bool:
+    """
+    Claim and run one queued job
+
+    Args:
+        job_id: Run only this job (None = the oldest available)
+        deadline: time.monotonic() value the job stops at (default ALICE_ANALYSIS_DEADLINE_SECONDS from the claim)
+
+    Returns:
+        True when a job was claimed
+    """
+    session = db_manager.get_session()
+    try:
+        job = job_queue.claim(session, job_id)
+        if job is None:
+            return False
+        job_id = job.id
+        if deadline is None and ANALYSIS_DEADLINE_SECONDS > 0:
+            deadline = time.monotonic() + ANALYSIS_DEADLINE_SECONDS
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
+        temp_file.write(job.archive)
+        temp_file.close()
+
+        try:
+            _complete_analysis(
+                temp_file.name, job.analysis_id, job.developer_email, job.developer_name,
+                job.manifest, job.tier, job.superseded, job_id, job.remaining_files, deadline
+            )
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            session.rollback()
+            job_queue.release(session, job_id, str(e))
+        return True
+
+    finally:
+        session.close()
+
+
+@app.route('/api/jobs/run', methods=['GET', 'POST'])
+def run_jobs_endpoint():
+    """
+    Drain the deferred-work queue
+
+    Called by Vercel Cron (Authorization: Bearer CRON_SECRET) or an admin (X-Admin-Key).
+    Runs queued jobs, including ones whose instance was frozen mid-run, until none is
+    left or the analysis deadline is near.
+    """
+    cron_secret = os.environ.get('CRON_SECRET')
+    admin_key = os.environ.get('ADMIN_API_KEY')
+    authorized = (
+        (cron_secret and request.headers.get('Authorization') == f'Bearer {cron_secret}')
+        or (admin_key and request.headers.get('X-Admin-Key') == admin_key)
+    )
+    if not authorized:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    started = time.monotonic()
+    # Jobs share the invocation's deadline and store a partial result at it, so none is killed mid-run
+    deadline = started + ANALYSIS_DEADLINE_SECONDS if ANALYSIS_DEADLINE_SECONDS > 0 else None
+    processed = 0
+    # Only start jobs early enough to get somewhere before the deadline
+    while deadline is None or time.monotonic() - started < ANALYSIS_DEADLINE_SECONDS / 2:
+        if not _run_job(deadline=deadline):
+            break
+        processed += 1
+
+    return jsonify({'processed': processed}), 200
+
+
 @app.route('/api/analyze', methods=['POST', 'OPTIONS'])
 def analyze_endpoint():
     """
     Main analysis endpoint
 
-    Accepts: multipart/form-data with code archive
+    Accepts: multipart/form-data with code archive; optional mode=gate answers BLOCKED at the
+        first critical finding (riskiest files first) and completes the full report in the background;
+        mode=sample (with sample_fraction or sample_seconds) returns an estimated, unstored scan
     Returns: Technical report only (no grades)
     """
     # Handle preflight request
@@ -184,6 +1185,9 @@ def analyze_endpoint():
     if not api_key:
         return jsonify({'error': 'API key required'}), 401
 
+    # Stop analyzing in time to store a partial result before the function is killed
+    deadline = time.monotonic() + ANALYSIS_DEADLINE_SECONDS if ANALYSIS_DEADLINE_SECONDS > 0 else None
+
     # Get project from API key
     session = db_manager.get_session()
 
@@ -202,126 +1206,174 @@ def analyze_endpoint():
         developer_email = request.form.get('developer_email')
         developer_name = request.form.get('developer_name', 'Unknown Developer')
 
+        # Incremental upload: the archive only holds files the manifest endpoint reported missing
+        manifest = None
+        file_cache = None
+        if request.form.get('manifest'):
+            try:
+                manifest = validate_manifest(json.loads(request.form['manifest']))
+            except ValueError as e:
+                return jsonify({'error': f'Invalid manifest: {e}'}), 400
+
         # Save uploaded file
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
         archive.save(temp_file.name)
         temp_file.close()
 
-        # Analyze codebase
-        result = analyze_codebase(temp_file.name, str(project.id), developer_email)
-
-        # Get or create developer
-        developer = None
-        if developer_email:
-            developer = session.query(Developer).filter_by(email=developer_email).first()
-            if not developer:
-                developer = Developer(
-                    name=developer_name,
-                    email=developer_email,
-                    current_grade=result['grade'],
-                    current_score=result['quality_score'],
-                    role_level=result['role_level']
-                )
-                session.add(developer)
-            else:
-                developer.current_grade = result['grade']
-                developer.current_score = result['quality_score']
-                developer.role_level = result['role_level']
-
-        # Store analysis in database
-        analysis = Analysis(
-            project_id=project.id,
-            developer_id=developer.id if developer else None,
-            quality_score=result['quality_score'],
-            grade=result['grade'],
-            role_level=result['role_level'],
-            total_files=result['total_files'],
-            critical_bugs=result['critical_bugs'],
-            high_bugs=result['high_bugs'],
-            medium_bugs=result['medium_bugs'],
-            low_bugs=result['low_bugs'],
-            deployment_status=result['deployment_status'],
-            strengths=result['strengths'],
-            weaknesses=result['weaknesses'],
-            raw_data=result
-        )
-        session.add(analysis)
-        session.flush()
-
-        # Store bugs
-        for bug in result['bugs']:
-            bug_record = Bug(
-                analysis_id=analysis.id,
-                severity=bug.get('severity', 'LOW'),
-                category=bug.get('category', 'Unknown'),
-                file_path=bug.get('file_path'),
-                line_number=bug.get('line_number'),
-                description=bug.get('description', ''),
-                impact=bug.get('impact', ''),
-                fix_suggestion=bug.get('fix_suggestion', '')
-            )
-            session.add(bug_record)
+        # Analysis settings: .alice.yml at the archive root, else the project's
+        try:
+            config = _project_config(project, temp_file.name)
+        except (ValueError, zipfile.BadZipFile) as e:
+            return jsonify({'error': str(e)}), 400
 
-        session.commit()
+        if manifest is not None:
+            file_cache = FileResultCache(session, project.id, config)
+            file_cache.load(manifest)
 
-        # Send emails
-        email_client = get_email_client()
+        mode = request.form.get('mode', 'full')
+        if mode not in ('full', 'gate', 'sample', 'tiered'):
+            return jsonify({'error': "mode must be 'full', 'gate', 'sample' or 'tiered'"}), 400
 
-        # Technical report to developer
-        if developer_email:
-            summary = {
-                'total_files': result['total_files'],
-                'tests_passed': max(0, result['total_files'] - result['critical_bugs']),
-                'tests_failed': result['critical_bugs'],
-                'critical_bugs': result['critical_bugs'],
-                'high_bugs': result['high_bugs'],
-                'medium_bugs': result['medium_bugs']
-            }
+        # Retried submissions get the stored analysis back: no re-analysis, re-storage or re-emailing.
+        # Sampled scans are never stored, so they neither replay nor claim a key.
+        idempotency_key = (request.headers.get('Idempotency-Key') or '').strip() or None
+        if idempotency_key and len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            return jsonify({'error': f'Idempotency-Key longer than {MAX_IDEMPOTENCY_KEY_LENGTH} characters'}), 400
+
+        submission_hash = None
+        if mode != 'sample':
+            submission_hash = submission_fingerprint(temp_file.name, developer_email, manifest, mode)
+            previous = _find_previous_submission(session, project.id, submission_hash, idempotency_key)
+            if previous is not None:
+                if previous.submission_hash != submission_hash:
+                    return jsonify({'error': 'Idempotency-Key was already used for a different submission'}), 409
+                response = jsonify(_technical_response(str(previous.id), previous.raw_data))
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response, 200
 
-            email_client.send_technical_report(
+        # Sampling mode: estimated exploratory scan, neither stored nor emailed
+        if mode == 'sample':
+            try:
+                sample_fraction = float(request.form['sample_fraction']) if request.form.get('sample_fraction') else None
+                sample_seconds = float(request.form['sample_seconds']) if request.form.get('sample_seconds') else None
+            except ValueError:
+                return jsonify({'error': 'sample_fraction and sample_seconds must be numbers'}), 400
+            if not sample_fraction and not sample_seconds:
+                sample_fraction = SAMPLE_FRACTION
+            if (sample_fraction is not None and not 0 < sample_fraction <= 1) or (sample_seconds is not None and sample_seconds <= 0):
+                return jsonify({'error': 'sample_fraction must be in (0, 1] and sample_seconds positive'}), 400
+
+            result = analyze_codebase(
+                temp_file.name,
+                str(project.id),
                 developer_email,
-                project.name,
-                result['quality_score'],
-                result['deployment_status'],
-                result['bugs'],
-                summary
+                manifest=manifest,
+                file_cache=file_cache,
+                sample_fraction=sample_fraction,
+                sample_seconds=sample_seconds,
+                deadline=deadline,
+                ignore_patterns=parse_patterns(project.ignore_patterns),
+                config=config
             )
+            session.commit()
+
+            sample_response = _technical_response(None, result)
+            sample_response['estimated'] = True
+            sample_response['sampling'] = result['sampling']
+            return jsonify(sample_response), 200
 
-            # Management assessment
-            email_client.send_management_assessment(
-                developer_name,
+        if mode == 'tiered':
+            # Fast tier answers now; the deep tier updates this Analysis in the background
+            fast_result = analyze_codebase(
+                temp_file.name,
+                str(project.id),
                 developer_email,
-                project.name,
-                result['grade'],
-                result['quality_score'],
-                result['role_level'],
-                {
-                    'total_files': result['total_files'],
-                    'critical_bugs': result['critical_bugs'],
-                    'high_bugs': result['high_bugs'],
-                    'medium_bugs': result['medium_bugs'],
-                    'test_failure_rate': (result['critical_bugs'] / max(result['total_files'], 1)) * 100
-                },
-                result['strengths'],
-                result['weaknesses']
+                manifest=manifest,
+                file_cache=file_cache,
+                fast_tier=True,
+                deadline=deadline,
+                ignore_patterns=parse_patterns(project.ignore_patterns),
+                config=config
+            )
+            analysis = _store_analysis(
+                session, project, fast_result, developer_email, developer_name,
+                submission_hash, idempotency_key
+            )
+            _defer_completion(
+                session, analysis, temp_file.name, manifest, developer_email, developer_name, 'deep', 'fast_tier'
+            )
+
+            fast_response = _technical_response(str(analysis.id), fast_result)
+            fast_response['tier'] = 'fast'
+            fast_response['deep_tier'] = 'pending'
+            return jsonify(fast_response), 200
+
+        # Gate mode: riskiest files first, answer at the first critical finding
+        gate_paths = past_critical_paths(session, project.id) if mode == 'gate' else None
+
+        # Analyze codebase
+        result = analyze_codebase(
+            temp_file.name,
+            str(project.id),
+            developer_email,
+            manifest=manifest,
+            file_cache=file_cache,
+            gate_paths=gate_paths,
+            deadline=deadline,
+            ignore_patterns=parse_patterns(project.ignore_patterns),
+            config=config
+        )
+
+        if result['gate'] and result['gate']['stopped_early']:
+            # The verdict is certain and stored now; the full report is analyzed, stored and emailed by a queued job
+            result['tier'] = 'gate'
+            analysis = _store_analysis(
+                session, project, result, developer_email, developer_name,
+                submission_hash, idempotency_key
             )
+            _defer_completion(
+                session, analysis, temp_file.name, manifest, developer_email, developer_name, 'full', 'gate_verdict'
+            )
+
+            gate_response = _technical_response(str(analysis.id), result)
+            gate_response['quality_score'] = None
+            gate_response['gate'] = result['gate']
+            gate_response['full_report'] = 'pending'
+            return jsonify(gate_response), 200
+
+        if result['partial']:
+            # Out of time: store what was analyzed rather than being killed with nothing
+            complete_remaining = request.form.get('complete_remaining', str(QUEUE_REMAINDER)).lower() == 'true'
+            analysis = _store_analysis(
+                session, project, result, developer_email, developer_name,
+                # An unfinished result must not be replayed to retries
+                submission_hash if complete_remaining else None,
+                idempotency_key if complete_remaining else None
+            )
+            if complete_remaining:
+                _defer_completion(
+                    session, analysis, temp_file.name, manifest, developer_email, developer_name, 'full', 'partial_result',
+                    result['unanalyzed_files']
+                )
+            else:
+                session.commit()
+                _send_reports(project.name, result, developer_email, developer_name)
+
+            partial_response = _technical_response(str(analysis.id), result)
+            partial_response['partial'] = result['partial']
+            partial_response['remaining'] = 'queued' if complete_remaining else 'not analyzed'
+            return jsonify(partial_response), 200
+
+        analysis = _store_analysis(
+            session, project, result, developer_email, developer_name,
+            submission_hash, idempotency_key
+        )
+        session.commit()
+
+        _send_reports(project.name, result, developer_email, developer_name)
 
         # Return technical report only (no grades/assessments)
-        technical_response = {
-            'status': 'success',
-            'analysis_id': str(analysis.id),
-            'quality_score': result['quality_score'],
-            'deployment_status': result['deployment_status'],
-            'total_files': result['total_files'],
-            'issues': {
-                'critical': result['critical_bugs'],
-                'high': result['high_bugs'],
-                'medium': result['medium_bugs'],
-                'low': result['low_bugs']
-            },
-            'bugs': result['bugs'],
-            'analyzed_at': result['analyzed_at']
-        }
+        technical_response = _technical_response(str(analysis.id), result)
 
         return jsonify(technical_response), 200
 
@@ -334,10 +1386,160 @@ def analyze_endpoint():
 
     finally:
         session.close()
-        # Cleanup temp file
+        # Cleanup temp file (queued jobs keep their own copy of the archive)
         try:
             os.unlink(temp_file.name)
         except:
             pass
 
 
+@app.route('/api/analyze/manifest', methods=['POST', 'OPTIONS'])
+def manifest_endpoint():
+    """
+    Incremental upload negotiation
+
+    Accepts: JSON {"files": {relative_path: sha256}}
+    Returns: Hashes the client has to upload (everything else has a cached result)
+    """
+    # Handle preflight request
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    # Verify API key
+    api_key = request.headers.get('X-API-Key')
+    if not api_key:
+        return jsonify({'error': 'API key required'}), 401
+
+    session = db_manager.get_session()
+
+    try:
+        api_key_hash = EncryptionManager.hash_api_key(api_key)
+        project = session.query(Project).filter_by(api_key_hash=api_key_hash).first()
+
+        if not project:
+            return jsonify({'error': 'Invalid API key'}), 401
+
+        data = request.get_json(silent=True) or {}
+        try:
+            manifest = validate_manifest(data.get('files'))
+        except ValueError as e:
+            return jsonify({'error': f'Invalid manifest: {e}'}), 400
+
+        # The client's .alice.yml decides which cached results apply
+        config_text = data.get('config')
+        if config_text is not None and not isinstance(config_text, str):
+            return jsonify({'error': 'config must be the text of .alice.yml'}), 400
+        try:
+            config = _project_config(project, config_text=config_text)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Ignored files are pruned from the analysis, so never ask for them
+        matcher = build_matcher(parse_patterns(project.ignore_patterns))
+        ignored = [path for path in manifest if matcher.ignored_by(path)]
+        for path in ignored:
+            del manifest[path]
+
+        # Results are only ever looked up within the caller's project
+        missing = FileResultCache(session, project.id, config).missing(manifest)
+
+        return jsonify({
+            'missing': missing,
+            'total_files': len(manifest),
+            'ignored_files': len(ignored),
+            'analyzer_version': ANALYZER_VERSION
+        }), 200
+
+    except Exception as e:
+        print(f"Manifest error: {e}")
+        return jsonify({'error': f'Manifest check failed: {str(e)}'}), 500
+
+    finally:
+        session.close()
+
+
+@app.route('/api/analyze/diff', methods=['POST', 'OPTIONS'])
+def diff_endpoint():
+    """
+    Pull-request gate: analyze only the lines a change touches
+
+    Accepts: multipart/form-data with either
+        diff: unified diff (file or field), optionally with archive: zip of the head-side changed files
+        bundle: git bundle, with base and head refs
+    Optional field context_lines overrides ALICE_DIFF_CONTEXT_LINES.
+    Returns: Findings in changed hunks and the deployment status for them (not stored)
+    """
+    # Handle preflight request
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    # Verify API key
+    api_key = request.headers.get('X-API-Key')
+    if not api_key:
+        return jsonify({'error': 'API key required'}), 401
+
+    session = db_manager.get_session()
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        api_key_hash = EncryptionManager.hash_api_key(api_key)
+        project = session.query(Project).filter_by(api_key_hash=api_key_hash).first()
+
+        if not project:
+            return jsonify({'error': 'Invalid API key'}), 401
+
+        try:
+            context_lines = int(request.form['context_lines']) if request.form.get('context_lines') else None
+        except ValueError:
+            return jsonify({'error': 'context_lines must be an integer'}), 400
+
+        contents = {}
+        if 'bundle' in request.files:
+            bundle_path = os.path.join(temp_dir, 'changes.bundle')
+            request.files['bundle'].save(bundle_path)
+            try:
+                diff_text, contents = read_bundle(bundle_path, request.form.get('base'), request.form.get('head'))
+            except ValueError as e:
+                return jsonify({'error': f'Invalid bundle: {e}'}), 400
+
+        elif 'diff' in request.files or request.form.get('diff'):
+            if 'diff' in request.files:
+                diff_text = request.files['diff'].read(MAX_DIFF_BYTES + 1).decode('utf-8', errors='ignore')
+            else:
+                diff_text = request.form['diff']
+            if len(diff_text) > MAX_DIFF_BYTES:
+                return jsonify({'error': 'Diff too large; use /api/analyze'}), 413
+
+            # Full head-side versions of the changed files make analysis exact
+            if 'archive' in request.files:
+                archive_path = os.path.join(temp_dir, 'head.zip')
+                request.files['archive'].save(archive_path)
+                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+                    wanted = {changed.path for changed in parse_unified_diff(diff_text)}
+                    for name in zip_ref.namelist():
+                        if name in wanted:
+                            contents[name] = zip_ref.read(name).decode('utf-8', errors='ignore')
+
+        else:
+            return jsonify({'error': 'No diff or bundle provided'}), 400
+
+        try:
+            config = _project_config(project, config_text=contents.get(CONFIG_FILENAMES[0]))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        result = analyze_diff(
+            parse_unified_diff(diff_text), contents, context_lines,
+            parse_patterns(project.ignore_patterns), config
+        )
+        result['status'] = 'success'
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"Diff analysis error: {e}")
+        return jsonify({'error': f'Diff analysis failed: {str(e)}'}), 500
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        session.close()
@@ -357,6 +357,9 @@ def get_analysis_details(analysis_id: str):
             'strengths': analysis.strengths,
             'weaknesses': analysis.weaknesses,
             'analyzed_at': analysis.analyzed_at.isoformat(),
+            'tier': analysis.tier,
+            'deep_completed_at': analysis.deep_completed_at.isoformat() if analysis.deep_completed_at else None,
+            'fast_tier': (analysis.raw_data or {}).get('fast_tier'),
             'bugs': [{
                 'severity': bug.severity,
                 'category': bug.category,
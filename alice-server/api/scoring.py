@@ -5,8 +5,9 @@ All scoring logic is obfuscated and encrypted (only owner can read)
 """
 
 import os
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from utils.encryption import get_encryption_manager
+from analyzers.findings import FindingStore, Rule
 
 
 class ScoringEngine:
@@ -60,7 +61,7 @@ class ScoringEngine:
 
     def calculate_score(
         self,
-        bugs: List[Dict[str, Any]],
+        bugs: Union[FindingStore, List[Dict[str, Any]]],
         frontend_metrics: Dict[str, Any],
         backend_metrics: Dict[str, Any],
         security_metrics: Dict[str, Any],
@@ -70,7 +71,7 @@ class ScoringEngine:
         Calculate excellence-based quality score
 
         Args:
-            bugs: List of all bugs found
+            bugs: All bugs found (a FindingStore, or finding dicts)
             frontend_metrics: Frontend analysis metrics
             backend_metrics: Backend analysis metrics
             security_metrics: Security analysis metrics
@@ -79,11 +80,68 @@ class ScoringEngine:
         Returns:
             Tuple of (score, grade, role_level, strengths, weaknesses)
         """
-        score = self.BASE_SCORE
+        score, strengths = self._apply_bonuses(frontend_metrics, backend_metrics, security_metrics, content_metrics)
+        weaknesses = []
+
+        # Apply penalties for issues
+        if not isinstance(bugs, FindingStore):
+            bugs = FindingStore.from_dicts(bugs)
+
+        # Penalties depend only on the rule, so each distinct rule is classified once
+        penalties = [self._classify_penalty(rule) for rule in bugs.rules]
+
+        critical_count = 0
+        high_count = 0
+        medium_count = 0
+
+        for finding in bugs:
+            severity, penalty, weakness = penalties[finding.rule_id]
+
+            # Aggregated findings carry every collapsed occurrence
+            if severity == 'CRITICAL':
+                critical_count += finding.count
+            elif severity == 'HIGH':
+                high_count += finding.count
+            elif severity == 'MEDIUM':
+                medium_count += finding.count
+
+            score -= penalty * finding.count
+            if weakness:
+                weaknesses.append(weakness)
+
+        # Ensure score is within bounds
+        score = max(0, min(100, score))
+
+        # Determine grade
+        grade = self._calculate_grade(score)
+
+        # Determine role level based on score
+        role_level = self._determine_role_level(score, critical_count, high_count)
+
+        # Ensure we have at least some feedback
+        if not strengths:
+            strengths.append('Code submitted for review')
+
+        if not weaknesses and score < 85:
+            weaknesses.append('Room for improvement in code quality and best practices')
+
+        return score, grade, role_level, strengths, weaknesses
+
+    def _apply_bonuses(
+        self,
+        frontend_metrics: Dict[str, Any],
+        backend_metrics: Dict[str, Any],
+        security_metrics: Dict[str, Any],
+        content_metrics: Dict[str, Any]
+    ) -> Tuple[int, List[str]]:
+        """
+        Add bonuses for excellence to the base score
 
-        # Track strengths and weaknesses
+        Returns:
+            Tuple of (score before penalties, strengths)
+        """
+        score = self.BASE_SCORE
         strengths = []
-        weaknesses = []
 
         # Apply bonuses for excellence
         if frontend_metrics.get('has_typescript'):
@@ -125,93 +183,108 @@ class ScoringEngine:
             score += self._bonus_weights['clean_architecture']
             strengths.append('Clean architecture with well-organized components')
 
-        # Apply penalties for issues
-        critical_count = 0
-        high_count = 0
-        medium_count = 0
+        return score, strengths
 
-        for bug in bugs:
-            severity = bug.get('severity', 'LOW')
-            category = bug.get('category', '')
+    def finding_penalty(self, bug: Dict[str, Any]) -> int:
+        """Get the score penalty of one finding dict"""
+        rule = Rule(bug.get('severity', 'LOW'), bug.get('category', 'Unknown'), bug.get('description', ''), '', '')
+        return self._classify_penalty(rule)[1]
 
-            if severity == 'CRITICAL':
-                critical_count += 1
+    def estimate_score(
+        self,
+        penalty: Dict[str, float],
+        critical_bugs: Dict[str, float],
+        high_bugs: Dict[str, float],
+        frontend_metrics: Dict[str, Any],
+        backend_metrics: Dict[str, Any],
+        security_metrics: Dict[str, Any],
+        content_metrics: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Provisional score from extrapolated totals (sampling mode)
 
-                # Apply category-specific penalties
-                if 'Infinite Loop' in category or 'crash' in bug.get('description', '').lower():
-                    score -= self._penalty_weights['critical_bug']
-                    weaknesses.append(f'Critical bug found: {category}')
+        Args:
+            penalty: Estimated total penalty (estimate, low, high)
+            critical_bugs: Estimated critical findings (estimate, low, high)
+            high_bugs: Estimated high findings (estimate, low, high)
+            frontend_metrics, backend_metrics, security_metrics, content_metrics: Metrics of the sample
 
-                elif 'XSS' in category or 'injection' in category.lower():
-                    score -= self._penalty_weights['xss_vulnerability']
-                    weaknesses.append(f'Security vulnerability: {category}')
+        Returns:
+            Dict with score, score_low, score_high, grade, role_level and deployment_status
+        """
+        base, _ = self._apply_bonuses(frontend_metrics, backend_metrics, security_metrics, content_metrics)
 
-                elif 'SQL Injection' in category:
-                    score -= self._penalty_weights['sql_injection']
-                    weaknesses.append('SQL injection vulnerability')
+        def bounded(total_penalty: float) -> int:
+            return max(0, min(100, round(base - total_penalty)))
 
-                elif 'Secrets' in category or 'Exposed' in category:
-                    score -= self._penalty_weights['hardcoded_secrets']
-                    weaknesses.append('Hardcoded secrets in source code')
+        score = bounded(penalty['estimate'])
+        critical = round(critical_bugs['estimate'])
+        high = round(high_bugs['estimate'])
 
-                else:
-                    score -= self._penalty_weights['security_vulnerability']
-                    weaknesses.append(f'Critical issue: {category}')
+        return {
+            'score': score,
+            # More penalty means a lower score
+            'score_low': bounded(penalty['high']),
+            'score_high': bounded(penalty['low']),
+            'grade': self._calculate_grade(score),
+            'role_level': self._determine_role_level(score, critical, high),
+            'deployment_status': self.determine_deployment_status(score, critical, high)
+        }
 
-            elif severity == 'HIGH':
-                high_count += 1
+    def _classify_penalty(self, rule: Rule) -> Tuple[str, int, Optional[str]]:
+        """
+        Get the penalty for one finding of a rule
 
-                if 'Error Handling' in category:
-                    score -= self._penalty_weights['no_error_handling_async']
-                    weaknesses.append('Missing error handling in async operations')
+        Args:
+            rule: Rule of the finding
 
-                elif 'Authentication' in category or 'Authorization' in category:
-                    score -= self._penalty_weights['missing_authentication']
-                    weaknesses.append('Authentication/authorization issues')
+        Returns:
+            Tuple of (severity, penalty, weakness or None)
+        """
+        severity = rule.severity
+        category = rule.category
 
-                elif 'Weak Cryptography' in category:
-                    score -= self._penalty_weights['weak_cryptography']
-                    weaknesses.append('Weak cryptographic algorithms used')
+        if severity == 'CRITICAL':
+            # Apply category-specific penalties
+            if 'Infinite Loop' in category or 'crash' in rule.description.lower():
+                return severity, self._penalty_weights['critical_bug'], f'Critical bug found: {category}'
 
-                else:
-                    score -= 15
-                    weaknesses.append(f'High severity issue: {category}')
+            elif 'XSS' in category or 'injection' in category.lower():
+                return severity, self._penalty_weights['xss_vulnerability'], f'Security vulnerability: {category}'
 
-            elif severity == 'MEDIUM':
-                medium_count += 1
+            elif 'SQL Injection' in category:
+                return severity, self._penalty_weights['sql_injection'], 'SQL injection vulnerability'
 
-                if 'Complexity' in category:
-                    score -= self._penalty_weights['high_complexity']
-                    weaknesses.append('High code complexity')
+            elif 'Secrets' in category or 'Exposed' in category:
+                return severity, self._penalty_weights['hardcoded_secrets'], 'Hardcoded secrets in source code'
 
-                elif 'Performance' in category:
-                    score -= self._penalty_weights['performance_issue']
-                    weaknesses.append('Performance issues detected')
+            return severity, self._penalty_weights['security_vulnerability'], f'Critical issue: {category}'
 
-                elif 'Accessibility' in category:
-                    score -= self._penalty_weights['accessibility_violation']
-                    weaknesses.append('Accessibility violations')
+        elif severity == 'HIGH':
+            if 'Error Handling' in category:
+                return severity, self._penalty_weights['no_error_handling_async'], 'Missing error handling in async operations'
 
-                else:
-                    score -= 10
+            elif 'Authentication' in category or 'Authorization' in category:
+                return severity, self._penalty_weights['missing_authentication'], 'Authentication/authorization issues'
 
-        # Ensure score is within bounds
-        score = max(0, min(100, score))
+            elif 'Weak Cryptography' in category:
+                return severity, self._penalty_weights['weak_cryptography'], 'Weak cryptographic algorithms used'
 
-        # Determine grade
-        grade = self._calculate_grade(score)
+            return severity, 15, f'High severity issue: {category}'
 
-        # Determine role level based on score
-        role_level = self._determine_role_level(score, critical_count, high_count)
+        elif severity == 'MEDIUM':
+            if 'Complexity' in category:
+                return severity, self._penalty_weights['high_complexity'], 'High code complexity'
 
-        # Ensure we have at least some feedback
-        if not strengths:
-            strengths.append('Code submitted for review')
+            elif 'Performance' in category:
+                return severity, self._penalty_weights['performance_issue'], 'Performance issues detected'
 
-        if not weaknesses and score < 85:
-            weaknesses.append('Room for improvement in code quality and best practices')
+            elif 'Accessibility' in category:
+                return severity, self._penalty_weights['accessibility_violation'], 'Accessibility violations'
 
-        return score, grade, role_level, strengths, weaknesses
+            return severity, 10, None
+
+        return severity, 0, None
 
     def _calculate_grade(self, score: int) -> str:
         """
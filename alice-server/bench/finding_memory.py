@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+ALICE Finding Memory Benchmark
+Measures retained memory per finding for analyzer dicts versus the compact FindingStore
+
+Usage:
+    python bench/finding_memory.py                    # 50k findings
+    python bench/finding_memory.py --findings 200000 --files 5000 --json
+"""
+
+import os
+import sys
+import json
+import argparse
+import tracemalloc
+from typing import Dict, Any, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SERVER_DIR)
+
+from analyzers.pipeline import AnalyzerSet
+from analyzers.findings import FindingStore
+from bench.golden import list_fixtures
+
+
+def fixture_findings() -> List[Dict[str, Any]]:
+    """Collect the findings of the fixture corpus as a realistic rule mix"""
+    analyzers = AnalyzerSet()
+    findings = []
+
+    for fixture_dir in list_fixtures().values():
+        for root, dirs, files in os.walk(fixture_dir):
+            for file in sorted(files):
+                file_path = os.path.join(root, file)
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+                findings.extend(analyzers.analyze(os.path.relpath(file_path, fixture_dir), content))
+
+    return findings
+
+
+def synthesize(template: List[Dict[str, Any]], count: int, files: int):
+    """
+    Yield fresh finding dicts the way analyzers build them
+
+    Text is copied per finding, as analyzers format description and fix text per match.
+    """
+    for i in range(count):
+        bug = template[i % len(template)]
+        yield {
+            'severity': bug['severity'],
+            'category': bug['category'],
+            'file_path': f'src/module_{i % files}/{os.path.basename(bug["file_path"])}',
+            'line_number': bug['line_number'] + i // len(template),
+            'description': ''.join(list(bug['description'])),
+            'impact': ''.join(list(bug['impact'])),
+            'fix_suggestion': ''.join(list(bug['fix_suggestion']))
+        }
+
+
+def measure(build) -> int:
+    """Get the bytes retained by the object build() returns"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        retained = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del retained
+    return after - before
+
+
+def run(count: int, files: int) -> Dict[str, Any]:
+    """Measure both representations"""
+    template = fixture_findings()
+    if not template:
+        raise SystemExit('Fixture corpus produced no findings')
+
+    dict_bytes = measure(lambda: list(synthesize(template, count, files)))
+
+    def build_store():
+        store = FindingStore()
+        for bug in synthesize(template, count, files):
+            store.add(bug)
+        return store
+
+    store_bytes = measure(build_store)
+
+    return {
+        'findings': count,
+        'files': files,
+        'distinct_templates': len(template),
+        'dict_bytes': dict_bytes,
+        'store_bytes': store_bytes,
+        'dict_bytes_per_finding': round(dict_bytes / count, 1),
+        'store_bytes_per_finding': round(store_bytes / count, 1),
+        'reduction': round(dict_bytes / max(store_bytes, 1), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure memory per finding')
+    parser.add_argument('--findings', type=int, default=50000, help='Findings to synthesize')
+    parser.add_argument('--files', type=int, default=2000, help='Distinct file paths')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    report = run(args.findings, args.files)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['findings']} findings over {report['files']} files "
+          f"({report['distinct_templates']} fixture findings as templates)")
+    print(f"  dicts:        {report['dict_bytes'] / 1e6:8.1f} MB  {report['dict_bytes_per_finding']:7.1f} B/finding")
+    print(f"  FindingStore: {report['store_bytes'] / 1e6:8.1f} MB  {report['store_bytes_per_finding']:7.1f} B/finding")
+    print(f"  reduction:    {report['reduction']}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+/**
+ * Card showing a single report summary.
+ */
+import React from 'react'
+import { Report } from './client'
+
+interface Props {
+  report: Report
+  onOpen: (id: string) => void
+}
+
+function ReportCard({ report, onOpen }: Props) {
+  return (
+    <article className="report-card">
+      <img src={`/thumbnails/${report.id}.png`} />
+      <h2>{report.title}</h2>
+      <button aria-label="Open report" onClick={() => onOpen(report.id)}>Open</button>
+    </article>
+  )
+}
+
+export default React.memo(ReportCard)
@@ -0,0 +1,18 @@
+/**
+ * Typed client for the reporting API.
+ */
+
+export interface Report {
+  id: string
+  title: string
+}
+
+export async function fetchReports(baseUrl: string): Promise<Report[]> {
+  try {
+    const res = await fetch(`${baseUrl}/reports`)
+    return await res.json()
+  } catch (error) {
+    // Surface an empty list and let the caller show a retry banner
+    return []
+  }
+}
@@ -0,0 +1,19 @@
+/**
+ * Formatting helpers shared by the reporting widgets.
+ */
+
+export function formatCurrency(value: number, currency: string): string {
+  try {
+    return new Intl.NumberFormat('en-US', { style: 'currency', currency }).format(value)
+  } catch (error) {
+    return `${value.toFixed(2)} ${currency}`
+  }
+}
+
+export function formatPercent(ratio: number): string {
+  return `${Math.round(ratio * 100)}%`
+}
+
+export function openExternal(url: string): void {
+  window.open(url, '_blank')
+}
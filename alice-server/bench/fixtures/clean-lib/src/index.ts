@@ -0,0 +1,6 @@
+/**
+ * Public entry point for the reporting widgets.
+ */
+export { formatCurrency, formatPercent } from './format'
+export { fetchReports } from './client'
+export { default as ReportCard } from './ReportCard'
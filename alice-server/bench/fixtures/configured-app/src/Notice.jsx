@@ -0,0 +1,7 @@
+export function renderNotice(container, html) {
+  container.innerHTML = html
+}
+
+export default function Notice({ message }) {
+  return <p className="notice">{message}</p>
+}
@@ -0,0 +1,7 @@
+export function renderOldNotice(container, html) {
+  container.innerHTML = html
+}
+
+export default function OldNotice({ message }) {
+  return <p className="old-notice">{message}</p>
+}
@@ -0,0 +1,19 @@
+// Database helpers shared by the order service
+const { Pool } = require('pg')
+
+const pool = new Pool({ connectionString: process.env.DATABASE_URL })
+
+async function findUser(username) {
+  const result = await pool.query('SELECT * FROM users WHERE name = $1', [username])
+  return result.rows[0]
+}
+
+function query(sql, callback) {
+  return pool.query(sql, callback)
+}
+
+function raw(sql) {
+  return pool.query(sql)
+}
+
+module.exports = { findUser, query, raw }
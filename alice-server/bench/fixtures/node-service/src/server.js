@@ -0,0 +1,67 @@
+/**
+ * Order service entry point.
+ * Exposes the public order API and a couple of admin routes.
+ */
+const express = require('express')
+const multer = require('multer')
+const jwt = require('jsonwebtoken')
+const crypto = require('crypto')
+const fs = require('fs')
+const { exec } = require('child_process')
+const db = require('./db')
+
+const app = express()
+const upload = multer({ dest: 'uploads/' })
+
+const secret = 'order-service-signing-secret'
+
+app.use((req, res, next) => {
+  res.header('Access-Control-Allow-Origin', '*')
+  next()
+})
+
+// Issue a session token for the user
+app.post('/login', async (req, res) => {
+  const user = await db.findUser(req.body.username)
+  const token = jwt.sign({ id: user.id }, secret)
+  res.json({ token })
+})
+
+app.get('/orders/:id', (req, res) => {
+  db.query('SELECT * FROM orders WHERE id = ' + req.params.id, (err, rows) => {
+    res.json(rows)
+  })
+})
+
+app.get('/orders', (req, res) => {
+  db.query(`SELECT * FROM orders WHERE customer = '${req.query.customer}'`)
+    .then(rows => res.json(rows))
+})
+
+app.post('/avatar', upload.single('avatar'), (req, res) => {
+  res.json({ ok: true })
+})
+
+app.get('/invoice/:name', (req, res) => {
+  fs.readFile('./invoices/' + req.params.name, (err, data) => res.send(data))
+})
+
+app.post('/admin/cleanup', (req, res) => {
+  db.raw('DELETE FROM sessions')
+  res.json({ ok: true })
+})
+
+app.get('/export', (req, res) => {
+  exec('tar czf /tmp/export.tgz ' + req.query.dir, () => res.send('ok'))
+})
+
+// Generate a one time nonce for the checkout form
+function checkoutNonce() {
+  return Math.random().toString(36).slice(2)
+}
+
+function legacyChecksum(body) {
+  return crypto.createHash('md5').update(body).digest('hex')
+}
+
+module.exports = { app, checkoutNonce, legacyChecksum }
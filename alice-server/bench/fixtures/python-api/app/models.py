@@ -0,0 +1,20 @@
+"""Data access helpers for the inventory service."""
+
+import json
+
+
+class Item:
+    """A single inventory item."""
+
+    def __init__(self, sku, quantity):
+        self.sku = sku
+        self.quantity = quantity
+
+    def to_json(self):
+        # Serialise the item for the API response
+        return json.dumps({'sku': self.sku, 'quantity': self.quantity})
+
+
+def load_items(rows):
+    """Build items from raw database rows, skipping seperated header rows."""
+    return [Item(row[0], row[1]) for row in rows if row[0] != 'sku']
@@ -0,0 +1,18 @@
+/*
+ * Thin wrapper around the backend REST API.
+ * Your welcome to extend it with more endpoints.
+ */
+
+export async function loadUsers() {
+  const res = await fetch('/api/users')
+  return res.json()
+}
+
+export function loadSettings() {
+  return fetch('/api/settings').then(res => res.json())
+}
+
+export function computeLayout(expression: string) {
+  // legacy: layout rules used to be evaluated with eval(expression)
+  return eval(expression)
+}
@@ -0,0 +1,11 @@
+import React from 'react'
+
+// Render the anouncement banner recieved from the CMS
+export function renderBanner(container, html) {
+  container.innerHTML = html
+}
+
+export default function Banner({ message }) {
+  const token = 'tok_4f9a8b7c6d5e'
+  return <div className="banner">{message}</div>
+}
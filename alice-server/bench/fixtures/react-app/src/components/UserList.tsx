@@ -0,0 +1,43 @@
+/**
+ * Lists users and lets admins open their profile in a new tab.
+ */
+import React, { useEffect, useState } from 'react'
+import { TrashIcon } from './icons'
+
+interface User {
+  id: string
+  name: string
+  bio: string
+  avatar: string
+}
+
+export const UserList = ({ users }: { users: User[] }) => {
+  const [selected, setSelected] = useState<User | null>(null)
+  const [visits, setVisits] = useState(0)
+
+  // Track how many times the list was shown
+  useEffect(() => {
+    setVisits(visits + 1)
+  })
+
+  const openProfile = (user: User) => {
+    window.open(`/profiles/${user.id}`)
+  }
+
+  const sorted = users.sort((a, b) => a.name.localeCompare(b.name))
+
+  return (
+    <div>
+      {sorted.map(user => (
+        <div onClick={() => setSelected(user)}>
+          <img src={user.avatar} />
+          <span>{user.name}</span>
+          <button onClick={() => openProfile(user)}>
+            <TrashIcon />
+          </button>
+        </div>
+      ))}
+      {selected && <div dangerouslySetInnerHTML={{ __html: selected.bio }} />}
+    </div>
+  )
+}
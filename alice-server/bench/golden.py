@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+ALICE Golden Output Harness
+Runs analyzer engine variants over the fixture corpus and diffs them against recorded goldens
+
+Usage:
+    python bench/golden.py check                      # serial engine vs goldens, windowed vs whole-file scans
+    python bench/golden.py check --engine parallel    # any registered engine
+    python bench/golden.py check --engine mymod:run   # any callable(archive_path) -> result
+    python bench/golden.py record                     # re-record goldens from the serial engine
+"""
+
+import os
+import sys
+import json
+import argparse
+import importlib
+import tempfile
+import zipfile
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, Any, List, Callable
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SERVER_DIR)
+
+# Scoring only needs a key to construct its encryption manager
+if not os.environ.get('ENCRYPTION_KEY'):
+    from cryptography.fernet import Fernet
+    os.environ['ENCRYPTION_KEY'] = Fernet.generate_key().decode()
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+GOLDENS_DIR = os.path.join(BENCH_DIR, 'goldens')
+
+# Fixture repos living outside bench/fixtures
+EXTRA_FIXTURES = {
+    'test-project': os.path.join(os.path.dirname(SERVER_DIR), 'test-project'),
+}
+
+METRIC_SECTIONS = ('frontend', 'backend', 'security', 'content')
+
+# Large files built from fixture files and scanned both whole and in windows, which must
+# report the same findings: name -> (source files, repeats, window bytes, overlap bytes)
+WINDOWED_FIXTURES = {
+    'windowed-test-project': (
+        [os.path.join(EXTRA_FIXTURES['test-project'], name) for name in ('bad-api.js', 'BadComponent.jsx')],
+        40, 16 * 1024, 2 * 1024
+    ),
+}
+
+# Metric keys that vary between runs (timings, memory samples)
+VOLATILE_SUFFIXES = ('_ms', '_seconds', '_bytes')
+
+
+def _serial_engine(archive_path: str) -> Dict[str, Any]:
+    """Reference engine: the production analyze_codebase, with the fixture's .alice.yml applied"""
+    from api.analyze import analyze_codebase, _project_config
+    config = _project_config(SimpleNamespace(analysis_config=None), archive_path)
+    return analyze_codebase(archive_path, 'golden', config=config)
+
+
+ENGINES: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    'serial': _serial_engine,
+}
+
+
+def resolve_engine(name: str) -> Callable[[str], Dict[str, Any]]:
+    """
+    Resolve an engine by registered name or "module:callable" spec
+
+    Args:
+        name: Engine name
+
+    Returns:
+        Callable taking an archive path and returning an analysis result
+    """
+    if name in ENGINES:
+        return ENGINES[name]
+
+    if ':' not in name:
+        raise SystemExit(f"Unknown engine '{name}'. Registered: {', '.join(sorted(ENGINES))}")
+
+    module_name, attr = name.split(':', 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def list_fixtures() -> Dict[str, str]:
+    """Get fixture name -> directory for the whole corpus"""
+    fixtures = {name: path for name, path in EXTRA_FIXTURES.items() if os.path.isdir(path)}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        path = os.path.join(FIXTURES_DIR, name)
+        if os.path.isdir(path):
+            fixtures[name] = path
+    return fixtures
+
+
+def build_archive(fixture_dir: str) -> str:
+    """Zip a fixture directory the way the SDK uploads it (deterministic member order)"""
+    handle, archive_path = tempfile.mkstemp(suffix='.zip')
+    os.close(handle)
+
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for root, dirs, files in os.walk(fixture_dir):
+            dirs.sort()
+            for file in sorted(files):
+                file_path = os.path.join(root, file)
+                zf.write(file_path, os.path.relpath(file_path, fixture_dir))
+
+    return archive_path
+
+
+def normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an analysis result to its deterministic, order-independent parts
+
+    Args:
+        result: analyze_codebase result
+
+    Returns:
+        Normalized golden record
+    """
+    bugs = sorted(
+        result.get('bugs', []),
+        key=lambda b: (
+            b.get('file_path') or '', b.get('line_number') or 0, b.get('category', ''),
+            b.get('severity', ''), b.get('description', '')
+        )
+    )
+
+    metrics = {}
+    for section in METRIC_SECTIONS:
+        values = result.get('metrics', {}).get(section, {})
+        metrics[section] = {
+            key: value for key, value in sorted(values.items())
+            if not key.endswith(VOLATILE_SUFFIXES)
+        }
+
+    return {
+        'score': {
+            'quality_score': result['quality_score'],
+            'grade': result['grade'],
+            'role_level': result['role_level'],
+            'strengths': sorted(result['strengths']),
+            'weaknesses': sorted(result['weaknesses'])
+        },
+        'summary': {
+            key: result[key] for key in (
+                'deployment_status', 'total_files', 'total_bugs',
+                'critical_bugs', 'high_bugs', 'medium_bugs', 'low_bugs'
+            )
+        },
+        'metrics': metrics,
+        'bugs': bugs
+    }
+
+
+def diff_records(expected: Dict[str, Any], actual: Dict[str, Any]) -> List[str]:
+    """
+    Diff two normalized records
+
+    Returns:
+        Human readable differences (empty when identical)
+    """
+    differences = []
+
+    for section in ('score', 'summary'):
+        for key in sorted(set(expected[section]) | set(actual[section])):
+            if expected[section].get(key) != actual[section].get(key):
+                differences.append(
+                    f'{section}.{key}: expected {expected[section].get(key)!r}, got {actual[section].get(key)!r}'
+                )
+
+    for section in METRIC_SECTIONS:
+        want = expected['metrics'].get(section, {})
+        got = actual['metrics'].get(section, {})
+        for key in sorted(set(want) | set(got)):
+            if want.get(key) != got.get(key):
+                differences.append(f'metrics.{section}.{key}: expected {want.get(key)!r}, got {got.get(key)!r}')
+
+    want_bugs = Counter(json.dumps(b, sort_keys=True) for b in expected['bugs'])
+    got_bugs = Counter(json.dumps(b, sort_keys=True) for b in actual['bugs'])
+    for bug in sorted((want_bugs - got_bugs).elements()):
+        differences.append(f'missing bug: {bug}')
+    for bug in sorted((got_bugs - want_bugs).elements()):
+        differences.append(f'extra bug: {bug}')
+
+    return differences
+
+
+def run_fixture(engine: Callable[[str], Dict[str, Any]], fixture_dir: str) -> Dict[str, Any]:
+    """Run one engine over one fixture and normalize the result"""
+    archive_path = build_archive(fixture_dir)
+    try:
+        return normalize_result(engine(archive_path))
+    finally:
+        os.unlink(archive_path)
+
+
+def check_windowed(name: str, sources: List[str], repeats: int, window_bytes: int, overlap_bytes: int) -> List[str]:
+    """
+    Scan a large file whole and in overlapping windows and diff the findings
+
+    Windows never parse, so the whole-file scan keeps to the regex rules too.
+
+    Returns:
+        Human readable differences (empty when identical)
+    """
+    from analyzers.pipeline import AnalyzerSet
+    from utils.chunked_reader import iter_windows
+
+    parts = []
+    for source in sources:
+        with open(source, 'r', encoding='utf-8') as f:
+            parts.append(f.read() + '\n')
+    content = ''.join(parts) * repeats
+
+    handle, file_path = tempfile.mkstemp(suffix='.js')
+    with os.fdopen(handle, 'w', encoding='utf-8') as f:
+        f.write(content)
+    try:
+        relative_path = f'{name}.js'
+        whole = AnalyzerSet().analyze(relative_path, content, use_ast=False)
+        windowed = AnalyzerSet().analyze_windows(relative_path, iter_windows(file_path, window_bytes, overlap_bytes))
+    finally:
+        os.unlink(file_path)
+
+    want_bugs = Counter(json.dumps(b, sort_keys=True) for b in whole)
+    got_bugs = Counter(json.dumps(b, sort_keys=True) for b in windowed)
+    differences = [f'missing bug: {bug}' for bug in sorted((want_bugs - got_bugs).elements())]
+    differences.extend(f'extra bug: {bug}' for bug in sorted((got_bugs - want_bugs).elements()))
+    return differences
+
+
+def golden_path(name: str) -> str:
+    return os.path.join(GOLDENS_DIR, f'{name}.json')
+
+
+def record(fixtures: Dict[str, str]) -> int:
+    """Record goldens from the serial engine"""
+    os.makedirs(GOLDENS_DIR, exist_ok=True)
+    for name, fixture_dir in fixtures.items():
+        record_data = run_fixture(ENGINES['serial'], fixture_dir)
+        with open(golden_path(name), 'w') as f:
+            json.dump(record_data, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"✓ {name}: {record_data['summary']['total_bugs']} bugs, score {record_data['score']['quality_score']}")
+    return 0
+
+
+def check(fixtures: Dict[str, str], engine_name: str) -> int:
+    """Diff an engine against the recorded goldens"""
+    engine = resolve_engine(engine_name)
+    failures = 0
+
+    for name, fixture_dir in fixtures.items():
+        if not os.path.exists(golden_path(name)):
+            print(f"? {name}: no golden recorded (run: python bench/golden.py record)")
+            failures += 1
+            continue
+
+        with open(golden_path(name)) as f:
+            expected = json.load(f)
+
+        differences = diff_records(expected, run_fixture(engine, fixture_dir))
+        if differences:
+            failures += 1
+            print(f"✗ {name} [{engine_name}]: {len(differences)} difference(s)")
+            for line in differences:
+                print(f"    {line}")
+        else:
+            print(f"✓ {name} [{engine_name}]")
+
+    for name, spec in WINDOWED_FIXTURES.items():
+        if not all(os.path.exists(source) for source in spec[0]):
+            continue
+        differences = check_windowed(name, *spec)
+        if differences:
+            failures += 1
+            print(f"✗ {name} [windowed vs whole file]: {len(differences)} difference(s)")
+            for line in differences[:20]:
+                print(f"    {line}")
+        else:
+            print(f"✓ {name} [windowed vs whole file]")
+
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ALICE golden output harness')
+    parser.add_argument('command', choices=['check', 'record'])
+    parser.add_argument('--engine', default='serial', help='Registered engine name or module:callable')
+    parser.add_argument('--fixture', action='append', help='Limit to fixture name (repeatable)')
+    args = parser.parse_args()
+
+    fixtures = list_fixtures()
+    if args.fixture:
+        unknown = set(args.fixture) - set(fixtures)
+        if unknown:
+            raise SystemExit(f"Unknown fixture(s): {', '.join(sorted(unknown))}")
+        fixtures = {name: fixtures[name] for name in args.fixture}
+
+    # Analyzers skip spelling while the index builds in the background; build it up front instead
+    from analyzers.spell_checker import load_spell_checker
+    load_spell_checker()
+
+    if args.command == 'record':
+        sys.exit(record(fixtures))
+    sys.exit(check(fixtures, args.engine))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+ALICE Load Test
+Drives /api/analyze uploads and dashboard reads concurrently and reports throughput,
+latency percentiles, error rates and database connection usage
+
+Usage:
+    # In-process via the Flask test clients (needs DATABASE_URL pointing at a local Postgres)
+    python bench/loadtest.py --api-key alice_xxx --admin-key admin_xxx --concurrency 8 --requests 200
+
+    # Against a running server
+    python bench/loadtest.py --url http://localhost:5000 --api-key alice_xxx --admin-key admin_xxx
+
+    # Replay a recorded, anonymized trace
+    python bench/loadtest.py --replay trace.jsonl --api-key alice_xxx --admin-key admin_xxx
+
+Every upload gets a unique nonce file added to its archive, so the server's idempotent
+replay (an identical submission within ALICE_IDEMPOTENCY_WINDOW_SECONDS) never answers
+it and each upload is a real analysis. Replayed responses would be counted as "replays".
+
+Trace format (one JSON object per line, no code or credentials):
+    {"t": 0.0, "kind": "analyze", "archive_kb": 256}
+    {"t": 0.4, "kind": "read", "path": "/api/dashboard/stats"}
+"""
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import argparse
+import threading
+import zipfile
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SERVER_DIR)
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+
+READ_PATHS = ['/api/dashboard/stats', '/api/developers']
+
+
+def build_archive(size_kb: int) -> bytes:
+    """
+    Build an upload archive of roughly size_kb of source, cycling through the fixture corpus
+
+    Args:
+        size_kb: Target uncompressed source size in KB
+
+    Returns:
+        Zip archive bytes
+    """
+    sources = []
+    for root, dirs, files in os.walk(FIXTURES_DIR):
+        dirs.sort()
+        for file in sorted(files):
+            path = os.path.join(root, file)
+            with open(path, 'rb') as f:
+                sources.append((os.path.relpath(path, FIXTURES_DIR), f.read()))
+
+    buffer = io.BytesIO()
+    written = 0
+    copy = 0
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        while written < size_kb * 1024:
+            for name, data in sources:
+                zf.writestr(f'copy{copy}/{name}', data)
+                written += len(data)
+                if written >= size_kb * 1024:
+                    break
+            copy += 1
+
+    return buffer.getvalue()
+
+
+def with_nonce(archive: bytes) -> bytes:
+    """
+    Copy an archive with a unique nonce file added, making its submission fingerprint unique
+
+    Args:
+        archive: Zip archive bytes
+
+    Returns:
+        Zip archive bytes
+    """
+    buffer = io.BytesIO(archive)
+    buffer.seek(0, io.SEEK_END)
+    with zipfile.ZipFile(buffer, 'a') as zf:
+        zf.writestr('loadtest-nonce.txt', uuid.uuid4().hex)
+    return buffer.getvalue()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class InProcessTarget:
+    """Sends requests through the Flask test clients of api/analyze.py and api/reports.py"""
+
+    def __init__(self):
+        from api import analyze, reports
+        self.analyze_app = analyze.app
+        self.reports_app = reports.app
+        self.db_managers = [analyze.db_manager, reports.db_manager]
+
+    def request(self, method: str, path: str, headers: Dict[str, str],
+                archive: Optional[bytes] = None) -> Tuple[int, bytes, Dict[str, str]]:
+        app = self.analyze_app if path.startswith('/api/analyze') else self.reports_app
+        client = app.test_client()
+        if archive is not None:
+            response = client.open(
+                path, method=method, headers=headers,
+                data={'archive': (io.BytesIO(archive), 'code.zip')},
+                content_type='multipart/form-data'
+            )
+        else:
+            response = client.open(path, method=method, headers=headers)
+        return response.status_code, response.get_data(), dict(response.headers)
+
+    def pool_checked_out(self) -> Optional[int]:
+        """Connections currently checked out of the SQLAlchemy pools"""
+        return sum(manager.engine.pool.checkedout() for manager in self.db_managers)
+
+
+class HttpTarget:
+    """Sends requests to a running ALICE server over HTTP"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method: str, path: str, headers: Dict[str, str],
+                archive: Optional[bytes] = None) -> Tuple[int, bytes, Dict[str, str]]:
+        body = None
+        headers = dict(headers)
+        if archive is not None:
+            boundary = uuid.uuid4().hex
+            body = (
+                f'--{boundary}\r\n'
+                'Content-Disposition: form-data; name="archive"; filename="code.zip"\r\n'
+                'Content-Type: application/zip\r\n\r\n'
+            ).encode() + archive + f'\r\n--{boundary}--\r\n'.encode()
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=300) as response:
+                return response.status, response.read(), dict(response.headers)
+        except urllib.error.HTTPError as e:
+            return e.code, e.read(), dict(e.headers)
+
+    def pool_checked_out(self) -> Optional[int]:
+        return None
+
+
+class DatabaseMonitor:
+    """Samples connection usage while the load runs"""
+
+    def __init__(self, target, database_url: Optional[str], interval: float = 0.05):
+        self.target = target
+        self.database_url = database_url
+        self.interval = interval
+        self.pool_samples: List[int] = []
+        self.server_samples: List[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        conn = None
+        if self.database_url:
+            import psycopg2
+            try:
+                conn = psycopg2.connect(self.database_url)
+                conn.autocommit = True
+            except psycopg2.Error as e:
+                print(f"⚠️  Not sampling server connections: {e}")
+
+        try:
+            while not self._stop.is_set():
+                checked_out = self.target.pool_checked_out()
+                if checked_out is not None:
+                    self.pool_samples.append(checked_out)
+
+                if conn is not None:
+                    with conn.cursor() as cursor:
+                        # Exclude the monitor's own connection
+                        cursor.execute(
+                            "SELECT count(*) - 1 FROM pg_stat_activity WHERE datname = current_database()"
+                        )
+                        self.server_samples.append(cursor.fetchone()[0])
+
+                self._stop.wait(self.interval)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {}
+        if self.pool_samples:
+            summary['pool_checked_out_peak'] = max(self.pool_samples)
+            summary['pool_checked_out_mean'] = round(sum(self.pool_samples) / len(self.pool_samples), 2)
+        if self.server_samples:
+            summary['server_connections_peak'] = max(self.server_samples)
+            summary['server_connections_mean'] = round(sum(self.server_samples) / len(self.server_samples), 2)
+        return summary
+
+
+def synthetic_workload(total: int, write_ratio: float, archive_sizes: List[int], seed: int) -> List[Dict[str, Any]]:
+    """Closed-loop workload: request specs without timing"""
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(total):
+        if rng.random() < write_ratio:
+            workload.append({'kind': 'analyze', 'archive_kb': rng.choice(archive_sizes)})
+        else:
+            workload.append({'kind': 'read', 'path': rng.choice(READ_PATHS)})
+    return workload
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Load a recorded trace sorted by offset"""
+    with open(path) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return sorted(entries, key=lambda e: e.get('t', 0))
+
+
+def run_load(target, workload: List[Dict[str, Any]], concurrency: int, api_key: str, admin_key: str,
+             paced: bool = False, speed: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Execute a workload and collect one sample per request
+
+    Args:
+        target: InProcessTarget or HttpTarget
+        workload: Request specs (with "t" offsets when paced)
+        concurrency: Worker threads
+        api_key: Project API key for uploads
+        admin_key: Admin key for dashboard reads
+        paced: Honor the "t" offsets (replay mode) instead of running closed-loop
+        speed: Replay speed multiplier
+
+    Returns:
+        Samples with kind, status, latency and start offset
+    """
+    archives: Dict[int, bytes] = {}
+    for spec in workload:
+        if spec['kind'] == 'analyze' and spec['archive_kb'] not in archives:
+            archives[spec['archive_kb']] = build_archive(spec['archive_kb'])
+
+    samples = []
+    samples_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def execute(spec):
+        if paced:
+            delay = spec.get('t', 0) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+        if spec['kind'] == 'analyze':
+            method, path, headers = 'POST', '/api/analyze', {'X-API-Key': api_key}
+            archive = with_nonce(archives[spec['archive_kb']])
+        else:
+            method, path, headers, archive = 'GET', spec['path'], {'X-Admin-Key': admin_key}, None
+
+        begin = time.perf_counter()
+        try:
+            status, _, response_headers = target.request(method, path, headers, archive)
+            replayed = response_headers.get('Idempotent-Replayed') == 'true'
+            error = None
+        except Exception as e:
+            status, replayed, error = 0, False, str(e)
+        latency = time.perf_counter() - begin
+
+        with samples_lock:
+            samples.append({
+                'kind': spec['kind'],
+                'path': path,
+                'archive_kb': spec.get('archive_kb'),
+                'status': status,
+                'replayed': replayed,
+                'error': error,
+                'latency': latency,
+                'offset': begin - started
+            })
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(execute, workload))
+
+    return samples
+
+
+def summarize(samples: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles and error rates overall and per request kind"""
+    def stats(group):
+        latencies = sorted(s['latency'] * 1000 for s in group)
+        errors = [s for s in group if s['status'] == 0 or s['status'] >= 400]
+        status_counts: Dict[str, int] = {}
+        for s in group:
+            status_counts[str(s['status'])] = status_counts.get(str(s['status']), 0) + 1
+        return {
+            'requests': len(group),
+            'throughput_rps': round(len(group) / wall_seconds, 2) if wall_seconds else 0,
+            'p50_ms': round(percentile(latencies, 50), 1),
+            'p95_ms': round(percentile(latencies, 95), 1),
+            'p99_ms': round(percentile(latencies, 99), 1),
+            'max_ms': round(latencies[-1], 1) if latencies else 0,
+            'error_rate': round(len(errors) / len(group), 4) if group else 0,
+            'replays': sum(1 for s in group if s.get('replayed')),
+            'status_counts': status_counts
+        }
+
+    summary = {'wall_seconds': round(wall_seconds, 2), 'overall': stats(samples)}
+    for kind in sorted({s['kind'] for s in samples}):
+        summary[kind] = stats([s for s in samples if s['kind'] == kind])
+    return summary
+
+
+def print_summary(summary: Dict[str, Any]):
+    print("=" * 78)
+    print("ALICE Load Test Results")
+    print("=" * 78)
+    print(f"Wall time: {summary['wall_seconds']}s")
+    print()
+    print(f"{'kind':<10}{'reqs':>7}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>9}")
+    for kind in ['overall'] + [k for k in ('analyze', 'read') if k in summary]:
+        s = summary[kind]
+        print(f"{kind:<10}{s['requests']:>7}{s['throughput_rps']:>9}{s['p50_ms']:>10}{s['p95_ms']:>10}"
+              f"{s['p99_ms']:>10}{s['max_ms']:>10}{s['error_rate'] * 100:>8.1f}%")
+    print()
+    print(f"Status codes: {summary['overall']['status_counts']}")
+    if summary['overall']['replays']:
+        print(f"⚠️  {summary['overall']['replays']} idempotent replays (not analyses) in the latencies")
+    if summary.get('database'):
+        print(f"Database: {summary['database']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ALICE endpoint load test')
+    parser.add_argument('--url', help='Base URL of a running server (default: in-process test clients)')
+    parser.add_argument('--api-key', default=os.environ.get('ALICE_API_KEY'), help='Project API key for uploads')
+    parser.add_argument('--admin-key', default=os.environ.get('ADMIN_API_KEY'), help='Admin key for dashboard reads')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=100, help='Total requests (synthetic mode)')
+    parser.add_argument('--write-ratio', type=float, default=0.2, help='Fraction of requests that are uploads')
+    parser.add_argument('--archive-kb', type=int, action='append', help='Archive source size in KB (repeatable)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--replay', help='Replay a recorded JSONL trace, honoring its timing')
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed multiplier')
+    parser.add_argument('--record-trace', help='Write the executed requests as an anonymized JSONL trace')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help='Postgres URL for sampling server-side connection counts')
+    parser.add_argument('--json', help='Write the summary as JSON to this path')
+    args = parser.parse_args()
+
+    if not args.api_key or not args.admin_key:
+        raise SystemExit('Both --api-key and --admin-key (or ALICE_API_KEY / ADMIN_API_KEY) are required')
+
+    target = HttpTarget(args.url) if args.url else InProcessTarget()
+
+    if args.replay:
+        workload = load_trace(args.replay)
+    else:
+        workload = synthetic_workload(args.requests, args.write_ratio, args.archive_kb or [64], args.seed)
+
+    monitor = DatabaseMonitor(target, args.database_url)
+    monitor.start()
+    started = time.perf_counter()
+    try:
+        samples = run_load(
+            target, workload, args.concurrency, args.api_key, args.admin_key,
+            paced=bool(args.replay), speed=args.speed
+        )
+    finally:
+        wall_seconds = time.perf_counter() - started
+        monitor.stop()
+
+    summary = summarize(samples, wall_seconds)
+    summary['database'] = monitor.summary()
+    print_summary(summary)
+
+    if args.record_trace:
+        with open(args.record_trace, 'w') as f:
+            for sample in sorted(samples, key=lambda s: s['offset']):
+                entry = {'t': round(sample['offset'], 3), 'kind': sample['kind']}
+                if sample['kind'] == 'analyze':
+                    entry['archive_kb'] = sample['archive_kb']
+                else:
+                    entry['path'] = sample['path']
+                f.write(json.dumps(entry) + '\n')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Spelling Index Script
+Builds the memory-mapped spelling index from the word lists in data/spelling/
+so serverless instances do not build it on their first request; --check fails
+when the index is missing or stale (run it before deploying)
+"""
+
+import argparse
+import sys
+import time
+
+from analyzers.spell_checker import (
+    DICTIONARY_PATH, SPELLING_INDEX_PATH, TECHNICAL_TERMS_PATH, build_index, verify_index
+)
+
+
+def check(args) -> bool:
+    """Whether the index is current for the word lists (instances skip spelling until it is)"""
+    try:
+        verify_index(args.index, args.dictionary, args.technical)
+    except (OSError, ValueError) as e:
+        print(f"❌ {args.index} is not a current spelling index ({e}); run: python build_spelling_index.py")
+        return False
+    print(f"✅ {args.index} is current")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the spelling index for the content analyzer')
+    parser.add_argument('--index', default=SPELLING_INDEX_PATH, help=f'Index file (default: {SPELLING_INDEX_PATH})')
+    parser.add_argument('--dictionary', default=DICTIONARY_PATH, help='Word frequency list')
+    parser.add_argument('--technical', default=TECHNICAL_TERMS_PATH, help='Technical vocabulary')
+    parser.add_argument('--check', action='store_true', help='Only verify the index is current (exit 1 if not)')
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check(args) else 1)
+
+    print("🔵 Building spelling index...")
+    started = time.perf_counter()
+    try:
+        entries = build_index(args.index, args.dictionary, args.technical)
+    except Exception as e:
+        print(f"❌ Build failed: {e}")
+        sys.exit(1)
+
+    print(f"✅ Wrote {entries} entries to {args.index} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ALICE Spelling Index")
+    print("=" * 60)
+    main()
@@ -0,0 +1,3 @@
+-- Analyzers that reported a merged finding
+-- Idempotent: safe to run on databases created before or after this change
+ALTER TABLE bugs ADD COLUMN IF NOT EXISTS detected_by VARCHAR(20)[];
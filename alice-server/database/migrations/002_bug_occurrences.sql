@@ -0,0 +1,3 @@
+-- Number of findings an aggregated (per-rule capped) finding stands for
+-- Idempotent: safe to run on databases created before or after this change
+ALTER TABLE bugs ADD COLUMN IF NOT EXISTS occurrences INTEGER DEFAULT 1;
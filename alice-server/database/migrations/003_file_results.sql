@@ -0,0 +1,18 @@
+-- Cached per-file results for incremental (manifest) uploads
+-- Idempotent: safe to run on databases created before or after this change
+CREATE TABLE IF NOT EXISTS file_results (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    file_path VARCHAR(500) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    analyzer_version VARCHAR(20) NOT NULL,
+    findings JSONB,
+    metrics JSONB,
+    skipped_reason VARCHAR(30),
+    downgraded_reason VARCHAR(30),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_file_results_key UNIQUE (project_id, file_path, content_hash, analyzer_version)
+);
+
+CREATE INDEX IF NOT EXISTS idx_file_results_hash ON file_results(project_id, analyzer_version, content_hash);
@@ -0,0 +1,7 @@
+-- Submission fingerprint and client idempotency key for reusing stored analyses
+-- Idempotent: safe to run on databases created before or after this change
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS submission_hash VARCHAR(64);
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(255);
+
+CREATE INDEX IF NOT EXISTS idx_analyses_submission ON analyses(project_id, submission_hash);
+CREATE INDEX IF NOT EXISTS idx_analyses_idempotency ON analyses(project_id, idempotency_key);
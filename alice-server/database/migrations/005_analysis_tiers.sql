@@ -0,0 +1,4 @@
+-- Tier of a stored analysis and when its deferred deep tier finished
+-- Idempotent: safe to run on databases created before or after this change
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS tier VARCHAR(10) DEFAULT 'full';
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS deep_completed_at TIMESTAMP;
@@ -0,0 +1,3 @@
+-- Extra paths to prune from analysis, one gitignore-syntax pattern per line
+-- Idempotent: safe to run on databases created before or after this change
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS ignore_patterns TEXT;
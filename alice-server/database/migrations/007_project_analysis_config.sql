@@ -0,0 +1,3 @@
+-- Analyzer/rule selection, thresholds and per-analyzer paths (same keys as .alice.yml)
+-- Idempotent: safe to run on databases created before or after this change
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS analysis_config JSONB;
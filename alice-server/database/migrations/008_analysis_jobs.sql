@@ -0,0 +1,19 @@
+-- Durable queue of deferred work (deep tier, full report after a gate verdict, remaining files)
+-- Idempotent: safe to run on databases created before or after this change
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    analysis_id UUID NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    tier VARCHAR(10) NOT NULL,
+    superseded VARCHAR(30) NOT NULL,
+    archive BYTEA NOT NULL,
+    manifest JSONB,
+    developer_email VARCHAR(255),
+    developer_name VARCHAR(255),
+    status VARCHAR(10) DEFAULT 'pending',
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    claimed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON analysis_jobs(status, created_at);
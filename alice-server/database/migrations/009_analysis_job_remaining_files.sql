@@ -0,0 +1,3 @@
+-- Files a queued job still has to analyze when it resumes a partial result (NULL = the whole archive)
+-- Idempotent: safe to run on databases created before or after this change
+ALTER TABLE analysis_jobs ADD COLUMN IF NOT EXISTS remaining_files JSONB;
@@ -6,8 +6,8 @@ SQLAlchemy ORM models for PostgreSQL
 from datetime import datetime
 from typing import List, Optional
 from sqlalchemy import (
-    Column, String, Integer, DateTime, DECIMAL, ARRAY, Text,
-    ForeignKey, create_engine, JSON
+    Column, String, Integer, DateTime, DECIMAL, ARRAY, Text, LargeBinary,
+    ForeignKey, UniqueConstraint, create_engine, JSON
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
@@ -24,6 +24,10 @@ class Project(Base):
     name = Column(String(255), nullable=False)
     api_key = Column(String(255), unique=True, nullable=False)
     api_key_hash = Column(String(64), unique=True, nullable=False)
+    # Extra paths to prune from analysis, one gitignore-syntax pattern per line
+    ignore_patterns = Column(Text)
+    # Analyzer/rule selection, thresholds and per-analyzer paths (same keys as .alice.yml)
+    analysis_config = Column(JSONB)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -66,6 +70,10 @@ class Analysis(Base):
     strengths = Column(ARRAY(Text))
     weaknesses = Column(ARRAY(Text))
     raw_data = Column(JSONB)
+    submission_hash = Column(String(64))  # fingerprint of the uploaded contents and recipient
+    idempotency_key = Column(String(255))  # client-supplied Idempotency-Key header
+    tier = Column(String(10), default='full')  # full, fast (deep tier pending), deep, partial (deadline hit) or gate (fail-fast verdict, full report pending)
+    deep_completed_at = Column(DateTime)
     analyzed_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
@@ -101,12 +109,54 @@ class Bug(Base):
     description = Column(Text, nullable=False)
     impact = Column(Text)
     fix_suggestion = Column(Text)
+    detected_by = Column(ARRAY(String(20)))  # analyzers that reported it: frontend, backend, security, content
+    occurrences = Column(Integer, default=1)  # >1 for findings aggregated past the per-rule cap
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     analysis = relationship('Analysis', back_populates='bugs')
 
 
+class FileResult(Base):
+    """Cached per-file analysis result for incremental (manifest) uploads"""
+    __tablename__ = 'file_results'
+    __table_args__ = (
+        UniqueConstraint('project_id', 'file_path', 'content_hash', 'analyzer_version', name='uq_file_results_key'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    file_path = Column(String(500), nullable=False)
+    content_hash = Column(String(64), nullable=False)  # sha256 of the file bytes
+    analyzer_version = Column(String(20), nullable=False)
+    findings = Column(JSONB)
+    metrics = Column(JSONB)  # per-section metric contributions of this file
+    skipped_reason = Column(String(30))
+    downgraded_reason = Column(String(30))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AnalysisJob(Base):
+    """Deferred work completing a stored provisional analysis; the row is deleted with the update it makes"""
+    __tablename__ = 'analysis_jobs'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    analysis_id = Column(UUID(as_uuid=True), ForeignKey('analyses.id', ondelete='CASCADE'), nullable=False)
+    tier = Column(String(10), nullable=False)  # tier recorded for the completed analysis
+    superseded = Column(String(30), nullable=False)  # raw_data key keeping the provisional result
+    archive = Column(LargeBinary, nullable=False)
+    manifest = Column(JSONB)
+    remaining_files = Column(JSONB)  # files left by a partial result (None = the whole archive)
+    developer_email = Column(String(255))
+    developer_name = Column(String(255))
+    status = Column(String(10), default='pending')  # pending, running or failed
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    claimed_at = Column(DateTime)
+
+
 class DatabaseManager:
     """Database connection and session management"""
 
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Advisory Import Script
+Builds the offline advisory database from OSV exports
+(https://osv-vulnerabilities.storage.googleapis.com/npm/all.zip, .../PyPI/all.zip)
+"""
+
+import argparse
+import sys
+
+from utils.advisory_db import ADVISORY_DB_PATH, import_advisories
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import OSV advisories for the dependency check')
+    parser.add_argument('sources', nargs='+', help='OSV zip exports, directories or JSON files')
+    parser.add_argument('--db', default=ADVISORY_DB_PATH, help=f'Database file (default: {ADVISORY_DB_PATH})')
+    args = parser.parse_args()
+
+    print("🔵 Importing advisories...")
+    try:
+        counts = import_advisories(args.sources, args.db)
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        sys.exit(1)
+
+    print(f"✅ Imported {counts['advisories']} advisories ({counts['ranges']} affected ranges) into {args.db}")
+    if counts['skipped']:
+        print(f"   Skipped {counts['skipped']} withdrawn advisories or advisories without npm/PyPI ranges")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ALICE Advisory Import")
+    print("=" * 60)
+    main()
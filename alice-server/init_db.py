@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """
 Database Initialization Script
-Runs the schema.sql to create all tables, indexes, and triggers
+Runs the schema.sql to create all tables, indexes, and triggers, then the
+migrations in database/migrations/ (each is idempotent)
+
+Usage:
+    python init_db.py            # new database: schema and migrations
+    python init_db.py --migrate  # existing database: migrations only
 """
 
 import os
@@ -9,8 +14,20 @@ import sys
 import psycopg2
 from psycopg2 import sql
 
-def init_database():
-    """Initialize the database with schema.sql"""
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'database', 'migrations')
+
+
+def apply_migrations(cursor):
+    """Run every migration file in name order"""
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if name.endswith('.sql'):
+            with open(os.path.join(MIGRATIONS_DIR, name), 'r') as f:
+                cursor.execute(f.read())
+            print(f"   ✓ {name}")
+
+
+def init_database(migrate_only: bool = False):
+    """Initialize the database with schema.sql, or bring an existing one up to date"""
 
     # Get database URL from environment
     database_url = os.environ.get('DATABASE_URL')
@@ -37,10 +54,13 @@ def init_database():
         cursor = conn.cursor()
 
         print("✅ Connected to database")
-        print("🔵 Creating tables, indexes, and triggers...")
 
-        # Execute schema
-        cursor.execute(schema_sql)
+        if not migrate_only:
+            print("🔵 Creating tables, indexes, and triggers...")
+            cursor.execute(schema_sql)
+
+        print("🔵 Applying migrations...")
+        apply_migrations(cursor)
 
         print("✅ Database initialized successfully!")
         print("\n📊 Checking created tables:")
@@ -71,4 +91,4 @@ if __name__ == "__main__":
     print("=" * 60)
     print("ALICE Database Initialization")
     print("=" * 60)
-    init_database()
+    init_database(migrate_only='--migrate' in sys.argv[1:])
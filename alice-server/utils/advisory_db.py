@@ -0,0 +1,378 @@
+"""
+ALICE Advisory Database
+Offline store of OSV-format vulnerability advisories in an indexed SQLite file.
+Affected version ranges are precomputed as intervals of sortable version keys,
+so a dependency lookup is one indexed query per batch of package names.
+"""
+
+import io
+import json
+import math
+import os
+import sqlite3
+import threading
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.version_keys import NPM, PYPI, normalize_package, version_key
+
+# Advisory database read by the dependency check (absent = dependency files are not checked);
+# relative paths are relative to alice-server/
+ADVISORY_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    os.environ.get('ALICE_ADVISORY_DB', os.path.join('data', 'advisories.db'))
+)
+
+# Ecosystems imported and looked up
+ECOSYSTEMS = (NPM, PYPI)
+
+# Package names per lookup query
+LOOKUP_BATCH_SIZE = 500
+
+# Bytes of the database file mapped into memory
+MMAP_BYTES = 256 * 1024 * 1024
+
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE advisories (
+    id INTEGER PRIMARY KEY,
+    osv_id TEXT UNIQUE NOT NULL,
+    aliases TEXT,
+    summary TEXT,
+    severity TEXT NOT NULL
+);
+-- Affected interval [low, high) or [low, high]; low '' = every version, high NULL = unbounded
+CREATE TABLE ranges (
+    ecosystem TEXT NOT NULL,
+    package TEXT NOT NULL,
+    advisory_id INTEGER NOT NULL REFERENCES advisories(id),
+    low TEXT NOT NULL,
+    high TEXT,
+    high_inclusive INTEGER NOT NULL,
+    fixed TEXT
+);
+CREATE INDEX idx_ranges_package ON ranges(ecosystem, package);
+"""
+
+_CVSS3_WEIGHTS = {
+    'AV': {'N': 0.85, 'A': 0.62, 'L': 0.55, 'P': 0.2},
+    'AC': {'L': 0.77, 'H': 0.44},
+    'UI': {'N': 0.85, 'R': 0.62},
+    'C': {'H': 0.56, 'L': 0.22, 'N': 0.0},
+    'I': {'H': 0.56, 'L': 0.22, 'N': 0.0},
+    'A': {'H': 0.56, 'L': 0.22, 'N': 0.0},
+}
+
+
+class Advisory:
+    """One advisory affecting a dependency"""
+
+    __slots__ = ('osv_id', 'aliases', 'summary', 'severity', 'fixed')
+
+    def __init__(self, osv_id: str, aliases: List[str], summary: str, severity: str, fixed: Optional[str]):
+        self.osv_id = osv_id
+        self.aliases = aliases
+        self.summary = summary
+        self.severity = severity
+        self.fixed = fixed
+
+
+def cvss3_base_score(vector: str) -> Optional[float]:
+    """
+    Compute the CVSS v3.x base score of a vector string
+
+    Args:
+        vector: e.g. CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H
+
+    Returns:
+        Base score, or None if the vector is not CVSS v3
+    """
+    if not vector.startswith('CVSS:3'):
+        return None
+    try:
+        metrics = dict(part.split(':', 1) for part in vector.split('/')[1:])
+        changed = metrics['S'] == 'C'
+        privileges = {'N': 0.85, 'L': 0.68 if changed else 0.62, 'H': 0.5 if changed else 0.27}[metrics['PR']]
+        impact_base = 1 - ((1 - _CVSS3_WEIGHTS['C'][metrics['C']])
+                           * (1 - _CVSS3_WEIGHTS['I'][metrics['I']])
+                           * (1 - _CVSS3_WEIGHTS['A'][metrics['A']]))
+        exploitability = (8.22 * _CVSS3_WEIGHTS['AV'][metrics['AV']] * _CVSS3_WEIGHTS['AC'][metrics['AC']]
+                          * privileges * _CVSS3_WEIGHTS['UI'][metrics['UI']])
+    except (KeyError, ValueError):
+        return None
+
+    if changed:
+        impact = 7.52 * (impact_base - 0.029) - 3.25 * (impact_base - 0.02) ** 15
+    else:
+        impact = 6.42 * impact_base
+    if impact <= 0:
+        return 0.0
+    score = min((impact + exploitability) * (1.08 if changed else 1), 10)
+    # CVSS rounds up to one decimal
+    return math.ceil(score * 10 - 1e-9) / 10
+
+
+def advisory_severity(advisory: Dict[str, Any]) -> str:
+    """
+    Map an OSV advisory to a finding severity
+
+    Uses the database-specific rating (GitHub advisories), then a CVSS v3 vector;
+    advisories without either are MEDIUM.
+    """
+    rating = str((advisory.get('database_specific') or {}).get('severity') or '').upper()
+    if rating == 'MODERATE':
+        rating = 'MEDIUM'
+    if rating in SEVERITIES:
+        return rating
+
+    for severity in advisory.get('severity') or []:
+        score = cvss3_base_score(str(severity.get('score', '')))
+        if score is not None:
+            if score >= 9.0:
+                return 'CRITICAL'
+            if score >= 7.0:
+                return 'HIGH'
+            if score >= 4.0:
+                return 'MEDIUM'
+            return 'LOW'
+    return 'MEDIUM'
+
+
+def affected_intervals(ecosystem: str, affected: Dict[str, Any]) -> List[Tuple[str, Optional[str], bool, Optional[str]]]:
+    """
+    Precompute the affected version intervals of one OSV 'affected' entry
+
+    Args:
+        ecosystem: NPM or PYPI
+        affected: OSV affected entry
+
+    Returns:
+        (low key, high key or None, high inclusive, fixed version) tuples
+    """
+    intervals = []
+    for version_range in affected.get('ranges') or []:
+        if version_range.get('type') not in ('SEMVER', 'ECOSYSTEM'):
+            continue
+
+        events = []
+        for event in version_range.get('events') or []:
+            for kind in ('introduced', 'fixed', 'last_affected'):
+                if kind in event:
+                    version = str(event[kind])
+                    key = '' if kind == 'introduced' and version == '0' else version_key(ecosystem, version)
+                    if key is not None:
+                        events.append((key, kind, version))
+        events.sort(key=lambda event: event[0])
+
+        low = None
+        for key, kind, version in events:
+            if kind == 'introduced':
+                if low is None:
+                    low = key
+            elif low is not None:
+                intervals.append((low, key, kind == 'last_affected', version if kind == 'fixed' else None))
+                low = None
+        if low is not None:
+            intervals.append((low, None, False, None))
+
+    if not intervals:
+        # Advisories with only git ranges still list the affected releases
+        for version in affected.get('versions') or []:
+            key = version_key(ecosystem, str(version))
+            if key is not None:
+                intervals.append((key, key, True, None))
+    return intervals
+
+
+def _iter_osv_documents(source: str) -> Iterator[Dict[str, Any]]:
+    """Yield advisories from an OSV zip export, a directory of JSON files or one JSON file"""
+    def parse(stream) -> Iterator[Dict[str, Any]]:
+        data = json.load(stream)
+        if isinstance(data, list):
+            yield from (item for item in data if isinstance(item, dict))
+        elif isinstance(data, dict):
+            yield data
+
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.endswith('.json'):
+                    with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                        yield from parse(f)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source, 'r') as zip_ref:
+            for name in sorted(zip_ref.namelist()):
+                if name.endswith('.json'):
+                    with zip_ref.open(name) as f:
+                        yield from parse(io.TextIOWrapper(f, encoding='utf-8'))
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            yield from parse(f)
+
+
+def import_advisories(sources: Iterable[str], db_path: str = ADVISORY_DB_PATH) -> Dict[str, int]:
+    """
+    Build the advisory database from local OSV exports
+
+    The database is written next to db_path and moved into place when complete,
+    so running analyses keep reading the previous version until then.
+
+    Args:
+        sources: OSV zip exports (e.g. npm/all.zip), directories or JSON files
+        db_path: Database file to replace
+
+    Returns:
+        Counts of imported advisories, ranges and skipped advisories
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    temp_path = f'{db_path}.importing'
+    if os.path.exists(temp_path):
+        os.unlink(temp_path)
+
+    counts = {'advisories': 0, 'ranges': 0, 'skipped': 0}
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.executescript(_SCHEMA)
+        for source in sources:
+            for advisory in _iter_osv_documents(source):
+                osv_id = advisory.get('id')
+                if not osv_id or advisory.get('withdrawn'):
+                    counts['skipped'] += 1
+                    continue
+
+                rows = []
+                for affected in advisory.get('affected') or []:
+                    package = affected.get('package') or {}
+                    ecosystem = package.get('ecosystem')
+                    if ecosystem not in ECOSYSTEMS or not package.get('name'):
+                        continue
+                    name = normalize_package(ecosystem, package['name'])
+                    for low, high, inclusive, fixed in affected_intervals(ecosystem, affected):
+                        rows.append((ecosystem, name, low, high, int(inclusive), fixed))
+                if not rows:
+                    counts['skipped'] += 1
+                    continue
+
+                cursor = connection.execute(
+                    'INSERT OR IGNORE INTO advisories (osv_id, aliases, summary, severity) VALUES (?, ?, ?, ?)',
+                    (osv_id, json.dumps(advisory.get('aliases') or []),
+                     (advisory.get('summary') or advisory.get('details') or '')[:300], advisory_severity(advisory))
+                )
+                if not cursor.rowcount:
+                    # Same advisory in two exports
+                    continue
+                advisory_id = cursor.lastrowid
+                connection.executemany(
+                    'INSERT INTO ranges (ecosystem, package, advisory_id, low, high, high_inclusive, fixed) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [(ecosystem, name, advisory_id, low, high, inclusive, fixed)
+                     for ecosystem, name, low, high, inclusive, fixed in rows]
+                )
+                counts['advisories'] += 1
+                counts['ranges'] += len(rows)
+
+        connection.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', [
+            ('imported_at', datetime.utcnow().isoformat()),
+            ('advisories', str(counts['advisories']))
+        ])
+        connection.commit()
+        connection.execute('ANALYZE')
+        connection.execute('VACUUM')
+    finally:
+        connection.close()
+
+    os.replace(temp_path, db_path)
+    return counts
+
+
+class AdvisoryDB:
+    """Read-only, memory-mapped view of the advisory database"""
+
+    def __init__(self, db_path: str = ADVISORY_DB_PATH):
+        """
+        Open the database
+
+        Args:
+            db_path: Database file built by import_advisories()
+        """
+        self.db_path = db_path
+        uri = 'file:' + os.path.abspath(db_path).replace('?', '%3f') + '?mode=ro&immutable=1'
+        self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._connection.execute(f'PRAGMA mmap_size={MMAP_BYTES}')
+        self._lock = threading.Lock()
+        meta = dict(self._connection.execute('SELECT key, value FROM meta'))
+        self.imported_at = meta.get('imported_at')
+
+    def lookup(self, ecosystem: str, dependencies: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Advisory]]:
+        """
+        Find advisories affecting dependencies
+
+        Args:
+            ecosystem: NPM or PYPI
+            dependencies: (package name, exact version) pairs
+
+        Returns:
+            (name, version) -> advisories, for affected dependencies only
+        """
+        keyed = {}
+        for name, version in dependencies:
+            key = version_key(ecosystem, version)
+            if key is not None:
+                keyed.setdefault(normalize_package(ecosystem, name), []).append((name, version, key))
+        if not keyed:
+            return {}
+
+        names = sorted(keyed)
+        rows = []
+        with self._lock:
+            for i in range(0, len(names), LOOKUP_BATCH_SIZE):
+                batch = names[i:i + LOOKUP_BATCH_SIZE]
+                rows.extend(self._connection.execute(
+                    'SELECT r.package, r.low, r.high, r.high_inclusive, r.fixed, a.osv_id, a.aliases, a.summary, a.severity '
+                    'FROM ranges r JOIN advisories a ON a.id = r.advisory_id '
+                    f'WHERE r.ecosystem = ? AND r.package IN ({",".join("?" * len(batch))})',
+                    [ecosystem, *batch]
+                ))
+
+        found: Dict[Tuple[str, str], Dict[str, Advisory]] = {}
+        for package, low, high, inclusive, fixed, osv_id, aliases, summary, severity in rows:
+            for name, version, key in keyed[package]:
+                if key < low or (high is not None and (key > high or (key == high and not inclusive))):
+                    continue
+                advisories = found.setdefault((name, version), {})
+                if osv_id not in advisories:
+                    advisories[osv_id] = Advisory(osv_id, json.loads(aliases or '[]'), summary, severity, fixed)
+        return {dependency: list(advisories.values()) for dependency, advisories in found.items()}
+
+    def close(self):
+        self._connection.close()
+
+
+_advisory_db = None
+_advisory_db_state = None
+_advisory_db_lock = threading.Lock()
+
+
+def get_advisory_db() -> Optional[AdvisoryDB]:
+    """Get the process's advisory database (None when none has been imported)"""
+    global _advisory_db, _advisory_db_state
+    try:
+        stat = os.stat(ADVISORY_DB_PATH)
+    except OSError:
+        return None
+    # Reopened after a re-import, and not shared with forked sandbox workers
+    state = (os.getpid(), stat.st_ino, stat.st_mtime_ns)
+    if _advisory_db is not None and _advisory_db_state == state:
+        return _advisory_db
+    with _advisory_db_lock:
+        if _advisory_db is None or _advisory_db_state != state:
+            try:
+                _advisory_db = AdvisoryDB(ADVISORY_DB_PATH)
+                _advisory_db_state = state
+            except sqlite3.Error as e:
+                print(f"Advisory database unavailable: {e}")
+                return None
+    return _advisory_db
@@ -0,0 +1,46 @@
+"""
+ALICE Background Jobs
+Runs follow-up work (full reports after a fast verdict) after the response is sent
+
+This is best effort: a serverless instance may be frozen or recycled once it has
+responded. Work that must happen is queued in the database (utils/job_queue.py)
+and only started here; the /api/jobs/run drain finishes whatever is lost.
+"""
+
+import os
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Concurrent background jobs per server process
+BACKGROUND_WORKERS = int(os.environ.get('ALICE_BACKGROUND_WORKERS', 2))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _run(job: Callable, *args, **kwargs):
+    try:
+        return job(*args, **kwargs)
+    except Exception as e:
+        print(f"Background job {getattr(job, '__name__', job)} failed: {e}")
+        traceback.print_exc()
+
+
+def submit(job: Callable, *args, **kwargs) -> Future:
+    """
+    Run a job on the background pool
+
+    Jobs must open their own database session; the request's session is closed
+    once the response is sent. Failures are logged, not raised.
+
+    Args:
+        job: Function to run
+        *args, **kwargs: Passed to job
+
+    Returns:
+        Future of the job
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max(BACKGROUND_WORKERS, 1), thread_name_prefix='alice-job')
+    return _executor.submit(_run, job, *args, **kwargs)
@@ -0,0 +1,95 @@
+"""
+ALICE Chunked Reader
+Memory-maps large files and yields overlapping, line-aligned text windows
+"""
+
+import mmap
+import os
+from typing import Iterator, Tuple
+
+DEFAULT_WINDOW_BYTES = 1024 * 1024
+DEFAULT_OVERLAP_BYTES = 8 * 1024
+
+# (text, first_line, owned_first_line, owned_last_line)
+Window = Tuple[str, int, int, int]
+
+
+def _owned_end(mm: mmap.mmap, start: int, window_bytes: int, size: int) -> int:
+    """Get the end of the block owned from start: the last newline within the window, or the window edge"""
+    limit = start + window_bytes
+    if limit >= size:
+        return size
+    newline = mm.rfind(b'\n', start, limit)
+    return newline + 1 if newline >= 0 else limit
+
+
+def _context_start(mm: mmap.mmap, owned_start: int, overlap_bytes: int) -> int:
+    """Get the first line boundary at most overlap_bytes before owned_start"""
+    lower = max(0, owned_start - overlap_bytes)
+    if lower == 0:
+        return 0
+    newline = mm.find(b'\n', lower - 1, owned_start)
+    return newline + 1 if newline >= 0 else lower
+
+
+def _context_end(mm: mmap.mmap, owned_end: int, overlap_bytes: int, size: int) -> int:
+    """Get the last line boundary at most overlap_bytes after owned_end"""
+    upper = min(size, owned_end + overlap_bytes)
+    if upper == size:
+        return size
+    newline = mm.rfind(b'\n', owned_end, upper)
+    return newline + 1 if newline >= 0 else upper
+
+
+def iter_windows(file_path: str, window_bytes: int = DEFAULT_WINDOW_BYTES,
+                 overlap_bytes: int = DEFAULT_OVERLAP_BYTES) -> Iterator[Window]:
+    """
+    Memory-map a file and yield it as overlapping text windows
+
+    Each window owns a line-aligned block of about window_bytes and carries up to
+    overlap_bytes of whole lines before and after it as context, so a rule whose match
+    plus look-around fits in the overlap sees exactly what a whole-file scan sees.
+    Line numbers come from an incremental newline counter; only the current window is
+    ever copied out of the mapping, so memory stays constant in the file size.
+
+    Args:
+        file_path: Path to file
+        window_bytes: Owned block size
+        overlap_bytes: Context carried on each side
+
+    Yields:
+        (text, first_line, owned_first_line, owned_last_line) with 1-based line numbers.
+        Consecutive windows share a boundary line only when a single line is longer
+        than the window.
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        owned_start = 0
+        owned_line = 1
+
+        while owned_start < size:
+            owned_end = _owned_end(mm, owned_start, window_bytes, size)
+            context_start = _context_start(mm, owned_start, overlap_bytes)
+            context_end = _context_end(mm, owned_end, overlap_bytes, size)
+
+            window = mm[context_start:context_end]
+            lead = owned_start - context_start
+            owned = owned_end - owned_start
+
+            lead_newlines = window.count(b'\n', 0, lead)
+            owned_newlines = window.count(b'\n', lead, lead + owned)
+            ends_on_newline = window[lead + owned - 1:lead + owned] == b'\n'
+            owned_last = owned_line + owned_newlines - (1 if ends_on_newline else 0)
+
+            yield (
+                window.decode('utf-8', errors='ignore'),
+                owned_line - lead_newlines,
+                owned_line,
+                owned_last
+            )
+
+            owned_line += owned_newlines
+            owned_start = owned_end
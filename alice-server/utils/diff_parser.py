@@ -0,0 +1,195 @@
+"""
+ALICE Diff Parser
+Parses unified diffs into changed files and hunk line ranges, reconstructs
+head-side file content for analysis and reads diffs out of git bundles
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+# Largest diff accepted (bytes)
+MAX_DIFF_BYTES = 20 * 1024 * 1024
+
+# Seconds allowed for each git command when reading a bundle
+GIT_TIMEOUT_SECONDS = 30
+
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+class ChangedFile:
+    """Head side of one file in a diff"""
+
+    def __init__(self, path: str, added: bool = False):
+        """
+        Initialize changed file
+
+        Args:
+            path: Head-side path
+            added: Whether the file is new in the diff
+        """
+        self.path = path
+        self.added = added
+        # Head-side line number -> text, for every line the hunks show (context and added)
+        self.lines: Dict[int, str] = {}
+        # Head-side line numbers added or modified by the diff
+        self.changed: Set[int] = set()
+        # (first, last) head-side line ranges covered by hunks
+        self.hunks: List[Tuple[int, int]] = []
+        self._sorted_changed: Optional[List[int]] = None
+
+    def reconstruct(self) -> str:
+        """
+        Rebuild the head-side content visible in the diff
+
+        Lines outside the hunks are left blank so line numbers match the real file.
+        """
+        if not self.lines:
+            return ''
+        last = max(self.lines)
+        return '\n'.join(self.lines.get(line, '') for line in range(1, last + 1)) + '\n'
+
+    def touches(self, line_number: int, context_lines: int) -> bool:
+        """Check whether a line is within context_lines of a changed line"""
+        if self._sorted_changed is None:
+            self._sorted_changed = sorted(self.changed)
+        index = bisect_left(self._sorted_changed, line_number - context_lines)
+        return index < len(self._sorted_changed) and self._sorted_changed[index] <= line_number + context_lines
+
+
+def _strip_prefix(path: str) -> Optional[str]:
+    """Turn a ---/+++ path into a relative path (None for /dev/null)"""
+    path = path.split('\t', 1)[0].strip()
+    if path == '/dev/null':
+        return None
+    if path.startswith('"') and path.endswith('"'):
+        path = path[1:-1]
+    if path[:2] in ('a/', 'b/'):
+        path = path[2:]
+    return path
+
+
+def parse_unified_diff(diff_text: str) -> List[ChangedFile]:
+    """
+    Parse a unified diff (git or plain diff -u output)
+
+    Args:
+        diff_text: Diff text
+
+    Returns:
+        Changed files that still exist on the head side, in diff order
+    """
+    files: List[ChangedFile] = []
+    current: Optional[ChangedFile] = None
+    old_path: Optional[str] = None
+    head_line = 0
+    # Lines still to come in the current hunk on each side; a hunk ends only when both
+    # reach zero, so a removed "-- comment" line is never mistaken for a "--- " header
+    old_remaining = 0
+    new_remaining = 0
+
+    for raw_line in diff_text.splitlines():
+        if (old_remaining > 0 or new_remaining > 0) and current is not None:
+            marker = raw_line[:1]
+            if marker == '+' and new_remaining > 0:
+                current.lines[head_line] = raw_line[1:]
+                current.changed.add(head_line)
+                head_line += 1
+                new_remaining -= 1
+                continue
+            if (marker == ' ' or raw_line == '') and old_remaining > 0 and new_remaining > 0:
+                current.lines[head_line] = raw_line[1:]
+                head_line += 1
+                old_remaining -= 1
+                new_remaining -= 1
+                continue
+            if marker == '-' and old_remaining > 0:
+                old_remaining -= 1
+                continue
+            if marker == '\\':
+                continue
+            # Malformed hunk; fall through to header parsing
+            old_remaining = new_remaining = 0
+
+        if raw_line.startswith('--- '):
+            old_path = raw_line[4:]
+            current = None
+            continue
+
+        if raw_line.startswith('+++ '):
+            path = _strip_prefix(raw_line[4:])
+            current = None
+            if path:
+                current = ChangedFile(path, added=_strip_prefix(old_path or '') is None)
+                files.append(current)
+            continue
+
+        match = _HUNK_HEADER.match(raw_line)
+        if match and current is not None:
+            old_remaining = int(match.group(1)) if match.group(1) is not None else 1
+            head_line = int(match.group(2))
+            new_remaining = int(match.group(3)) if match.group(3) is not None else 1
+            if new_remaining:
+                current.hunks.append((head_line, head_line + new_remaining - 1))
+            else:
+                # Pure deletion: the lines around the removal are what changed
+                current.changed.add(max(head_line, 1))
+
+    return files
+
+
+def read_bundle(bundle_path: str, base: str, head: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Read the diff between two refs of a git bundle and the head-side files it touches
+
+    Args:
+        bundle_path: Path to a git bundle containing base and head
+        base: Base ref or commit
+        head: Head ref or commit
+
+    Returns:
+        Tuple of (unified diff, head-side path -> content)
+
+    Raises:
+        ValueError: If git is unavailable or the bundle/refs cannot be read
+    """
+    for ref in (base, head):
+        if not ref or ref.startswith('-'):
+            raise ValueError(f'Invalid ref: {ref!r}')
+
+    git = shutil.which('git')
+    if not git:
+        raise ValueError('git is not available on this server; send a unified diff instead')
+
+    repo_dir = tempfile.mkdtemp()
+
+    def run(*args: str) -> str:
+        completed = subprocess.run(
+            [git, *args],
+            cwd=repo_dir,
+            capture_output=True,
+            timeout=GIT_TIMEOUT_SECONDS
+        )
+        if completed.returncode != 0:
+            raise ValueError(completed.stderr.decode('utf-8', errors='ignore').strip() or f'git {args[0]} failed')
+        return completed.stdout.decode('utf-8', errors='ignore')
+
+    try:
+        run('init', '-q', '--bare', '.')
+        run('fetch', '-q', os.path.abspath(bundle_path), '+refs/*:refs/*')
+        diff_text = run('diff', '--no-color', '--no-ext-diff', '-U3', base, head, '--')
+
+        contents = {}
+        for changed in parse_unified_diff(diff_text):
+            contents[changed.path] = run('show', f'{head}:{changed.path}')
+        return diff_text, contents
+
+    except subprocess.TimeoutExpired:
+        raise ValueError('Reading the git bundle timed out')
+
+    finally:
+        shutil.rmtree(repo_dir, ignore_errors=True)
@@ -0,0 +1,149 @@
+"""
+ALICE File Result Cache
+Per-project cache of per-file analysis results keyed by path and content hash,
+used by the manifest-first incremental upload protocol
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from database.models import FileResult
+from analyzers.pipeline import ANALYZER_VERSION
+from analyzers.config import AnalysisConfig
+
+# Hashes looked up per query
+LOOKUP_BATCH_SIZE = 1000
+
+# Largest manifest accepted (files)
+MAX_MANIFEST_FILES = 100000
+
+_SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def validate_manifest(manifest: Any) -> Dict[str, str]:
+    """
+    Check a client manifest
+
+    Args:
+        manifest: Parsed JSON, expected to map relative path -> sha256 hex digest
+
+    Returns:
+        The manifest with normalized paths
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    if not isinstance(manifest, dict):
+        raise ValueError('Manifest must be an object mapping file paths to sha256 hashes')
+    if len(manifest) > MAX_MANIFEST_FILES:
+        raise ValueError(f'Manifest lists more than {MAX_MANIFEST_FILES} files')
+
+    normalized = {}
+    for path, content_hash in manifest.items():
+        if not isinstance(path, str) or not isinstance(content_hash, str):
+            raise ValueError('Manifest paths and hashes must be strings')
+        path = path.replace('\\', '/').lstrip('/')
+        if not path or '..' in path.split('/'):
+            raise ValueError(f'Invalid manifest path: {path!r}')
+        content_hash = content_hash.lower()
+        if not _SHA256_PATTERN.match(content_hash):
+            raise ValueError(f'Invalid sha256 hash for {path}')
+        normalized[path] = content_hash
+
+    return normalized
+
+
+class FileResultCache:
+    """Cached per-file results of one project for the current analyzer version and settings"""
+
+    def __init__(self, session, project_id, config: Optional[AnalysisConfig] = None):
+        """
+        Initialize cache
+
+        Args:
+            session: Database session
+            project_id: Project the results belong to
+            config: Analysis settings the results are computed with; results of other
+                settings are kept apart (the defaults use the plain analyzer version)
+        """
+        self.session = session
+        self.project_id = project_id
+        digest = config.digest() if config is not None else ''
+        self.analyzer_version = f'{ANALYZER_VERSION}+{digest}' if digest else ANALYZER_VERSION
+        self._loaded: Dict[Tuple[str, str], FileResult] = {}
+
+    def _query(self, hashes: Iterable[str]) -> List[FileResult]:
+        hashes = sorted(set(hashes))
+        rows = []
+        for i in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            rows.extend(
+                self.session.query(FileResult).filter(
+                    FileResult.project_id == self.project_id,
+                    FileResult.analyzer_version == self.analyzer_version,
+                    FileResult.content_hash.in_(hashes[i:i + LOOKUP_BATCH_SIZE])
+                ).all()
+            )
+        return rows
+
+    def load(self, manifest: Dict[str, str]):
+        """Fetch the cached results for every (path, hash) in a manifest"""
+        wanted = set(manifest.items())
+        for row in self._query(manifest.values()):
+            key = (row.file_path, row.content_hash)
+            if key in wanted:
+                self._loaded[key] = row
+
+    def missing(self, manifest: Dict[str, str]) -> List[str]:
+        """
+        Get the hashes the client has to upload
+
+        Args:
+            manifest: Relative path -> sha256
+
+        Returns:
+            Sorted hashes with no cached result for at least one of their paths
+        """
+        self.load(manifest)
+        return sorted({
+            content_hash for path, content_hash in manifest.items()
+            if (path, content_hash) not in self._loaded
+        })
+
+    def get(self, path: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached result (after load())
+
+        Returns:
+            Dict with findings, metrics, skipped_reason and downgraded_reason, or None
+        """
+        row = self._loaded.get((path, content_hash))
+        if row is None:
+            return None
+
+        row.last_used_at = datetime.utcnow()
+        return {
+            'findings': row.findings or [],
+            'metrics': row.metrics or {},
+            'skipped_reason': row.skipped_reason,
+            'downgraded_reason': row.downgraded_reason
+        }
+
+    def put(self, path: str, content_hash: str, findings: List[Dict[str, Any]], metrics: Dict[str, Any],
+            skipped_reason: Optional[str] = None, downgraded_reason: Optional[str] = None):
+        """Store a freshly analyzed file's result (committed with the caller's session)"""
+        if (path, content_hash) in self._loaded:
+            return
+
+        row = FileResult(
+            project_id=self.project_id,
+            file_path=path,
+            content_hash=content_hash,
+            analyzer_version=self.analyzer_version,
+            findings=findings,
+            metrics=metrics,
+            skipped_reason=skipped_reason,
+            downgraded_reason=downgraded_reason
+        )
+        self.session.add(row)
+        self._loaded[(path, content_hash)] = row
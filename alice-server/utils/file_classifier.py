@@ -0,0 +1,175 @@
+"""
+ALICE File Classifier
+Sniffs file names and leading bytes to skip binary, lockfile and generated content
+before any analyzer regex runs
+"""
+
+import os
+import re
+from typing import List, Optional, Tuple
+
+# Actions
+ANALYZE = 'analyze'
+DOWNGRADE = 'downgrade'  # security scan only
+DEPENDENCIES = 'dependencies'  # parsed lockfile: advisory lookup only
+SKIP = 'skip'
+
+# Bytes sniffed from the start of each file
+SNIFF_BYTES = 8192
+
+# Minimum share of printable bytes for text
+MIN_PRINTABLE_RATIO = 0.85
+
+# Average line length above which code is treated as minified
+MINIFIED_AVG_LINE_LENGTH = 300
+
+BINARY_EXTENSIONS = {
+    '.pyc', '.pyo', '.class', '.jar', '.war', '.o', '.a', '.so', '.dylib', '.dll', '.exe', '.wasm',
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.tiff', '.psd', '.svg',
+    '.woff', '.woff2', '.ttf', '.otf', '.eot',
+    '.mp3', '.mp4', '.mov', '.avi', '.webm', '.wav', '.ogg',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.tar',
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.sqlite', '.sqlite3', '.db', '.mdb', '.pickle', '.pkl', '.npy', '.npz', '.parquet'
+}
+
+LOCKFILE_NAMES = {
+    'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
+    'poetry.lock', 'pipfile.lock', 'pdm.lock', 'uv.lock', 'composer.lock', 'gemfile.lock',
+    'cargo.lock', 'go.sum', 'mix.lock', 'packages.lock.json'
+}
+
+# Lockfiles whose dependencies are checked against the advisory database
+PARSED_LOCKFILE_NAMES = {'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'poetry.lock'}
+
+MINIFIED_SUFFIXES = ('.min.js', '.min.css', '.min.mjs', '-min.js', '.bundle.js')
+
+# Generator banners, matched only in the file's leading comment: @generated anywhere in it,
+# the others at the start of a comment line (Go's "// Code generated ... DO NOT EDIT.",
+# protoc's "Generated by the protocol buffer compiler", "Auto-generated by ...")
+GENERATED_MARKERS = (
+    rb'@generated\b',
+    rb'^Code generated .* DO NOT EDIT\.?$',
+    rb'^Generated by\b',
+    rb'^(?:This (?:file|code) (?:was|is) )?(?:automatically|auto-?)[ -]?generated(?: by| from| with| file| code|\s*[.:,!-]|$)',
+)
+_GENERATED = re.compile(b'|'.join(b'(?:' + marker + b')' for marker in GENERATED_MARKERS), re.IGNORECASE)
+
+# Lines of a leading comment read for generator banners
+MAX_HEADER_LINES = 40
+
+# Line comment delimiters, and block comment delimiters with their closers
+_LINE_COMMENT = re.compile(rb'^(?://+!?|#+|--|;+)')
+_BLOCK_COMMENTS = ((b'/*', b'*/'), (b'<!--', b'-->'), (b'"""', b'"""'), (b"'''", b"'''"))
+# Decoration at the start of a line inside a block comment
+_BLOCK_LINE_PREFIX = re.compile(rb'^\*+(?!/)')
+
+# Control bytes that still occur in text files
+_TEXT_CONTROL_BYTES = {7, 8, 9, 10, 12, 13, 27}
+
+
+def printable_ratio(head: bytes) -> float:
+    """Share of bytes that are printable ASCII, common whitespace or part of UTF-8 sequences"""
+    if not head:
+        return 1.0
+    printable = sum(1 for b in head if b >= 32 or b in _TEXT_CONTROL_BYTES)
+    return printable / len(head)
+
+
+def header_comment(head: bytes) -> List[bytes]:
+    """
+    Text of the comments a file starts with
+
+    A byte order mark, a shebang and blank lines are skipped; the first line of code ends
+    the header.
+
+    Args:
+        head: Leading bytes of the file
+
+    Returns:
+        Comment lines without their delimiters
+    """
+    lines = []
+    closer = None
+    for number, line in enumerate(head.lstrip(b'\xef\xbb\xbf').split(b'\n')[:MAX_HEADER_LINES]):
+        line = line.strip()
+        if closer is not None:
+            end = line.find(closer)
+            if end >= 0:
+                line, closer = line[:end], None
+            lines.append(_BLOCK_LINE_PREFIX.sub(b'', line).strip())
+            continue
+        if not line or (number == 0 and line.startswith(b'#!')):
+            continue
+
+        opener = next(((start, end) for start, end in _BLOCK_COMMENTS if line.startswith(start)), None)
+        if opener is not None:
+            line = line[len(opener[0]):]
+            end = line.find(opener[1])
+            if end >= 0:
+                line = line[:end]
+            else:
+                closer = opener[1]
+            lines.append(line.strip())
+            continue
+
+        comment = _LINE_COMMENT.match(line)
+        if comment is None:
+            break
+        lines.append(line[comment.end():].strip())
+    return lines
+
+
+def is_generated(head: bytes) -> bool:
+    """Check whether a file's leading comment carries a generator banner"""
+    return any(_GENERATED.search(line) for line in header_comment(head))
+
+
+def classify_file(file_name: str, head: bytes) -> Tuple[str, Optional[str]]:
+    """
+    Decide how a file should be analyzed
+
+    Args:
+        file_name: File name (or path)
+        head: First SNIFF_BYTES of the file
+
+    Returns:
+        Tuple of (action, reason) where action is ANALYZE, DOWNGRADE, DEPENDENCIES or SKIP
+    """
+    base_name = os.path.basename(file_name).lower()
+    extension = os.path.splitext(base_name)[1]
+
+    if extension in BINARY_EXTENSIONS:
+        return SKIP, 'binary'
+
+    if base_name in PARSED_LOCKFILE_NAMES:
+        return DEPENDENCIES, 'lockfile'
+
+    if base_name in LOCKFILE_NAMES or extension == '.lock':
+        return SKIP, 'lockfile'
+
+    if extension == '.map':
+        return SKIP, 'source-map'
+
+    if b'\x00' in head or printable_ratio(head) < MIN_PRINTABLE_RATIO:
+        return SKIP, 'binary'
+
+    if base_name.endswith(MINIFIED_SUFFIXES):
+        return DOWNGRADE, 'minified'
+
+    if is_generated(head):
+        return DOWNGRADE, 'generated'
+
+    # Judge line length on complete lines only (the sniff may cut the last one)
+    complete = head[:head.rfind(b'\n') + 1] or head
+    lines = complete.count(b'\n') or 1
+    if len(head) >= 1024 and len(complete) / lines > MINIFIED_AVG_LINE_LENGTH:
+        return DOWNGRADE, 'minified'
+
+    return ANALYZE, None
+
+
+def sniff(file_path: str) -> bytes:
+    """Read the leading bytes used for classification"""
+    with open(file_path, 'rb') as f:
+        return f.read(SNIFF_BYTES)
@@ -0,0 +1,60 @@
+"""
+ALICE Submission Fingerprints
+Hashes the normalized contents of an upload so retried CI submissions can
+reuse the stored analysis instead of re-running it
+"""
+
+import hashlib
+import zipfile
+from typing import Dict, Optional
+
+from utils.ignore_rules import build_matcher
+
+# Longest Idempotency-Key header accepted
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# Files under the default ignore list are never analyzed, so they do not change the fingerprint either
+_DEFAULT_IGNORES = build_matcher()
+
+
+def _normalize_name(name: str) -> str:
+    return name.replace('\\', '/').lstrip('/')
+
+
+def submission_fingerprint(archive_path: str, developer_email: Optional[str] = None,
+                           manifest: Optional[Dict[str, str]] = None, mode: str = 'full') -> str:
+    """
+    Fingerprint a submission independently of zip metadata
+
+    Entry order, timestamps, compression level and directory entries do not matter;
+    only each file's path and bytes (or, for incremental uploads, the manifest hashes),
+    the report recipient and the analysis mode do.
+
+    Args:
+        archive_path: Uploaded zip file
+        developer_email: Recipient of the reports
+        manifest: Incremental upload manifest (relative path -> sha256), which covers the whole codebase
+        mode: Analysis mode (full, gate, tiered); a gate or tiered result is not a full one
+
+    Returns:
+        sha256 hex digest
+    """
+    if manifest is None:
+        manifest = {}
+        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                name = _normalize_name(info.filename)
+                if info.is_dir() or _DEFAULT_IGNORES.ignored_by(name):
+                    continue
+                digest = hashlib.sha256()
+                with zip_ref.open(info) as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(block)
+                manifest[name] = digest.hexdigest()
+
+    fingerprint = hashlib.sha256()
+    fingerprint.update(mode.encode('utf-8') + b'\0')
+    fingerprint.update((developer_email or '').strip().lower().encode('utf-8'))
+    for name in sorted(manifest):
+        fingerprint.update(b'\0' + name.encode('utf-8') + b'\0' + manifest[name].encode('ascii'))
+    return fingerprint.hexdigest()
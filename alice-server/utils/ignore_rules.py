@@ -0,0 +1,269 @@
+"""
+ALICE Ignore Rules
+Compiles the default ignore list, .gitignore files found in an upload and a
+project's own ignore patterns into one path matcher used to prune the walk
+"""
+
+import posixpath
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Directories never analyzed (generated output, dependencies, VCS metadata)
+DEFAULT_IGNORE_PATTERNS = [
+    'node_modules/',
+    'venv/',
+    '.git/',
+    'dist/',
+    'build/',
+    '__pycache__/',
+    '.next/',
+    '.vercel/',
+    'coverage/',
+]
+
+# Largest .gitignore read from an upload (bytes)
+MAX_GITIGNORE_BYTES = 256 * 1024
+
+# Rule sources, reported with pruned file counts
+DEFAULT = 'default'
+GITIGNORE = 'gitignore'
+PROJECT = 'project'
+
+
+def _translate(glob: str) -> str:
+    """Translate the glob part of a gitignore pattern into a regex"""
+    out = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        c = glob[i]
+        if c == '*':
+            if glob.startswith('**/', i) and (i == 0 or glob[i - 1] == '/'):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if glob.startswith('**', i) and i + 2 == n and (i == 0 or glob[i - 1] == '/'):
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = glob.find(']', i + 2 if glob.startswith('[!', i) or glob.startswith('[^', i) else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def compile_pattern(line: str, base: str = '') -> Optional[Tuple[str, bool]]:
+    """
+    Compile one gitignore line into a regex over paths
+
+    Paths are matched relative to the upload root; directories carry a trailing '/'.
+
+    Args:
+        line: Pattern line
+        base: Directory of the .gitignore the line comes from ('' for the root)
+
+    Returns:
+        Tuple of (regex source, negated), or None for blank lines and comments
+    """
+    line = line.rstrip('\n\r')
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    if not line or line.startswith('#'):
+        return None
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+
+    directory_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to the .gitignore's directory
+    anchored = '/' in line
+    line = line.lstrip('/')
+
+    prefix = re.escape(base + '/') if base else ''
+    if not anchored:
+        prefix += '(?:.*/)?'
+    suffix = '/' if directory_only else '/?'
+    return f'{prefix}{_translate(line)}{suffix}', negated
+
+
+class IgnoreMatcher:
+    """Ordered gitignore-style rules compiled into combined regexes"""
+
+    def __init__(self):
+        # (source, regex source, negated), in precedence order (later wins)
+        self._rules: List[Tuple[str, str, bool]] = []
+        self._compiled = None
+        self._directories: Dict[str, Optional[str]] = {}
+        self._last_rules: Dict[str, int] = {}
+
+    def add(self, lines: Iterable[str], source: str, base: str = ''):
+        """
+        Add ignore patterns
+
+        Args:
+            lines: gitignore-syntax pattern lines
+            source: DEFAULT, GITIGNORE or PROJECT
+            base: Directory the patterns are relative to
+        """
+        for line in lines:
+            compiled = compile_pattern(line, base)
+            if compiled:
+                self._rules.append((source, compiled[0], compiled[1]))
+        self._compiled = None
+        self._directories.clear()
+        self._last_rules.clear()
+
+    def _compile(self):
+        ignore = [(index, rule) for index, rule in enumerate(self._rules) if not rule[2]]
+        negate = [rule for rule in self._rules if rule[2]]
+        # One alternation per kind; the named group tells which rule matched
+        ignore_regex = re.compile('(?:' + '|'.join(f'(?P<r{index}>{source})' for index, (_, source, _) in ignore) + r')\Z') if ignore else None
+        negate_regex = re.compile('(?:' + '|'.join(source for _, source, _ in negate) + r')\Z') if negate else None
+        ordered = [(source, re.compile(pattern + r'\Z'), negated) for source, pattern, negated in self._rules]
+        self._compiled = (ignore_regex, negate_regex, ordered)
+
+    def _match(self, path: str) -> Optional[str]:
+        """Get the source of the rule ignoring path ('/'-terminated for directories), or None"""
+        if self._compiled is None:
+            self._compile()
+        ignore_regex, negate_regex, ordered = self._compiled
+        if ignore_regex is None:
+            return None
+
+        match = ignore_regex.match(path)
+        if match is None:
+            return None
+        if negate_regex is None or not negate_regex.match(path):
+            return self._rules[int(match.lastgroup[1:])][0]
+
+        # Both kinds match: the last matching rule decides
+        for source, regex, negated in reversed(ordered):
+            if regex.match(path):
+                return None if negated else source
+        return None
+
+    def _last_rule(self, path: str) -> int:
+        """Index of the last rule matching path ('/'-terminated for directories), or -1"""
+        if self._compiled is None:
+            self._compile()
+        ordered = self._compiled[2]
+        for index in range(len(ordered) - 1, -1, -1):
+            if ordered[index][1].match(path):
+                return index
+        return -1
+
+    def _last_rule_in(self, directory: str) -> int:
+        """Index of the last rule matching a directory or one of its parents, or -1"""
+        if not directory:
+            return -1
+        if directory not in self._last_rules:
+            parent = posixpath.dirname(directory)
+            self._last_rules[directory] = max(self._last_rule_in(parent), self._last_rule(directory + '/'))
+        return self._last_rules[directory]
+
+    def selects(self, relative_path: str) -> bool:
+        """
+        Check whether the patterns select a file, as an include list
+
+        The last rule matching the file or any of its parent directories decides, so
+        '!' can carve a directory or a single file out of a selected directory.
+        Nothing is selected unless some pattern matches.
+
+        Args:
+            relative_path: Relative POSIX path of the file
+
+        Returns:
+            True when the deciding rule is not negated
+        """
+        index = max(self._last_rule_in(posixpath.dirname(relative_path)), self._last_rule(relative_path))
+        return index >= 0 and not self._rules[index][2]
+
+    def directory_source(self, directory: str) -> Optional[str]:
+        """
+        Check whether a directory (or one of its parents) is ignored
+
+        Args:
+            directory: Relative POSIX path without trailing slash ('' for the root)
+
+        Returns:
+            Source of the rule pruning it, or None
+        """
+        if not directory:
+            return None
+        if directory not in self._directories:
+            parent = posixpath.dirname(directory)
+            self._directories[directory] = self.directory_source(parent) or self._match(directory + '/')
+        return self._directories[directory]
+
+    def ignored_by(self, relative_path: str) -> Optional[str]:
+        """
+        Check whether a file is ignored
+
+        Args:
+            relative_path: Relative POSIX path of the file
+
+        Returns:
+            Source of the rule ignoring it (pruned directory or the file itself), or None
+        """
+        return self.directory_source(posixpath.dirname(relative_path)) or self._match(relative_path)
+
+
+def build_matcher(project_patterns: Optional[Iterable[str]] = None,
+                  gitignores: Optional[Dict[str, str]] = None) -> IgnoreMatcher:
+    """
+    Build the matcher for one upload
+
+    Precedence follows git: defaults, then .gitignore files from the root down, then
+    the project's patterns (which can re-include with '!'). A .gitignore inside an
+    ignored directory is not applied.
+
+    Args:
+        project_patterns: Project-level ignore patterns (gitignore syntax)
+        gitignores: Relative path of each .gitignore -> its content
+
+    Returns:
+        IgnoreMatcher
+    """
+    matcher = IgnoreMatcher()
+    matcher.add(DEFAULT_IGNORE_PATTERNS, DEFAULT)
+
+    for path in sorted(gitignores or {}, key=lambda p: (p.count('/'), p)):
+        base = posixpath.dirname(path)
+        if matcher.directory_source(base):
+            continue
+        matcher.add(gitignores[path].splitlines(), GITIGNORE, base)
+
+    if project_patterns:
+        matcher.add(project_patterns, PROJECT)
+    return matcher
+
+
+def parse_patterns(text: Optional[str]) -> List[str]:
+    """Split a stored newline-separated pattern list"""
+    return [line for line in (text or '').splitlines() if line.strip()]
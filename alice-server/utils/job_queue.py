@@ -0,0 +1,109 @@
+"""
+ALICE Job Queue
+Durable queue of deferred analysis work, stored in the database so it survives the
+serverless instance that accepted the upload being frozen or recycled
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_
+
+from database.models import AnalysisJob
+
+# Seconds after which a running job is assumed lost with its instance and is claimed again
+JOB_LEASE_SECONDS = int(os.environ.get('ALICE_JOB_LEASE_SECONDS', 300))
+
+# Attempts before a job is left as failed
+JOB_MAX_ATTEMPTS = int(os.environ.get('ALICE_JOB_MAX_ATTEMPTS', 3))
+
+
+def enqueue(session, analysis_id, archive_path: str, manifest: Optional[Dict[str, str]],
+            developer_email: Optional[str], developer_name: str, tier: str, superseded: str,
+            remaining_files: Optional[List[str]] = None) -> AnalysisJob:
+    """
+    Queue the completion of a stored provisional analysis (caller commits)
+
+    Args:
+        session: Database session
+        analysis_id: Provisional Analysis to complete
+        archive_path: Uploaded archive; its bytes are stored with the job
+        manifest: Incremental upload manifest, if any
+        developer_email: Optional developer email
+        developer_name: Developer name
+        tier: Tier recorded for the completed analysis
+        superseded: raw_data key keeping the provisional result
+        remaining_files: Resume the stored partial result with only these files (None = analyze the whole archive)
+
+    Returns:
+        The flushed job
+    """
+    with open(archive_path, 'rb') as f:
+        archive = f.read()
+
+    job = AnalysisJob(
+        analysis_id=analysis_id,
+        tier=tier,
+        superseded=superseded,
+        archive=archive,
+        manifest=manifest,
+        remaining_files=remaining_files,
+        developer_email=developer_email,
+        developer_name=developer_name,
+        status='pending',
+        attempts=0
+    )
+    session.add(job)
+    session.flush()
+    return job
+
+
+def claim(session, job_id=None) -> Optional[AnalysisJob]:
+    """
+    Claim a pending job, or a running one whose lease expired, and commit the claim
+
+    Rows locked by another claimer are skipped, so concurrent drains never take the same job.
+
+    Args:
+        session: Database session
+        job_id: Claim only this job (None = the oldest available)
+
+    Returns:
+        The claimed job, or None
+    """
+    now = datetime.utcnow()
+    query = session.query(AnalysisJob).filter(or_(
+        AnalysisJob.status == 'pending',
+        and_(AnalysisJob.status == 'running', AnalysisJob.claimed_at < now - timedelta(seconds=JOB_LEASE_SECONDS))
+    ))
+    if job_id is not None:
+        query = query.filter(AnalysisJob.id == job_id)
+
+    job = query.order_by(AnalysisJob.created_at).with_for_update(skip_locked=True).first()
+    if job is None:
+        session.rollback()
+        return None
+
+    job.status = 'running'
+    job.claimed_at = now
+    job.attempts = (job.attempts or 0) + 1
+    session.commit()
+    return job
+
+
+def release(session, job_id, error: str):
+    """
+    Record a failed attempt: the job is retried until JOB_MAX_ATTEMPTS, then left as failed
+
+    Args:
+        session: Database session (committed here)
+        job_id: Job that failed
+        error: Failure message
+    """
+    job = session.query(AnalysisJob).filter_by(id=job_id).first()
+    if job is None:
+        return
+    job.status = 'failed' if (job.attempts or 0) >= JOB_MAX_ATTEMPTS else 'pending'
+    job.last_error = error[:2000]
+    session.commit()
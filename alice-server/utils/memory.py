@@ -0,0 +1,123 @@
+"""
+ALICE Memory Accounting
+Per-stage memory sampling and budget checks for analysis runs
+"""
+
+import os
+import sys
+import time
+import resource
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Fraction of the budget at which findings retention starts being capped
+BUDGET_HEADROOM = 0.8
+
+
+def current_rss_bytes() -> int:
+    """
+    Get current resident set size of this process
+
+    Returns:
+        RSS in bytes (peak RSS where /proc is unavailable)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """Get peak resident set size of this process in bytes"""
+    # ru_maxrss is KB on Linux (Vercel), bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryTracker:
+    """Samples tracemalloc/RSS per analysis stage and enforces a soft memory budget"""
+
+    def __init__(self, budget_mb: Optional[int] = None):
+        """
+        Initialize memory tracker
+
+        Args:
+            budget_mb: Soft memory budget in MB (None disables budgeting and tracemalloc)
+        """
+        self.budget_bytes = budget_mb * 1024 * 1024 if budget_mb else None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.budget_reached = False
+        self._owns_tracemalloc = False
+        self._baseline_rss = current_rss_bytes()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        """Start tracemalloc when a budget is configured"""
+        if self.budget_bytes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self):
+        """Stop tracemalloc if this tracker started it"""
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def usage_bytes(self) -> int:
+        """
+        Get memory attributable to the analysis
+
+        Returns:
+            Traced allocations when tracing, otherwise RSS growth since the tracker was created
+        """
+        if self.tracing:
+            return tracemalloc.get_traced_memory()[0]
+        return max(0, current_rss_bytes() - self._baseline_rss)
+
+    def approaching_budget(self) -> bool:
+        """Check whether usage has crossed the retention headroom of the budget"""
+        if not self.budget_bytes:
+            return False
+        if self.usage_bytes() >= self.budget_bytes * BUDGET_HEADROOM:
+            self.budget_reached = True
+        return self.budget_reached
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Record duration, traced peak and RSS for a stage
+
+        Args:
+            name: Stage name (extract, analyze, score, ...)
+        """
+        if self.tracing:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            sample = {
+                'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+                'rss_bytes': current_rss_bytes()
+            }
+            if self.tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                sample['traced_bytes'] = current
+                sample['traced_peak_bytes'] = peak
+            self.stages[name] = sample
+
+    def report(self) -> Dict[str, Any]:
+        """Get memory report for the analysis result"""
+        return {
+            'budget_bytes': self.budget_bytes,
+            'tracemalloc': self.tracing,
+            'budget_reached': self.budget_reached,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'stages': self.stages
+        }
@@ -0,0 +1,68 @@
+"""
+ALICE Risk Ordering
+Orders files so the ones most likely to hold a critical finding are analyzed first
+"""
+
+from typing import Set, Tuple
+
+from database.models import Analysis, Bug
+
+# Path markers of code that tends to hold critical issues, most risky first
+RISK_PATH_MARKERS = ('.env', 'auth', 'api/', 'controller')
+
+# Past analyses whose critical findings mark a file as risky
+RISK_HISTORY_ANALYSES = 20
+
+
+def past_critical_paths(session, project_id, history: int = RISK_HISTORY_ANALYSES) -> Set[str]:
+    """
+    Get files with critical findings in a project's recent analyses
+
+    Args:
+        session: Database session
+        project_id: Project to look up
+        history: Number of most recent analyses to consider
+
+    Returns:
+        Relative file paths
+    """
+    recent = session.query(Analysis.id).filter(
+        Analysis.project_id == project_id
+    ).order_by(Analysis.analyzed_at.desc()).limit(history).subquery()
+
+    rows = session.query(Bug.file_path).filter(
+        Bug.analysis_id.in_(recent),
+        Bug.severity == 'CRITICAL',
+        Bug.file_path.isnot(None)
+    ).distinct().all()
+
+    return {file_path for file_path, in rows}
+
+
+def risk_key(relative_path: str, past_critical: Set[str]) -> Tuple[int, int, str]:
+    """
+    Sort key: files with past critical findings, then by path marker, then the rest
+
+    Args:
+        relative_path: Path inside the archive
+        past_critical: Paths from past_critical_paths()
+
+    Returns:
+        Tuple sorting riskier files first
+    """
+    path = relative_path.replace('\\', '/')
+    lowered = '/' + path.lower()
+
+    marker_rank = len(RISK_PATH_MARKERS)
+    for rank, marker in enumerate(RISK_PATH_MARKERS):
+        if marker == '.env':
+            matched = lowered.rsplit('/', 1)[-1].startswith('.env')
+        elif marker.endswith('/'):
+            matched = '/' + marker in lowered
+        else:
+            matched = marker in lowered
+        if matched:
+            marker_rank = rank
+            break
+
+    return (0 if path in past_critical else 1, marker_rank, path)
@@ -0,0 +1,178 @@
+"""
+ALICE Sampling
+Stratified file sampling (by directory and language) and extrapolation of
+per-file totals with confidence intervals, for estimated scans of very large repositories
+"""
+
+import math
+import os
+import random
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+# Leading directory components that define a stratum (with the file extension)
+STRATUM_DEPTH = 1
+
+# Normal quantile for 95% confidence intervals
+CONFIDENCE_Z = 1.96
+
+Stratum = Tuple[str, str]
+
+
+def stratum_of(relative_path: str) -> Stratum:
+    """
+    Get the stratum of a file
+
+    Args:
+        relative_path: Path inside the archive
+
+    Returns:
+        Tuple of (leading directory, lowercased extension)
+    """
+    parts = relative_path.replace('\\', '/').split('/')
+    directory = '/'.join(parts[:-1][:STRATUM_DEPTH]) or '.'
+    return directory, os.path.splitext(parts[-1])[1].lower()
+
+
+def sample_order(paths: Iterable[str], seed: Hashable = 0) -> List[str]:
+    """
+    Order files so that every prefix is a proportional stratified sample
+
+    One random file of every stratum comes first; the rest follow by their position
+    within their (shuffled) stratum relative to its size, so stopping at any point
+    (a time budget) leaves each stratum sampled in proportion to its size.
+
+    Args:
+        paths: Relative paths
+        seed: Seed for the shuffle (same seed, same sample)
+
+    Returns:
+        Paths in sampling order
+    """
+    strata: Dict[Stratum, List[str]] = {}
+    for path in paths:
+        strata.setdefault(stratum_of(path), []).append(path)
+
+    rng = random.Random(str(seed))
+    ranked = []
+    for stratum in sorted(strata):
+        members = sorted(strata[stratum])
+        rng.shuffle(members)
+        for index, path in enumerate(members):
+            rank = 0.0 if index == 0 else (index + 0.5) / len(members)
+            ranked.append((rank, path))
+
+    ranked.sort()
+    return [path for _, path in ranked]
+
+
+def fraction_sample(paths: Iterable[str], fraction: float, seed: Hashable = 0) -> List[str]:
+    """
+    Draw a stratified sample of a fixed fraction (at least one file per stratum)
+
+    Args:
+        paths: Relative paths
+        fraction: Share of each stratum to sample (0-1]
+        seed: Seed for the shuffle
+
+    Returns:
+        Sampled paths in sampling order
+    """
+    ordered = sample_order(paths, seed)
+    sizes: Dict[Stratum, int] = {}
+    for path in ordered:
+        stratum = stratum_of(path)
+        sizes[stratum] = sizes.get(stratum, 0) + 1
+
+    quotas = {stratum: max(1, math.ceil(size * fraction)) for stratum, size in sizes.items()}
+    sample = []
+    for path in ordered:
+        stratum = stratum_of(path)
+        if quotas[stratum] > 0:
+            quotas[stratum] -= 1
+            sample.append(path)
+    return sample
+
+
+class StratifiedEstimator:
+    """Extrapolates per-file values of a stratified sample to population totals"""
+
+    def __init__(self, population: Iterable[str]):
+        """
+        Initialize estimator
+
+        Args:
+            population: Every file the sample is drawn from
+        """
+        self.sizes: Dict[Stratum, int] = {}
+        for path in population:
+            stratum = stratum_of(path)
+            self.sizes[stratum] = self.sizes.get(stratum, 0) + 1
+        self.samples: Dict[Stratum, List[Dict[str, float]]] = {}
+
+    def record(self, relative_path: str, values: Dict[str, float]):
+        """Record the values (e.g. finding counts) of one sampled file"""
+        self.samples.setdefault(stratum_of(relative_path), []).append(values)
+
+    @property
+    def sampled(self) -> int:
+        return sum(len(values) for values in self.samples.values())
+
+    @property
+    def population(self) -> int:
+        return sum(self.sizes.values())
+
+    def estimate(self, key: str) -> Dict[str, float]:
+        """
+        Estimate the population total of one value
+
+        Uses the stratified estimator sum(N_h * mean_h) with a finite population correction.
+        Strata with a single sampled file borrow the pooled sample variance; unsampled
+        strata (time budget exhausted) borrow the pooled mean and variance.
+
+        Args:
+            key: Value to total
+
+        Returns:
+            Dict with estimate, low and high (confidence bounds, never below the observed total)
+        """
+        pooled = [values.get(key, 0) for samples in self.samples.values() for values in samples]
+        pooled_mean = sum(pooled) / len(pooled) if pooled else 0.0
+        pooled_variance = _variance(pooled, pooled_mean) if len(pooled) > 1 else 0.0
+
+        observed = sum(pooled)
+        total = 0.0
+        variance = 0.0
+        for stratum, size in self.sizes.items():
+            values = [sample.get(key, 0) for sample in self.samples.get(stratum, ())]
+            n = len(values)
+            if n == 0:
+                total += size * pooled_mean
+                variance += size * size * pooled_variance
+                continue
+
+            mean = sum(values) / n
+            stratum_variance = _variance(values, mean) if n > 1 else pooled_variance
+            total += size * mean
+            variance += size * size * (1 - n / size) * stratum_variance / n
+
+        margin = CONFIDENCE_Z * math.sqrt(variance)
+        return {
+            'estimate': total,
+            'low': max(observed, total - margin),
+            'high': total + margin
+        }
+
+    def summary(self) -> Dict[str, int]:
+        """Get sample coverage"""
+        return {
+            'files_total': self.population,
+            'files_sampled': self.sampled,
+            'strata': len(self.sizes),
+            'strata_sampled': len(self.samples)
+        }
+
+
+def _variance(values: List[float], mean: float) -> float:
+    """Sample variance"""
+    return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
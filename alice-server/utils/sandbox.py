@@ -0,0 +1,195 @@
+"""
+ALICE Sandbox
+Runs analysis work in a worker subprocess under CPU, memory and wall-clock limits,
+replacing the worker whenever it is killed
+"""
+
+import multiprocessing
+import signal
+import time
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; only the wall-clock timeout applies there
+    resource = None
+
+
+class ResourceLimitExceeded(Exception):
+    """A sandboxed task hit a limit and its worker was replaced"""
+
+    def __init__(self, limit: str):
+        """
+        Args:
+            limit: 'cpu', 'memory', 'timeout' or 'crashed'
+        """
+        super().__init__(f'analysis aborted: resource limit ({limit})')
+        self.limit = limit
+
+
+def _limit_memory(memory_bytes: Optional[int]):
+    """Cap the worker's address space"""
+    if resource is None or not memory_bytes:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        memory_bytes = min(memory_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+
+
+def _extend_cpu_limit(cpu_seconds: Optional[float]):
+    """
+    Allow the next task cpu_seconds of CPU time
+
+    RLIMIT_CPU counts the whole process lifetime, so the soft limit is moved to the
+    CPU time used so far plus the task's allowance. Exceeding it delivers SIGXCPU,
+    which terminates the worker even inside a C-level regex match.
+    """
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, cpu_seconds: Optional[float], memory_bytes: Optional[int]):
+    """Worker loop: run (func, args) tasks until the pipe closes"""
+    # The parent handles Ctrl-C; a worker should only die from its limits
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _limit_memory(memory_bytes)
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+
+        func, args = task
+        _extend_cpu_limit(cpu_seconds)
+        try:
+            conn.send(('ok', func(*args)))
+        except MemoryError:
+            # The heap may be fragmented past recovery; let the parent start a fresh worker
+            conn.send(('limit', 'memory'))
+            return
+        except Exception as e:
+            conn.send(('error', f'{type(e).__name__}: {e}'))
+
+
+class Sandbox:
+    """One worker subprocess, started on demand and replaced after it is killed"""
+
+    def __init__(self, cpu_seconds: Optional[float] = None, memory_mb: Optional[int] = None,
+                 timeout_seconds: Optional[float] = None):
+        """
+        Initialize sandbox
+
+        Args:
+            cpu_seconds: CPU time allowed per task (None = unlimited)
+            memory_mb: Address space limit of the worker (None = unlimited)
+            timeout_seconds: Wall-clock time allowed per task (None = unlimited)
+        """
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_mb * 1024 * 1024 if memory_mb else None
+        self.timeout_seconds = timeout_seconds
+        self.workers_started = 0
+        self._process = None
+        self._conn = None
+
+        methods = multiprocessing.get_all_start_methods()
+        # fork shares the parent's imported modules, so functions are sent by reference cheaply
+        self._context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+    def _start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.cpu_seconds, self.memory_bytes),
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self.workers_started += 1
+
+    def _stop(self):
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join(1)
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def _limit_of_dead_worker(self) -> str:
+        """Tell which limit killed the worker from its exit signal"""
+        self._process.join(1)
+        exitcode = self._process.exitcode
+        if hasattr(signal, 'SIGXCPU') and exitcode == -signal.SIGXCPU:
+            return 'cpu'
+        if hasattr(signal, 'SIGKILL') and exitcode == -signal.SIGKILL:
+            # The kernel OOM killer
+            return 'memory'
+        return 'crashed'
+
+    def run(self, func: Callable, *args, timeout_seconds: Optional[float] = None) -> Any:
+        """
+        Run func(*args) in the worker
+
+        Args:
+            func: Module-level function (sent by reference)
+            *args: Picklable arguments
+            timeout_seconds: Wall-clock limit for this task (default: the sandbox's)
+
+        Returns:
+            func's return value
+
+        Raises:
+            ResourceLimitExceeded: The worker hit a limit (it has been replaced)
+            RuntimeError: func raised; the message carries the exception
+        """
+        if self._process is None or not self._process.is_alive():
+            self._stop()
+            self._start()
+
+        timeout = timeout_seconds if timeout_seconds is not None else self.timeout_seconds
+        self._conn.send((func, args))
+
+        started = time.monotonic()
+        while not self._conn.poll(0.05):
+            if not self._process.is_alive():
+                limit = self._limit_of_dead_worker()
+                self._stop()
+                raise ResourceLimitExceeded(limit)
+            if timeout is not None and time.monotonic() - started > timeout:
+                self._stop()
+                raise ResourceLimitExceeded('timeout')
+
+        try:
+            status, value = self._conn.recv()
+        except (EOFError, OSError):
+            limit = self._limit_of_dead_worker()
+            self._stop()
+            raise ResourceLimitExceeded(limit)
+
+        if status == 'limit':
+            self._stop()
+            raise ResourceLimitExceeded(value)
+        if status == 'error':
+            raise RuntimeError(value)
+        return value
+
+    def close(self):
+        """Stop the worker"""
+        if self._conn is not None and self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+        self._stop()
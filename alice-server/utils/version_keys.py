@@ -0,0 +1,119 @@
+"""
+ALICE Version Keys
+Encodes npm (semver) and PyPI (PEP 440) versions as strings whose plain
+lexicographic order is the ecosystem's version order, so version-range
+intervals can be precomputed, stored and compared without re-parsing
+"""
+
+import re
+from typing import Optional
+
+NPM = 'npm'
+PYPI = 'PyPI'
+
+_SEMVER = re.compile(
+    r'^\s*[v=]?\s*(\d+)(?:\.(\d+))?(?:\.(\d+))?'
+    r'(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z.-]+)?\s*$'
+)
+
+# PEP 440 public version scheme (local versions are accepted and ignored)
+_PEP440 = re.compile(
+    r'^\s*v?(?:(\d+)!)?(\d+(?:\.\d+)*)'
+    r'(?:[-_.]?(a|b|c|rc|alpha|beta|pre|preview)[-_.]?(\d+)?)?'
+    r'(?:(?:-(\d+))|(?:[-_.]?(post|rev|r)[-_.]?(\d+)?))?'
+    r'(?:[-_.]?(dev)[-_.]?(\d+)?)?'
+    r'(?:\+[a-z0-9]+(?:[-_.][a-z0-9]+)*)?\s*$',
+    re.IGNORECASE
+)
+
+_PRE_RANK = {'a': 'a', 'alpha': 'a', 'b': 'b', 'beta': 'b', 'c': 'c', 'rc': 'c', 'pre': 'c', 'preview': 'c'}
+
+
+def _number(digits: str) -> str:
+    """Encode a non-negative integer so longer numbers sort after shorter ones"""
+    digits = digits.lstrip('0') or '0'
+    return f'{len(digits):02d}{digits}'
+
+
+def semver_key(version: str) -> Optional[str]:
+    """
+    Sortable key of a semver version (missing minor/patch count as 0)
+
+    Prereleases sort before their release; prerelease identifiers compare
+    numerically when numeric, lexically otherwise, numeric before alphanumeric.
+
+    Returns:
+        Key, or None when the version is not semver
+    """
+    match = _SEMVER.match(version or '')
+    if not match:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    key = _number(major) + _number(minor or '0') + _number(patch or '0')
+    if prerelease is None:
+        return key + '~'
+
+    identifiers = []
+    for identifier in prerelease.split('.'):
+        identifiers.append('0' + _number(identifier) if identifier.isdigit() else '1' + identifier)
+    # ' ' sorts below every identifier character, so a shorter identifier list sorts first
+    return key + '!' + ' '.join(identifiers)
+
+
+def pep440_key(version: str) -> Optional[str]:
+    """
+    Sortable key of a PEP 440 version
+
+    Follows the PEP's ordering: epoch, release (trailing zeros ignored), then
+    dev-only releases < pre-releases < final < post-releases, with .devN before its base.
+
+    Returns:
+        Key, or None when the version is not PEP 440
+    """
+    match = _PEP440.match(version or '')
+    if not match:
+        return None
+    epoch, release, pre_label, pre_number, implicit_post, post_label, post_number, dev_label, dev_number = match.groups()
+
+    parts = [int(part) for part in release.split('.')]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    key = _number(epoch or '0') + ''.join('.' + _number(str(part)) for part in parts) + ' '
+
+    post = implicit_post if implicit_post is not None else (post_number or '0') if post_label else None
+    if pre_label:
+        key += '1' + _PRE_RANK[pre_label.lower()] + _number(pre_number or '0')
+    elif post is None and dev_label:
+        # 1.0.dev1 sorts before 1.0a1
+        key += '0'
+    else:
+        key += '2'
+    key += '0' if post is None else '1' + _number(post)
+    key += '0' + _number(dev_number or '0') if dev_label else '1'
+    return key
+
+
+def version_key(ecosystem: str, version: str) -> Optional[str]:
+    """
+    Sortable key of a version in an ecosystem
+
+    Args:
+        ecosystem: NPM or PYPI
+        version: Version string
+
+    Returns:
+        Key, or None for unparseable versions and unsupported ecosystems
+    """
+    if ecosystem == NPM:
+        return semver_key(version)
+    if ecosystem == PYPI:
+        return pep440_key(version)
+    return None
+
+
+def normalize_package(ecosystem: str, name: str) -> str:
+    """Normalize a package name for lookups (PEP 503 for PyPI)"""
+    name = name.strip()
+    if ecosystem == PYPI:
+        return re.sub(r'[-_.]+', '-', name).lower()
+    return name